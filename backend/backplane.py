@@ -0,0 +1,313 @@
+import asyncio
+import fcntl
+import json
+import os
+import tempfile
+import uuid
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+Handler = Callable[[dict], Awaitable[None]]
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "glyphor-backplane.sock")
+
+
+class Backplane:
+    """Pub/sub + leader election shared by every uvicorn worker."""
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, channel: str, handler: Handler):
+        self.handlers[channel].append(handler)
+
+    async def publish(self, channel: str, message: dict):
+        raise NotImplementedError
+
+    async def acquire_leadership(self, name: str) -> bool:
+        raise NotImplementedError
+
+    async def release_leadership(self, name: str):
+        pass
+
+    async def _dispatch(self, channel: str, message: dict):
+        for handler in list(self.handlers.get(channel, [])):
+            try:
+                await handler(message)
+            except Exception as e:
+                print(f"Backplane handler error on {channel}: {e}")
+
+
+class InProcessBackplane(Backplane):
+    #single worker mode, every event stays in this process
+    async def publish(self, channel: str, message: dict):
+        await self._dispatch(channel, message)
+
+    async def acquire_leadership(self, name: str) -> bool:
+        return True
+
+
+class FileLockLeadership:
+    #flock based election, the os drops the lock if the holder dies
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.held: Dict[str, int] = {}
+
+    def acquire(self, name: str) -> bool:
+        if name in self.held:
+            return True
+        fd = os.open(f"{self.base_path}.{name}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self.held[name] = fd
+        return True
+
+    def release(self, name: str):
+        fd = self.held.pop(name, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def release_all(self):
+        for name in list(self.held):
+            self.release(name)
+
+
+class UnixSocketBackplane(Backplane):
+    """
+    One worker wins the "hub" lock and relays frames over a unix socket,
+    every worker (hub included) is a plain client of that relay.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, reconnect_interval: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.reconnect_interval = reconnect_interval
+        self.leadership = FileLockLeadership(path)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.peers: List[asyncio.StreamWriter] = []
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+
+    async def start(self):
+        self.reader_task = asyncio.create_task(self._client_loop())
+        try:
+            await asyncio.wait_for(self.connected.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            print("Backplane hub not reachable yet, events stay local until it is")
+
+    async def stop(self):
+        if self.reader_task:
+            self.reader_task.cancel()
+            try:
+                await self.reader_task
+            except asyncio.CancelledError:
+                pass
+        if self.writer:
+            self.writer.close()
+        for peer in list(self.peers):
+            peer.close()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        self.leadership.release_all()
+
+    async def publish(self, channel: str, message: dict):
+        frame = json.dumps({"channel": channel, "message": message}) + "\n"
+        if self.writer and self.connected.is_set():
+            try:
+                self.writer.write(frame.encode())
+                await self.writer.drain()
+                return
+            except (ConnectionError, RuntimeError) as e:
+                print(f"Backplane publish failed, delivering locally: {e}")
+                self.connected.clear()
+        await self._dispatch(channel, message)
+
+    async def acquire_leadership(self, name: str) -> bool:
+        return self.leadership.acquire(name)
+
+    async def release_leadership(self, name: str):
+        self.leadership.release(name)
+
+    async def _ensure_hub(self):
+        if self.server or not self.leadership.acquire("hub"):
+            return
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._handle_peer, path=self.path)
+
+    async def _handle_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peers.append(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                for peer in list(self.peers):
+                    try:
+                        peer.write(line)
+                    except (ConnectionError, RuntimeError):
+                        self.peers.remove(peer)
+        finally:
+            if writer in self.peers:
+                self.peers.remove(writer)
+            writer.close()
+
+    async def _client_loop(self):
+        while True:
+            try:
+                await self._ensure_hub()
+                reader, self.writer = await asyncio.open_unix_connection(self.path)
+                self.connected.set()
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    frame = json.loads(line)
+                    await self._dispatch(frame["channel"], frame["message"])
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ValueError) as e:
+                print(f"Backplane connection error: {e}")
+            self.connected.clear()
+            self.writer = None
+            await asyncio.sleep(self.reconnect_interval)
+
+
+#atomic "renew only if we still own it" for the leader keys
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisBackplane(Backplane):
+    #works against redis or anything that speaks its pub/sub + SET NX protocol
+    def __init__(self, url: str = "redis://localhost:6379/0", client=None, prefix: str = "glyphor", lease_ms: int = 15000):
+        super().__init__()
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                raise RuntimeError("redis backplane needs the 'redis' package installed")
+            client = aioredis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.lease_ms = lease_ms
+        self.worker_id = uuid.uuid4().hex
+        self.pubsub = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.held = set()
+
+    async def start(self):
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.psubscribe(f"{self.prefix}:events:*")
+        self.reader_task = asyncio.create_task(self._reader_loop())
+
+    async def stop(self):
+        if self.reader_task:
+            self.reader_task.cancel()
+            try:
+                await self.reader_task
+            except asyncio.CancelledError:
+                pass
+        if self.pubsub:
+            await self.pubsub.close()
+        for name in list(self.held):
+            await self.release_leadership(name)
+
+    async def publish(self, channel: str, message: dict):
+        await self.client.publish(f"{self.prefix}:events:{channel}", json.dumps(message))
+
+    async def acquire_leadership(self, name: str) -> bool:
+        key = self._leader_key(name)
+        leader = bool(await self.client.set(key, self.worker_id, nx=True, px=self.lease_ms))
+        if not leader:
+            leader = bool(await self.client.eval(RENEW_SCRIPT, 1, key, self.worker_id, self.lease_ms))
+        if leader:
+            self.held.add(name)
+        else:
+            self.held.discard(name)
+        return leader
+
+    async def release_leadership(self, name: str):
+        self.held.discard(name)
+        key = self._leader_key(name)
+        owner = await self.client.get(key)
+        if owner is not None and (owner.decode() if isinstance(owner, bytes) else owner) == self.worker_id:
+            await self.client.delete(key)
+
+    def _leader_key(self, name: str) -> str:
+        return f"{self.prefix}:leader:{name}"
+
+    async def _reader_loop(self):
+        channel_prefix = f"{self.prefix}:events:"
+        async for item in self.pubsub.listen():
+            if item.get("type") not in ("message", "pmessage"):
+                continue
+            channel = item["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            await self._dispatch(channel[len(channel_prefix):], json.loads(item["data"]))
+
+
+class ElectedSingleton:
+    """Runs start/stop callbacks as this worker gains or loses leadership of `name`."""
+
+    def __init__(self, backplane: Backplane, name: str, start: Callable[[], Awaitable[None]], stop: Callable[[], Awaitable[None]], interval: float = 5.0):
+        self.backplane = backplane
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.interval = interval
+        self.is_leader = False
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    leader = await self.backplane.acquire_leadership(self.name)
+                except Exception as e:
+                    print(f"Leader election for {self.name} failed: {e}")
+                    leader = False
+
+                if leader and not self.is_leader:
+                    self.is_leader = True
+                    print(f"This worker is now running the {self.name} singleton")
+                    await self.start()
+                elif not leader and self.is_leader:
+                    self.is_leader = False
+                    await self.stop()
+
+                await asyncio.sleep(self.interval)
+        finally:
+            if self.is_leader:
+                self.is_leader = False
+                await self.stop()
+                await self.backplane.release_leadership(self.name)
+
+
+def create_backplane(url: Optional[str] = None) -> Backplane:
+    url = url or os.getenv("GLYPHOR_BACKPLANE", "memory://")
+    if url.startswith("memory://"):
+        return InProcessBackplane()
+    if url.startswith("unix://"):
+        return UnixSocketBackplane(url[len("unix://"):] or DEFAULT_SOCKET_PATH)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackplane(url)
+    raise ValueError(f"Unsupported backplane url: {url}")
@@ -0,0 +1,39 @@
+"""
+Reclassifying history: scalar InventoryDemandClassifier.classify loop vs classify_batch.
+
+Run from backend/:  python -m benchmarks.bench_classifier [rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+
+
+def run(rows=1_000_000):
+    rng = np.random.default_rng(0)
+    total = np.full(rows, 1000.0)
+    current = rng.integers(1, 1000, rows).astype(float)
+    demand = rng.integers(0, 700, rows).astype(float)
+    InventoryDemandClassifier().classify_batch(total[:10], current[:10], demand[:10])  #scipy import
+
+    start = time.perf_counter()
+    scalar = InventoryDemandClassifier()
+    statuses = [scalar.classify(None, t, c, d)["status"] for t, c, d in zip(total.tolist(), current.tolist(), demand.tolist())]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = InventoryDemandClassifier().classify_batch(total, current, demand)
+    batch_s = time.perf_counter() - start
+    assert batch["status"].tolist() == statuses
+
+    print(f"rows={rows}")
+    print(f"scalar classify loop: {scalar_s:8.2f} s")
+    print(f"classify_batch:       {batch_s:8.2f} s")
+    print(f"speedup:              {scalar_s / batch_s:8.1f}x")
+    return {"scalar_s": scalar_s, "batch_s": batch_s}
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:2]])
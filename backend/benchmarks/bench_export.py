@@ -0,0 +1,55 @@
+"""
+Serving cost of the LSTM: eager float vs TorchScript float vs TorchScript int8.
+
+Run from backend/:  python -m benchmarks.bench_export [window_size] [horizon] [batch]
+"""
+import io
+import sys
+
+import numpy as np
+import torch
+
+from models.forecasting.export import quantize_model, script_model, time_forward
+from models.forecasting.incremental_lstm import LSTMMultiHorizonPredictor
+
+
+def serialized_mb(model):
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)
+    else:
+        torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+def run(window_size=20, horizon=10, batch=1):
+    torch.manual_seed(0)
+    torch.set_num_threads(1)
+    float_model = LSTMMultiHorizonPredictor(horizon=horizon).eval()
+    variants = {
+        "eager float32": float_model,
+        "torchscript float32": script_model(float_model),
+        "torchscript int8": script_model(quantize_model(float_model))
+    }
+
+    t = np.linspace(0, 20, 512 + window_size, dtype=np.float32)
+    X = torch.from_numpy(np.lib.stride_tricks.sliding_window_view(0.5 + 0.4 * np.sin(t), window_size).copy()).unsqueeze(-1)
+    with torch.inference_mode():
+        reference = float_model(X)
+
+    window = torch.rand(batch, window_size, 1)
+    rows = []
+    print(f"window={window_size} horizon={horizon} batch={batch} threads=1")
+    print(f"{'variant':>20} {'ms/pass':>8} {'MB':>6} {'max |delta|':>12}")
+    for name, model in variants.items():
+        with torch.inference_mode():
+            delta = float((model(X) - reference).abs().max())
+        ms = time_forward(model, window, number=200)
+        size = serialized_mb(model)
+        rows.append({"variant": name, "ms": ms, "mb": size, "max_abs_delta": delta})
+        print(f"{name:>20} {ms:>8.3f} {size:>6.2f} {delta:>12.5f}")
+    return rows
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,38 @@
+"""
+Forecast latency vs horizon: recursive single-step LSTM vs direct multi-horizon head.
+
+Run from backend/:  python -m benchmarks.bench_horizon [window_size]
+"""
+import sys
+import timeit
+
+import torch
+
+from models.forecasting.incremental_lstm import LSTMDemandPredictor, LSTMForecaster, LSTMMultiHorizonPredictor
+
+HORIZONS = (1, 5, 10, 30, 60)
+
+
+def time_forecast(forecaster, history, steps, repeat=5, number=20):
+    return min(timeit.repeat(lambda: forecaster.predict(history, steps), number=number, repeat=repeat)) / number * 1000
+
+
+def run(window_size=20):
+    torch.manual_seed(0)
+    history = [100.0 + i for i in range(window_size)]
+    recursive = LSTMForecaster(LSTMDemandPredictor(), 0, 200, window_size)
+
+    rows = []
+    print(f"window={window_size} threads={torch.get_num_threads()}")
+    print(f"{'horizon':>8} {'recursive ms':>13} {'direct ms':>10} {'speedup':>8}")
+    for horizon in HORIZONS:
+        direct = LSTMForecaster(LSTMMultiHorizonPredictor(horizon=horizon), 0, 200, window_size)
+        recursive_ms = time_forecast(recursive, history, horizon)
+        direct_ms = time_forecast(direct, history, horizon)
+        rows.append({"horizon": horizon, "recursive_ms": recursive_ms, "direct_ms": direct_ms})
+        print(f"{horizon:>8} {recursive_ms:>13.3f} {direct_ms:>10.3f} {recursive_ms / direct_ms:>7.1f}x")
+    return rows
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,89 @@
+"""
+Peak RSS and time to load the demand log: legacy full-CSV pandas read vs
+column-selected, float32 reads from the store (full history and tail window).
+Each reader runs in a fresh interpreter so its high-water mark is its own.
+
+Run from backend/:  python -m benchmarks.bench_log_read [rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from models.forecasting.log_store import COLUMNS, LogStore
+
+READERS = {
+    "legacy read_csv (all columns)": """
+import pandas as pd
+df = pd.read_csv(CSV)
+df['timestamp'] = pd.to_datetime(df['timestamp'])
+df = df.sort_values(by='timestamp')
+rows = len(df)
+""",
+    "store timestamp+demand": """
+from models.forecasting.log_store import read_columns
+rows = len(read_columns(DB, ("timestamp", "demand"))["demand"])
+""",
+    "store tail window (1000)": """
+from models.forecasting.log_store import read_columns
+rows = len(read_columns(DB, ("timestamp", "demand"), tail=1000)["demand"])
+"""
+}
+
+#VmHWM rather than ru_maxrss: a child's ru_maxrss starts at the parent's, which just built the logs
+PROBE = """
+import json, time
+import numpy, pandas
+def high_water_kb():
+    with open("/proc/self/status") as f:
+        return int(next(line for line in f if line.startswith("VmHWM")).split()[1])
+CSV, DB = {csv!r}, {db!r}
+baseline = high_water_kb()
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+peak = high_water_kb()
+print(json.dumps({{"rows": rows, "seconds": elapsed, "peak_mb": (peak - baseline) / 1024}}))
+"""
+
+
+def write_logs(directory, rows):
+    rng = np.random.default_rng(0)
+    days = rng.integers(0, 3650, rows)
+    seconds = rng.integers(0, 86400, rows)
+    stamps = (np.datetime64("2015-01-01T00:00:00") + days.astype("timedelta64[D]") + seconds.astype("timedelta64[s]")).astype(str)
+    demand = rng.uniform(10, 700, rows).round(2)
+    current = rng.uniform(100, 1000, rows).round(2)
+    data = [(stamps[i], 1000.0, current[i], demand[i], 0.1, 0.8, 0.2, 0.3, 0.7, 0.4, "Normal") for i in range(rows)]
+
+    csv_path = os.path.join(directory, "inventory_log.csv")
+    with open(csv_path, "w") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        f.writelines(",".join(map(str, row)) + "\n" for row in data)
+
+    db_path = os.path.join(directory, "inventory_log.db")
+    store = LogStore(db_path)
+    for i in range(0, rows, 100_000):
+        store.append(data[i:i + 100_000])
+    return csv_path, db_path
+
+
+def run(rows=2_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, db_path = write_logs(directory, rows)
+        print(f"rows={rows} csv={os.path.getsize(csv_path) / 1e6:.0f} MB")
+        print(f"{'reader':>30} {'seconds':>8} {'peak MB':>8}")
+        results = {}
+        for name, body in READERS.items():
+            probe = PROBE.format(csv=csv_path, db=db_path, body=body)
+            output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+            print(f"{name:>30} {results[name]['seconds']:>8.2f} {results[name]['peak_mb']:>8.1f}")
+        return results
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,70 @@
+"""
+Demand log ingestion throughput: the original per-row CSV open/append/close,
+one store transaction per row, and the buffered LogWriter from one and from
+several threads.
+
+Run from backend/:  python -m benchmarks.bench_log_writer [rows]
+"""
+import csv
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from models.forecasting.log_store import COLUMNS, LogStore
+from models.forecasting.log_writer import LogWriter
+
+
+def rows(count):
+    return [[f"2024-01-01T00:00:{i % 60:02d}", 1000, 800, i % 400, 0.1, 0.8, 0.125, 0.1, 0.8, 0.125, "Normal"] for i in range(count)]
+
+
+def csv_per_row(directory, data):
+    path = os.path.join(directory, "log.csv")
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerow(COLUMNS)
+    for row in data:
+        with open(path, "a", newline="") as f:
+            csv.writer(f).writerow(row)
+
+
+def store_per_row(directory, data):
+    store = LogStore(os.path.join(directory, "per_row.db"))
+    for row in data:
+        store.append([row])
+
+
+def buffered(threads):
+    def run(directory, data):
+        writer = LogWriter(LogStore(os.path.join(directory, f"buffered_{threads}.db")))
+        share = len(data) // threads
+        workers = [threading.Thread(target=lambda part: [writer.write(row) for row in part], args=(data[i * share:(i + 1) * share],)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        writer.close()
+    return run
+
+
+def main(count=20000):
+    data = rows(count)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write in [
+            ("csv open/append/close per row", csv_per_row),
+            ("store transaction per row", store_per_row),
+            ("LogWriter, 1 thread", buffered(1)),
+            ("LogWriter, 4 threads", buffered(4))
+        ]:
+            start = time.perf_counter()
+            write(directory, data)
+            elapsed = time.perf_counter() - start
+            results[name] = {"seconds": round(elapsed, 3), "rows_per_second": round(count / elapsed)}
+    print(json.dumps({"rows": count, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,44 @@
+"""
+Spike detection throughput on one core: demand events pushed one at a time
+through SpikeDetector.observe, as the "demand" channel delivers them, across
+many (inventory, item) series with occasional surges.
+
+Run from backend/:  python -m benchmarks.bench_spike_detector [events] [series]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from spike_detector import SpikeDetector
+
+
+def events(count, series, seed=0):
+    rng = np.random.default_rng(seed)
+    inventory = rng.integers(0, series, count)
+    demand = rng.normal(100, 10, count).clip(0)
+    surge = rng.random(count) < 0.001
+    demand[surge] *= 5
+    return [(int(key) // 10, int(key) % 10, float(value), i) for i, (key, value) in enumerate(zip(inventory, demand))]
+
+
+def main(count=1_000_000, series=5000):
+    stream = events(count, series)
+    detector = SpikeDetector()
+    observe = detector.observe
+    start = time.perf_counter()
+    for inventory_id, item_id, demand, row_id in stream:
+        observe(inventory_id, item_id, demand, None, row_id)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "events": count,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(count / elapsed),
+        "microseconds_per_event": round(elapsed / count * 1e6, 2),
+        **detector.stats()
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+"""
+API worker startup cost: import time and resident memory of a fresh
+interpreter after importing main.py (and forecast_router.py), next to what
+the forecasting stack costs when it does load, on the first model load or
+inside a forecast pool process. Each import runs in its own interpreter.
+
+Run from backend/:  python -m benchmarks.bench_startup [repeats]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORTS = {
+    "api: main": "import main",
+    "api: forecast_router": "import forecast_router",
+    "forecasting stack: incremental_lstm": "import models.forecasting.incremental_lstm"
+}
+HEAVY = ("torch", "pandas", "sklearn", "scipy", "statsmodels")
+
+PROBE = """
+import json, sys, time
+def status_kb(field):
+    with open("/proc/self/status") as f:
+        return int(next(line for line in f if line.startswith(field)).split()[1])
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_mb": status_kb("VmRSS") / 1024, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(body, repeats):
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(body=body, heavy=HEAVY)], capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "seconds": round(statistics.median(run["seconds"] for run in runs), 3),
+        "rss_mb": round(statistics.median(run["rss_mb"] for run in runs), 1),
+        "heavy_modules": runs[-1]["loaded"]
+    }
+
+
+def main(repeats=3):
+    #one untimed run so every measurement sees a warm page cache
+    measure(IMPORTS["forecasting stack: incremental_lstm"], 1)
+    results = {name: measure(body, repeats) for name, body in IMPORTS.items()}
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark: loop-based create_sequences vs strided make_windows.
+
+Run from backend/:  python -m benchmarks.bench_windowing [rows] [window_size] [features]
+"""
+import sys
+import timeit
+
+import numpy as np
+import torch
+
+from models.forecasting.windowing import make_windows
+
+
+def legacy_create_sequences(data, window_size):
+    X, y = [], []
+    for i in range(len(data) - window_size):
+        X.append(data[i:i + window_size])
+        y.append(data[i + window_size])
+    X = np.array(X)
+    y = np.array(y)
+    return torch.tensor(X, dtype=torch.float32), torch.tensor(y, dtype=torch.float32)
+
+
+def run(rows=200_000, window_size=20, features=1, repeat=3):
+    data = np.random.default_rng(0).random((rows, features), dtype=np.float32)
+
+    legacy_X, _ = legacy_create_sequences(data, window_size)
+    strided_X, _ = make_windows(data, window_size)
+    assert torch.equal(legacy_X, strided_X)
+
+    legacy = min(timeit.repeat(lambda: legacy_create_sequences(data, window_size), number=1, repeat=repeat))
+    strided = min(timeit.repeat(lambda: make_windows(data, window_size), number=1, repeat=repeat))
+    materialised_mb = legacy_X.numel() * legacy_X.element_size() / 1e6
+
+    print(f"rows={rows} window={window_size} features={features}")
+    print(f"legacy loop:   {legacy * 1000:9.2f} ms  ({materialised_mb:.1f} MB of windows copied)")
+    print(f"strided view:  {strided * 1000:9.2f} ms  (0 MB copied, shares the input buffer)")
+    print(f"speedup:       {legacy / strided:9.1f}x")
+    return {"legacy_ms": legacy * 1000, "strided_ms": strided * 1000}
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run(*args)
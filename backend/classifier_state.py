@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+
+STATE_PATH = os.path.join("models", "forecasting", "classifier_state.npz")
+STATUSES = ("Unknown", "Normal", "Warning", "Critical", "Invalid")
+AVERAGES = ("avg_demand_pct", "avg_inventory_pct", "avg_risk_ratio")
+LATEST = ("demand_pct", "inventory_pct", "risk_ratio")
+
+
+def inventory_capacity(inventory: dict):
+    #the classifier's total/current: the inventory's whole volume and what is occupied now
+    total = inventory.get("volumeOccupied", 0) + inventory.get("volumeAvailable", 0) + inventory.get("volumeReserved", 0)
+    return total, inventory.get("volumeOccupied", 0)
+
+
+class ClassifierState:
+    """
+    Per-inventory InventoryDemandClassifier state in flat arrays, one slot per
+    inventory. Each demand_history row moves that inventory's EWMAs one step with
+    the classifier's own update rule, so the current status is an array lookup
+    instead of a replay from the classifier's priors. Rows at or below an
+    inventory's last seen id are ignored, which makes replays and reconciliation
+    idempotent. State is checkpointed to an .npz file and reloaded on start.
+    """
+
+    def __init__(self, path: Optional[str] = STATE_PATH, initial_slots: int = 64, alpha: float = 0.95):
+        self.path = path
+        self.alpha = alpha
+        self.slots: Dict[int, int] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.allocate(initial_slots)
+        self.load()
+
+    def allocate(self, size: int):
+        prior = InventoryDemandClassifier(self.alpha)
+        self.arrays = {
+            "inventory_id": np.zeros(size, dtype=np.int64),
+            "last_id": np.full(size, -1, dtype=np.int64),
+            "observations": np.zeros(size, dtype=np.int64),
+            "status": np.zeros(size, dtype=np.int8),
+            "total": np.zeros(size, dtype=np.float64),
+            "current": np.zeros(size, dtype=np.float64),
+            "updated_at": np.zeros(size, dtype=np.float64),
+            **{name: np.full(size, getattr(prior, name), dtype=np.float64) for name in AVERAGES},
+            **{name: np.full(size, np.nan, dtype=np.float64) for name in LATEST}
+        }
+
+    def grow(self):
+        size = len(self.arrays["inventory_id"])
+        old = self.arrays
+        self.allocate(size * 2)
+        for name, values in old.items():
+            self.arrays[name][:size] = values
+
+    def slot(self, inventory_id: int) -> int:
+        inventory_id = int(inventory_id)
+        index = self.slots.get(inventory_id)
+        if index is None:
+            index = len(self.slots)
+            if index >= len(self.arrays["inventory_id"]):
+                self.grow()
+            self.arrays["inventory_id"][index] = inventory_id
+            self.slots[inventory_id] = index
+        return index
+
+    def set_capacity(self, inventory_id: int, total: float, current: float):
+        with self.lock:
+            index = self.slot(inventory_id)
+            self.arrays["total"][index] = total
+            self.arrays["current"][index] = current
+
+    def update_capacities(self, inventories: Iterable[dict]):
+        for inventory in inventories:
+            self.set_capacity(inventory["id"], *inventory_capacity(inventory))
+
+    def classifier(self, index: int) -> InventoryDemandClassifier:
+        classifier = InventoryDemandClassifier(self.alpha)
+        for name in AVERAGES:
+            setattr(classifier, name, float(self.arrays[name][index]))
+        return classifier
+
+    def observe(self, inventory_id: int, demand: float, row_id: Optional[int] = None, total: Optional[float] = None, current: Optional[float] = None) -> Optional[dict]:
+        """One demand observation; total/current default to the inventory's last known capacity."""
+        with self.lock:
+            index = self.slot(inventory_id)
+            if row_id is not None and row_id <= self.arrays["last_id"][index]:
+                return None
+            total = self.arrays["total"][index] if total is None else total
+            current = self.arrays["current"][index] if current is None else current
+
+            classifier = self.classifier(index)
+            result = classifier.classify(None, float(total), float(current), float(demand))
+            if result == "Invalid":
+                self.arrays["status"][index] = STATUSES.index("Invalid")
+            else:
+                for name in AVERAGES:
+                    self.arrays[name][index] = getattr(classifier, name)
+                for name in LATEST:
+                    self.arrays[name][index] = result[name]
+                self.arrays["status"][index] = STATUSES.index(result["status"])
+            if row_id is not None:
+                self.arrays["last_id"][index] = row_id
+            self.arrays["observations"][index] += 1
+            self.arrays["updated_at"][index] = datetime.now().timestamp()
+            self.dirty = True
+            return self.status_at(index)
+
+    def observe_rows(self, rows: Iterable[dict]) -> int:
+        """
+        Replays demand_history rows in (timestamp, id) order through classify_batch,
+        one batch per inventory, skipping rows each inventory has already seen.
+        """
+        by_inventory = defaultdict(list)
+        for row in sorted(rows, key=lambda row: (row.get("timestamp", ""), row.get("id", 0))):
+            by_inventory[int(row["inventoryId"])].append(row)
+
+        applied = 0
+        with self.lock:
+            for inventory_id, inventory_rows in by_inventory.items():
+                index = self.slot(inventory_id)
+                fresh = [row for row in inventory_rows if row.get("id") is None or row["id"] > self.arrays["last_id"][index]]
+                if not fresh:
+                    continue
+                count = len(fresh)
+                classifier = self.classifier(index)
+                result = classifier.classify_batch(
+                    np.full(count, self.arrays["total"][index]),
+                    np.full(count, self.arrays["current"][index]),
+                    [row.get("demandQuantity", 0) for row in fresh]
+                )
+                for name in AVERAGES:
+                    self.arrays[name][index] = getattr(classifier, name)
+                valid = np.flatnonzero(result["status"] != "Invalid")
+                if len(valid):
+                    for name in LATEST:
+                        self.arrays[name][index] = result[name][valid[-1]]
+                self.arrays["status"][index] = STATUSES.index(result["status"][-1])
+                self.arrays["last_id"][index] = max([self.arrays["last_id"][index]] + [row["id"] for row in fresh if row.get("id") is not None])
+                self.arrays["observations"][index] += count
+                self.arrays["updated_at"][index] = datetime.now().timestamp()
+                applied += count
+            self.dirty = self.dirty or applied > 0
+        return applied
+
+    def status_at(self, index: int) -> dict:
+        arrays = self.arrays
+        return {
+            "inventory_id": int(arrays["inventory_id"][index]),
+            "status": STATUSES[arrays["status"][index]],
+            **{name: (None if np.isnan(arrays[name][index]) else round(float(arrays[name][index]), 3)) for name in LATEST},
+            **{name: round(float(arrays[name][index]), 3) for name in AVERAGES},
+            "observations": int(arrays["observations"][index]),
+            "updated_at": datetime.fromtimestamp(arrays["updated_at"][index]).isoformat() if arrays["updated_at"][index] else None
+        }
+
+    def status(self, inventory_id) -> Optional[dict]:
+        index = self.slots.get(int(inventory_id))
+        return None if index is None else self.status_at(index)
+
+    def save(self) -> bool:
+        if not self.path or not self.dirty:
+            return False
+        with self.lock:
+            used = len(self.slots)
+            arrays = {name: values[:used].copy() for name, values in self.arrays.items()}
+            self.dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.dirty = True
+            print(f"Could not checkpoint classifier state: {e}")
+            return False
+        return True
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as saved:
+                used = len(saved["inventory_id"])
+                while len(self.arrays["inventory_id"]) < used:
+                    self.grow()
+                for name in self.arrays:
+                    if name in saved:
+                        self.arrays[name][:used] = saved[name]
+            self.slots = {int(inventory_id): index for index, inventory_id in enumerate(self.arrays["inventory_id"][:used])}
+        except Exception as e:
+            print(f"Ignoring unreadable classifier state {self.path}: {e}")
+
+    def stats(self) -> dict:
+        return {"inventories": len(self.slots), "dirty": self.dirty, "observations": int(self.arrays["observations"][:len(self.slots)].sum())}
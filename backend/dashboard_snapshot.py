@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timezone
+from time import time
+from typing import Awaitable, Callable, Optional
+
+
+class DashboardSnapshot:
+    """
+    Precomputed dashboard payload served with stale-while-revalidate semantics.
+    Readers always get the last snapshot straight from memory; a refresh is
+    kicked off in the background once it is older than `max_age` seconds.
+    """
+
+    def __init__(self, compute: Callable[[], Awaitable[dict]], max_age: float = 30.0, on_refresh: Optional[Callable[[dict], Awaitable[None]]] = None):
+        self.compute = compute
+        self.max_age = max_age
+        self.on_refresh = on_refresh
+        self.value: Optional[dict] = None
+        self.generated_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.invalidated_at: Optional[float] = None
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    def age(self) -> float:
+        return time() - self.generated_at if self.generated_at else float("inf")
+
+    def is_dirty(self) -> bool:
+        return self.invalidated_at is not None and (self.started_at is None or self.invalidated_at >= self.started_at)
+
+    def is_stale(self) -> bool:
+        return self.is_dirty() or self.age() > self.max_age
+
+    async def get(self) -> dict:
+        if self.value is None:
+            await self.refresh()
+        elif self.age() > self.max_age:
+            self.refresh_in_background()
+        return self.value
+
+    def freshness(self) -> dict:
+        return {
+            "generated_at": datetime.fromtimestamp(self.generated_at, timezone.utc).isoformat() if self.generated_at else None,
+            "age_seconds": round(self.age(), 3) if self.generated_at else None,
+            "stale": self.is_stale()
+        }
+
+    def refresh_in_background(self):
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self):
+        started = time()
+        async with self.lock:
+            #someone else finished a refresh while we waited for the lock
+            if self.started_at and self.started_at >= started and not self.is_dirty():
+                return
+            started = time()
+            value = await self.compute()
+            payload = {"value": value, "started_at": started, "generated_at": time()}
+            self.apply(payload)
+            if self.on_refresh:
+                await self.on_refresh(payload)
+
+    #snapshots computed by another worker arrive here through the backplane
+    def apply(self, payload: dict):
+        if self.generated_at and payload["generated_at"] < self.generated_at:
+            return
+        self.value = payload["value"]
+        self.started_at = payload["started_at"]
+        self.generated_at = payload["generated_at"]
+
+    def invalidate(self):
+        self.invalidated_at = time()
+
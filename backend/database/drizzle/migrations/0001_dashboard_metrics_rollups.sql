@@ -0,0 +1,3 @@
+ALTER TABLE "dashboard_metrics" ADD COLUMN "inventory_id" integer;--> statement-breakpoint
+ALTER TABLE "dashboard_metrics" ADD CONSTRAINT "dashboard_metrics_inventory_id_inventory_id_fk" FOREIGN KEY ("inventory_id") REFERENCES "public"."inventory"("id") ON DELETE cascade ON UPDATE no action;--> statement-breakpoint
+ALTER TABLE "dashboard_metrics" ADD CONSTRAINT "dashboard_metrics_bucket_unique" UNIQUE NULLS NOT DISTINCT("metric_type","period","recorded_at","inventory_id");
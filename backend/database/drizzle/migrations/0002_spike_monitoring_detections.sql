@@ -0,0 +1,12 @@
+ALTER TABLE "spike_monitoring" ADD COLUMN "item_id" integer;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "demand_quantity" integer;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "baseline" double precision;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "z_score" double precision;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "spike_pct" double precision;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "utilization" double precision;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "severity" varchar(20);--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "status" varchar(20);--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD COLUMN "recommended_action" text;--> statement-breakpoint
+ALTER TABLE "spike_monitoring" ADD CONSTRAINT "spike_monitoring_item_id_items_item_id_fk" FOREIGN KEY ("item_id") REFERENCES "public"."items"("item_id") ON DELETE cascade ON UPDATE no action;--> statement-breakpoint
+CREATE INDEX "spike_monitoring_created_at_idx" ON "spike_monitoring" USING btree ("created_at");--> statement-breakpoint
+CREATE INDEX "spike_monitoring_status_created_at_idx" ON "spike_monitoring" USING btree ("status","created_at");
@@ -0,0 +1,5 @@
+ALTER TABLE "forecasting_metrics" ADD COLUMN "forecast_date" date;--> statement-breakpoint
+ALTER TABLE "forecasting_metrics" ADD COLUMN "horizon_days" integer;--> statement-breakpoint
+ALTER TABLE "forecasting_metrics" ADD COLUMN "model" varchar(20);--> statement-breakpoint
+ALTER TABLE "forecasting_metrics" ADD COLUMN "forecast" jsonb;--> statement-breakpoint
+ALTER TABLE "forecasting_metrics" ADD CONSTRAINT "forecasting_metrics_inventory_date_unique" UNIQUE("inventory_id","forecast_date");
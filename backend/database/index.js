@@ -13,7 +13,7 @@ import {
     realTimeAlerts,
     dashboardMetrics
 } from './schema.js';
-import {eq, and, or, inArray, asc, desc, gte} from 'drizzle-orm';
+import {eq, and, or, inArray, asc, desc, gt, gte, lt, isNull, sql} from 'drizzle-orm';
 
 //inventory ops
 export const inventory_ops = {
@@ -453,6 +453,34 @@ export const forecastingMetrics_ops = {
         }
     },
 
+    //nightly batch rows, a rerun for the same date replaces that date's row
+    async upsertMany(rows){
+        try{
+            if (!rows || rows.length === 0) {
+                return {success: true, data: []};
+            }
+            const values = rows.map(row => ({...row, updatedAt: new Date()}));
+            const result = await db.insert(forecastingMetrics)
+                .values(values)
+                .onConflictDoUpdate({
+                    target: [forecastingMetrics.inventoryId, forecastingMetrics.forecastDate],
+                    set: {
+                        howMuchTimeToFill: sql`excluded.how_much_time_to_fill`,
+                        predictedDemand: sql`excluded.predicted_demand`,
+                        actualDemand: sql`excluded.actual_demand`,
+                        horizonDays: sql`excluded.horizon_days`,
+                        model: sql`excluded.model`,
+                        forecast: sql`excluded.forecast`,
+                        updatedAt: sql`excluded.updated_at`
+                    }
+                })
+                .returning({forecastId: forecastingMetrics.forecastId});
+            return {success: true, data: result};
+        }catch(err) {
+            return {success: false, error: err.message};
+        }
+    },
+
     //update forecasting metric by id
     async updateById(id, data){
         try{
@@ -500,6 +528,19 @@ export const demandhistory_ops = {
         }
     },
 
+    //rows newer than the caller's watermark, oldest first, so syncs only read what they have not seen
+    async getAfterId(afterId, limit = 5000){
+        try{
+            const result = await db.select().from(demandHistory)
+                .where(gt(demandHistory.id, afterId))
+                .orderBy(asc(demandHistory.id))
+                .limit(limit);
+            return {success: true, data: result};
+        }catch(err) {
+            return {success: false, error: err.message};
+        }
+    },
+
     //get demand history by id
     async getById(id){
         try{
@@ -607,7 +648,8 @@ export const realtimealert_ops = {
     //update alert if resolved
     async updateResolved(id){
         try{
-            const result = await db.update(realTimeAlerts).set({isResolved:true, resolvedAt: new Date()}).where(eq(realTimeAlerts.id, id)).returning();
+            //only flips unresolved alerts so callers can tell a real resolve from a repeat
+            const result = await db.update(realTimeAlerts).set({isResolved:true, resolvedAt: new Date()}).where(and(eq(realTimeAlerts.id, id), eq(realTimeAlerts.isResolved, false))).returning();
             return {success: true, data: result};
         }catch(err) {
             return {success: false, error: err.message};
@@ -732,6 +774,69 @@ export const spikemonitoring_ops = {
         }
     },
 
+    //insert a batch of detected spikes in one statement
+    async createMany(rows){
+        try{
+            if (!rows || rows.length === 0) {
+                return {success: true, data: []};
+            }
+            const result = await db.insert(spikeMonitoring).values(rows).returning();
+            return {success: true, data: result};
+        }catch(err) {
+            return {success: false, error: err.message};
+        }
+    },
+
+    //newest spikes first with the inventory name, served by the created_at index
+    async getRecent(limit){
+        try{
+            const result = await db.select({
+                    spikeMonitoringId: spikeMonitoring.spikeMonitoringId,
+                    inventoryId: spikeMonitoring.inventoryId,
+                    itemId: spikeMonitoring.itemId,
+                    demandQuantity: spikeMonitoring.demandQuantity,
+                    baseline: spikeMonitoring.baseline,
+                    zScore: spikeMonitoring.zScore,
+                    spikePct: spikeMonitoring.spikePct,
+                    utilization: spikeMonitoring.utilization,
+                    severity: spikeMonitoring.severity,
+                    status: spikeMonitoring.status,
+                    recommendedAction: spikeMonitoring.recommendedAction,
+                    createdAt: spikeMonitoring.createdAt,
+                    updatedAt: spikeMonitoring.updatedAt,
+                    inventoryName: inventory.name,
+                    inventoryStatus: inventory.status,
+                    volumeOccupied: inventory.volumeOccupied,
+                    volumeAvailable: inventory.volumeAvailable
+                })
+                .from(spikeMonitoring)
+                .leftJoin(inventory, eq(spikeMonitoring.inventoryId, inventory.id))
+                .orderBy(desc(spikeMonitoring.createdAt))
+                .limit(limit || 200);
+            return {success: true, data: result};
+        }catch(err) {
+            return {success: false, error: err.message};
+        }
+    },
+
+    //age detected spikes: active -> monitoring after 2h, anything open -> resolved after 6h
+    async ageStatuses(){
+        try{
+            const now = Date.now();
+            const resolved = await db.update(spikeMonitoring)
+                .set({status: "resolved"})
+                .where(and(inArray(spikeMonitoring.status, ["active", "monitoring"]), lt(spikeMonitoring.createdAt, new Date(now - 6 * 3600 * 1000))))
+                .returning({id: spikeMonitoring.spikeMonitoringId});
+            const monitoring = await db.update(spikeMonitoring)
+                .set({status: "monitoring"})
+                .where(and(eq(spikeMonitoring.status, "active"), lt(spikeMonitoring.createdAt, new Date(now - 2 * 3600 * 1000))))
+                .returning({id: spikeMonitoring.spikeMonitoringId});
+            return {success: true, data: {resolved: resolved.length, monitoring: monitoring.length}};
+        }catch(err) {
+            return {success: false, error: err.message};
+        }
+    },
+
     //update spike moitoring by id
     async updateById(id, data){
         try{
@@ -851,6 +956,58 @@ export const dashboardmetrics_ops = {
         } catch (err) {
             return { success: false, error: err.message };
         }
+    },
+
+    //add deltas into hourly/daily/weekly buckets, rows are already coalesced per bucket
+    async applyRollups(rows) {
+        try {
+            if (!rows || rows.length === 0) {
+                return { success: true, data: [] };
+            }
+            const values = rows.map(row => ({
+                metricType: row.metricType,
+                period: row.period,
+                recordedAt: new Date(row.bucketStart),
+                inventoryId: row.inventoryId ?? null,
+                value: row.delta
+            }));
+            const result = await db.insert(dashboardMetrics)
+                .values(values)
+                .onConflictDoUpdate({
+                    target: [dashboardMetrics.metricType, dashboardMetrics.period, dashboardMetrics.recordedAt, dashboardMetrics.inventoryId],
+                    set: { value: sql`${dashboardMetrics.value} + excluded.value` }
+                })
+                .returning();
+            return { success: true, data: result };
+        } catch (err) {
+            return { success: false, error: err.message };
+        }
+    },
+
+    //rollup buckets for trend charts, global rows unless inventoryId is given
+    async getRange(query) {
+        try {
+            const conditions = [
+                eq(dashboardMetrics.period, query.period || "daily"),
+                query.inventoryId != null ? eq(dashboardMetrics.inventoryId, query.inventoryId) : isNull(dashboardMetrics.inventoryId)
+            ];
+            if (query.metricType) {
+                conditions.push(eq(dashboardMetrics.metricType, query.metricType));
+            }
+            if (query.from) {
+                conditions.push(gte(dashboardMetrics.recordedAt, new Date(query.from)));
+            }
+            if (query.to) {
+                conditions.push(lt(dashboardMetrics.recordedAt, new Date(query.to)));
+            }
+            const result = await db.select()
+                .from(dashboardMetrics)
+                .where(and(...conditions))
+                .orderBy(asc(dashboardMetrics.recordedAt));
+            return { success: true, data: result };
+        } catch (err) {
+            return { success: false, error: err.message };
+        }
     }
 };
 
@@ -922,6 +1079,17 @@ if (process.argv.length >= 3) {
                     console.error(JSON.stringify({ success: false, error: error.message }));
                     process.exit(1);
                 });
+        } else if (method === 'getAfterId' && Array.isArray(data) && data.length === 2) {
+            const [afterId, limit] = data;
+            operations[module][method](afterId, limit)
+                .then(result => {
+                    console.log(JSON.stringify(result));
+                    process.exit(0);
+                })
+                .catch(error => {
+                    console.error(JSON.stringify({ success: false, error: error.message }));
+                    process.exit(1);
+                });
         } else if (method === 'getPreviousMetrics' && Array.isArray(data) && data.length >= 1) {
             const [metricType, daysBack] = data;
             operations[module][method](metricType, daysBack)
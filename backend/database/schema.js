@@ -1,4 +1,4 @@
-import { pgTable, serial, text, varchar, boolean, timestamp, integer, uuid, doublePrecision,  pgEnum, time } from 'drizzle-orm/pg-core';
+import { pgTable, serial, text, varchar, boolean, timestamp, integer, uuid, doublePrecision,  pgEnum, time, unique, index, date, jsonb } from 'drizzle-orm/pg-core';
 import { relations } from 'drizzle-orm';
 
 //so need to design the schemas here
@@ -88,9 +88,16 @@ export const forecastingMetrics = pgTable("forecasting_metrics", {
     howMuchTimeToFill: time("how_much_time_to_fill").notNull(),
     predictedDemand: doublePrecision("predicted_demand").notNull(),
     actualDemand: doublePrecision("actual_demand").notNull(),
+    //set by the nightly batch -> one row per inventory per run date, manual rows leave these null
+    forecastDate: date("forecast_date"),
+    horizonDays: integer("horizon_days"),
+    model: varchar("model", { length: 20 }),
+    forecast: jsonb("forecast"),
     createdAt: timestamp("created_at", { withTimezone: true }).defaultNow(),
     updatedAt: timestamp("updated_at", { withTimezone: true }).defaultNow().$onUpdateFn(() => new Date()),
-});
+}, (table) => [
+    unique("forecasting_metrics_inventory_date_unique").on(table.inventoryId, table.forecastDate),
+]);
 
 //6. admin -> admin_id, name, email, password, created_at, updated_at
 export const admin = pgTable("admin", {
@@ -103,14 +110,28 @@ export const admin = pgTable("admin", {
 });
 
 //7. spike_monitoring -> spike_monitoring_id, inventory_id, created_at, updated_at
+//detected rows also carry the item, the demand against its ewma baseline and severity/status computed when written
 export const spikeMonitoring = pgTable("spike_monitoring", {
     spikeMonitoringId: serial("spike_monitoring_id").primaryKey(),
     inventoryId: integer("inventory_id")
         .notNull()
         .references(() => inventory.id, { onDelete: 'cascade' }),
+    itemId: integer("item_id")
+        .references(() => items.item_id, { onDelete: 'cascade' }),
+    demandQuantity: integer("demand_quantity"),
+    baseline: doublePrecision("baseline"),
+    zScore: doublePrecision("z_score"),
+    spikePct: doublePrecision("spike_pct"),
+    utilization: doublePrecision("utilization"),
+    severity: varchar("severity", { length: 20 }),
+    status: varchar("status", { length: 20 }),
+    recommendedAction: text("recommended_action"),
     createdAt: timestamp("created_at", { withTimezone: true }).defaultNow(),
     updatedAt: timestamp("updated_at", { withTimezone: true }).defaultNow().$onUpdateFn(() => new Date()),
-});
+}, (table) => [
+    index("spike_monitoring_created_at_idx").on(table.createdAt),
+    index("spike_monitoring_status_created_at_idx").on(table.status, table.createdAt),
+]);
 
 //8. location -> latitude, longitude, address, city, state, country, zip_code
 export const location = pgTable("location", {
@@ -156,13 +177,18 @@ export const realTimeAlerts = pgTable("real_time_alerts", {
 
 export const dashbEnum = pgEnum("dashboard_metrics_enum", ["migrated", "reallocated", "cost_savings", "critical_alerts"]);
 //11. adding dashoboard metrics t store and check daily
+//rows are rollup buckets -> recorded_at is the bucket start, period is hourly/daily/weekly, inventory_id null means all inventories
 export const dashboardMetrics = pgTable("dashboard_metrics", {
     id: serial("id").primaryKey(),
     metricType: dashbEnum("metric_type").notNull(), 
     value: integer("value").notNull(),
     recordedAt: timestamp("recorded_at", { withTimezone: true }).defaultNow(),
     period: varchar("period", { length: 20 }).notNull().default("daily"), 
-});
+    inventoryId: integer("inventory_id")
+        .references(() => inventory.id, { onDelete: 'cascade' }),
+}, (table) => [
+    unique("dashboard_metrics_bucket_unique").on(table.metricType, table.period, table.recordedAt, table.inventoryId).nullsNotDistinct(),
+]);
 
 //now we need to integrate the items with inventory
 export const inventoryItems = pgTable("inventory_items", {
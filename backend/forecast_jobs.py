@@ -0,0 +1,203 @@
+import asyncio
+import json
+import multiprocessing
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from models.forecasting.forecast_cache import data_version
+from models.forecasting.log_store import STORE_PATH
+
+LOG_PATH = STORE_PATH
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+#task bodies run inside the pool processes, so they import the model stack there
+def run_forecast_task(params: dict, payload=None):
+    from models.forecasting.pipeline import generate_forecast_based_on_log_count
+    return generate_forecast_based_on_log_count()
+
+def training_config(params: dict, **defaults):
+    from models.forecasting.training import TrainingConfig
+    return TrainingConfig.from_dict({**TrainingConfig.from_env(**defaults).to_dict(), **params})
+
+def run_training_task(params: dict, payload=None):
+    from models.forecasting.incremental_lstm import train_incremental_lstm
+    trained = train_incremental_lstm(window_size=params.get("window_size", 20), config=training_config(params))
+    result = {"trained": trained}
+    if trained and params.get("export", True):
+        result["export"] = run_export_task(params)
+    return result
+
+def run_export_task(params: dict, payload=None):
+    import os
+    from models.forecasting.export import export_lstm
+    return export_lstm(quantize=params.get("quantize", os.getenv("LSTM_QUANTIZE", "0") == "1"))
+
+#payload is the demand_history rows fetched by the API process
+def run_inventory_forecast_task(params: dict, payload=None):
+    from models.forecasting.batched_lstm import forecast_inventories
+    return forecast_inventories(payload or [], steps=params.get("steps", 7), by=params.get("by", "inventory"), config=training_config(params, epochs=30))
+
+def run_arima_batch_task(params: dict, payload=None):
+    from models.forecasting.arima import forecast_inventories_arima
+    return forecast_inventories_arima(payload or [], steps=params.get("steps", 7), by=params.get("by", "inventory"), timeout=params.get("timeout", 30.0))
+
+#payload is {"demand": demand_history rows, "inventories": inventory rows}
+def run_nightly_forecast_task(params: dict, payload=None):
+    from models.forecasting.nightly import forecast_all_inventories
+    payload = payload or {}
+    return forecast_all_inventories(payload.get("demand", []), payload.get("inventories", []), steps=params.get("steps", 7), run_date=params.get("date"), timeout=params.get("timeout", 60.0))
+
+TASKS: Dict[str, Callable[..., dict]] = {
+    "forecast": run_forecast_task,
+    "train": run_training_task,
+    "export": run_export_task,
+    "inventory_forecast": run_inventory_forecast_task,
+    "arima_batch": run_arima_batch_task,
+    "nightly_forecast": run_nightly_forecast_task
+}
+#kinds that forecast from demand_history rather than the log
+DEMAND_HISTORY_KINDS = ("inventory_forecast", "arima_batch")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class ForecastJob:
+    def __init__(self, kind: str, params: dict, version: Optional[str], payload=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.payload = payload
+        self.data_version = version
+        self.status = "queued"
+        self.submitted_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.result = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def dedupe_key(self) -> str:
+        return json.dumps([self.kind, self.data_version, self.params], sort_keys=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "data_version": self.data_version,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class ForecastJobQueue:
+    """
+    Runs forecast and training work in a bounded process pool so model fitting
+    never shares a CPU or a GIL with the API event loop. Submitting the same kind
+    and parameters against an unchanged log returns the existing job instead of
+    starting another one.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, max_finished: int = 256, log_path: str = LOG_PATH, executor: Optional[Executor] = None, on_finished: Optional[Callable[[ForecastJob], None]] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.log_path = log_path
+        self.executor = executor
+        self.on_finished = on_finished
+        self.jobs: "OrderedDict[str, ForecastJob]" = OrderedDict()
+        self.by_key: Dict[str, str] = {}
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            #spawn keeps torch/BLAS thread pools from being forked out of the API process
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
+    def pending(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status not in FINISHED_STATUSES)
+
+    #jobs whose input isn't the log pass their own data version (e.g. a row watermark)
+    def submit(self, kind: str, params: Optional[dict] = None, payload=None, version: Optional[str] = None) -> Tuple[ForecastJob, bool]:
+        if kind not in TASKS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = ForecastJob(kind, params or {}, version or data_version(self.log_path), payload)
+
+        existing = self.jobs.get(self.by_key.get(job.dedupe_key))
+        if existing is not None and existing.status != "failed":
+            return existing, True
+
+        if self.pending() >= self.max_pending:
+            raise QueueFullError(f"{self.max_pending} forecast jobs already pending")
+
+        self.jobs[job.id] = job
+        self.by_key[job.dedupe_key] = job.id
+        job.task = asyncio.create_task(self._run(job))
+        self._evict_finished()
+        return job, False
+
+    async def wait(self, job: ForecastJob) -> ForecastJob:
+        if job.task is not None:
+            await asyncio.gather(job.task, return_exceptions=True)
+        return job
+
+    def get(self, job_id: str) -> Optional[ForecastJob]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: ForecastJob):
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self.get_executor(), TASKS[job.kind], job.params, job.payload)
+            job.status = "running"
+            job.started_at = datetime.now().isoformat()
+            job.result = await future
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"Forecast job {job.id} ({job.kind}) failed: {e}")
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            job.payload = None
+            if self.on_finished is not None and job.status == "succeeded":
+                try:
+                    self.on_finished(job)
+                except Exception as e:
+                    print(f"Forecast job callback failed: {e}")
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATUSES]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            job = self.jobs.pop(job_id)
+            if self.by_key.get(job.dedupe_key) == job_id:
+                del self.by_key[job.dedupe_key]
+
+    async def shutdown(self):
+        tasks = [job.task for job in self.jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self) -> dict:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"max_workers": self.max_workers, "pending": self.pending(), "by_status": counts}
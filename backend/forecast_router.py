@@ -1,55 +1,39 @@
-from fastapi import APIRouter, HTTPException
-from subprocess import run, PIPE
-import os
-import csv
-from models.forecasting.incremental_lstm import run_incremental_lstm
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from forecast_jobs import QueueFullError
+from models.forecasting.forecast_cache import data_version, forecast_cache
+from models.forecasting.pipeline import HORIZON, forecast_cache_name, select_forecast_model
+from models.forecasting.log_store import STORE_PATH, log_exists
 
 router = APIRouter()
 
-LOG_FILE = os.path.join("models", "forecasting", "inventory_log.csv")
-MODEL_DIR = os.path.join("models", "forecasting")
+LOG_FILE = STORE_PATH
+
+#the app that mounts this router owns the process pool and sets app.state.forecast_jobs
+def get_forecast_jobs(request: Request):
+    forecast_jobs = getattr(request.app.state, "forecast_jobs", None)
+    if forecast_jobs is None:
+        raise HTTPException(status_code=503, detail="Forecast job queue is not running")
+    return forecast_jobs
 
 @router.get("/forecast")
-def forecast():
-    if not os.path.exists(LOG_FILE):
+async def forecast(forecast_jobs=Depends(get_forecast_jobs)):
+    if not log_exists(LOG_FILE):
         raise HTTPException(status_code=404, detail="Log file not found.")
 
     try:
-        with open(LOG_FILE, "r") as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            log_count = sum(1 for _ in reader)
+        log_count = forecast_cache.row_count(LOG_FILE)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading log file: {str(e)}")
 
-    if log_count >= 1000:
-        try:
-            forecast_df = run_incremental_lstm()
-            return {
-                "model_used": "lstm_forecast.py",
-                "log_count": log_count,
-                "forecast": forecast_df.to_dict(orient="records")
-            }
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"LSTM error: {str(e)}")
-
-    elif log_count >= 100:
-        script = "arima.py"
-    else:
-        script = "InventoryDemandClassifier.py"
-
-    script_path = os.path.join(MODEL_DIR, script)
+    model = select_forecast_model(log_count)
+    cached = forecast_cache.get(forecast_cache_name(model), data_version(LOG_FILE), HORIZON)
+    if cached is not None:
+        return cached
 
+    #a miss is computed by the job queue, which fills the cache; the caller polls the job
     try:
-        result = run(["python", script_path], stdout=PIPE, stderr=PIPE, text=True)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Subprocess failed: {str(e)}")
-
-    if result.returncode != 0:
-        raise HTTPException(status_code=500, detail=f"Script error: {result.stderr}")
-
-    return {
-        "model_used": script,
-        "log_count": log_count,
-        "output": result.stdout.strip()
-    }
+        job, deduplicated = forecast_jobs.submit("forecast")
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JSONResponse({**job.to_dict(), "deduplicated": deduplicated, "model_used": model, "log_count": log_count}, status_code=202)
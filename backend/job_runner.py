@@ -0,0 +1,140 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class Job:
+    def __init__(self, name: str, func: Callable[[], Awaitable[None]], interval: Optional[float] = None, daily_at: Optional[str] = None, jitter: float = 0.0, run_on_start: bool = False, leader_only: bool = False):
+        if (interval is None) == (daily_at is None):
+            raise ValueError(f"Job {name} needs exactly one of interval or daily_at")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.daily_at = daily_at
+        self.jitter = jitter
+        self.run_on_start = run_on_start
+        self.leader_only = leader_only
+        self.loop_task: Optional[asyncio.Task] = None
+        self.run_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "runs": 0,
+            "failures": 0,
+            "skipped_overlaps": 0,
+            "last_started": None,
+            "last_duration_ms": None,
+            "max_duration_ms": 0.0,
+            "total_duration_ms": 0.0,
+            "last_error": None
+        }
+
+    @property
+    def running(self) -> bool:
+        return self.run_task is not None and not self.run_task.done()
+
+    def next_delay(self, now: Optional[datetime] = None) -> float:
+        if self.interval is not None:
+            delay = self.interval
+        else:
+            now = now or datetime.now()
+            hour, minute = (int(part) for part in self.daily_at.split(":"))
+            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            delay = (next_run - now).total_seconds()
+        return delay + random.uniform(0, self.jitter)
+
+
+class AsyncJobRunner:
+    """
+    Runs periodic coroutines on the app's event loop. A job never overlaps with
+    itself: if the previous run is still going when the next tick fires, the tick
+    is skipped and counted instead.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[None]], **options) -> Job:
+        job = Job(name, func, **options)
+        self.jobs[name] = job
+        return job
+
+    def _select(self, leader_only: bool) -> List[Job]:
+        return [job for job in self.jobs.values() if job.leader_only == leader_only]
+
+    def start(self, leader_only: bool = False):
+        for job in self._select(leader_only):
+            if job.loop_task is None or job.loop_task.done():
+                job.loop_task = asyncio.create_task(self._loop(job), name=f"job:{job.name}")
+
+    async def stop(self, leader_only: bool = False):
+        jobs = self._select(leader_only)
+        tasks = []
+        for job in jobs:
+            for task in (job.loop_task, job.run_task):
+                if task is not None and not task.done():
+                    task.cancel()
+                    tasks.append(task)
+            job.loop_task = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def is_active(self, name: str) -> bool:
+        job = self.jobs.get(name)
+        return job is not None and job.loop_task is not None and not job.loop_task.done()
+
+    #run a job right away (e.g. after a write), still respecting the overlap guard
+    def trigger(self, name: str) -> bool:
+        if not self.is_active(name):
+            return False
+        return self._launch(self.jobs[name])
+
+    def _launch(self, job: Job) -> bool:
+        if job.running:
+            job.stats["skipped_overlaps"] += 1
+            return False
+        job.run_task = asyncio.create_task(self._run(job))
+        return True
+
+    async def _loop(self, job: Job):
+        if job.run_on_start:
+            self._launch(job)
+        while True:
+            await asyncio.sleep(job.next_delay())
+            self._launch(job)
+
+    async def _run(self, job: Job):
+        job.stats["last_started"] = datetime.now().isoformat()
+        started = perf_counter()
+        try:
+            await job.func()
+            job.stats["last_error"] = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.stats["failures"] += 1
+            job.stats["last_error"] = str(e)
+            print(f"Job {job.name} failed: {e}")
+        finally:
+            duration_ms = (perf_counter() - started) * 1000
+            job.stats["runs"] += 1
+            job.stats["last_duration_ms"] = round(duration_ms, 3)
+            job.stats["max_duration_ms"] = round(max(job.stats["max_duration_ms"], duration_ms), 3)
+            job.stats["total_duration_ms"] += duration_ms
+
+    def stats(self) -> dict:
+        result = {}
+        for name, job in self.jobs.items():
+            runs = job.stats["runs"]
+            result[name] = {
+                **job.stats,
+                "total_duration_ms": round(job.stats["total_duration_ms"], 3),
+                "avg_duration_ms": round(job.stats["total_duration_ms"] / runs, 3) if runs else None,
+                "interval": job.interval,
+                "daily_at": job.daily_at,
+                "leader_only": job.leader_only,
+                "active": self.is_active(name),
+                "running": job.running
+            }
+        return result
@@ -5,7 +5,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from clerk_backend_api import Clerk
 from clerk_backend_api.models import ClerkErrors, SDKError
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 import os
 import logging
@@ -13,11 +13,21 @@ import json
 import jwt
 from time import time
 import subprocess
-from apscheduler.schedulers.background import BackgroundScheduler
-import atexit
 import csv
 import asyncio
-from models.forecasting.incremental_lstm import run_incremental_lstm
+from contextlib import asynccontextmanager
+from models.forecasting.registry import registry
+from models.forecasting.forecast_cache import forecast_cache
+from models.forecasting.serving import lstm_serving_model
+from forecast_jobs import DEMAND_HISTORY_KINDS, ForecastJobQueue, QueueFullError
+from backplane import Backplane, ElectedSingleton, create_backplane
+from relocation_ledger import OPEN_STATUSES, RelocationLedger
+from dashboard_snapshot import DashboardSnapshot
+from metric_rollups import METRIC_TYPES, MetricRollups, bucket_start
+from job_runner import AsyncJobRunner
+from classifier_state import ClassifierState
+from rolling_stats import RollingDemandStats
+from spike_detector import SpikeDetector
 import uvicorn
 import shlex
 from pydantic import BaseModel
@@ -34,7 +44,25 @@ class InventoryCreateRequest(BaseModel):
     status: str
     description: str
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("Glyphor backend is starting up...")
+    await backplane.start()
+    job_runner.start()
+    election_task = asyncio.create_task(scheduler_singleton.run())
+    try:
+        yield
+    finally:
+        print("Glyphor backend is shutting down...")
+        election_task.cancel()
+        await asyncio.gather(election_task, return_exceptions=True)
+        await job_runner.stop()
+        await forecast_jobs.shutdown()
+        await metric_rollups.flush()
+        classifier_state.save()
+        await backplane.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,32 +73,72 @@ app.add_middleware(
 )
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, backplane: Backplane):
         self.active_connections: List[WebSocket] = []
+        self.backplane = backplane
+        self.backplane.subscribe("ws", self.deliver_local)
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
     
+    #fan out through the backplane so sockets held by other workers get it too
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        await self.backplane.publish("ws", {"text": message})
 
-manager = ConnectionManager()
+    async def deliver_local(self, payload: dict):
+        for connection in list(self.active_connections):
+            try:
+                await connection.send_text(payload["text"])
+            except Exception:
+                self.disconnect(connection)
 
-@app.on_event("startup")
-async def startup_event():
-    print("Glyphor backend is starting up...")
+backplane = create_backplane()
+manager = ConnectionManager(backplane)
+relocation_ledger = RelocationLedger()
+job_runner = AsyncJobRunner()
+
+async def release_ledger_entry(payload: dict):
+    relocation_ledger.release(payload.get("from_inventory_id"), payload.get("relocation_id"))
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    print("Glyphor backend is shutting down...")
+backplane.subscribe("ledger", release_ledger_entry)
+
+async def start_leader_jobs():
+    try:
+        relocations, inventories = await asyncio.gather(
+            call_node_script_async("relocationmessage_ops.getAll"),
+            call_node_script_async("inventory_ops.getAll")
+        )
+        relocation_ledger.seed(relocations.get("data", []), inventories.get("data", []))
+    except Exception as e:
+        print(f"Could not seed relocation ledger: {e}")
+    job_runner.start(leader_only=True)
+
+async def stop_leader_jobs():
+    await job_runner.stop(leader_only=True)
+
+#monitor, dashboard refresh and other cluster-wide jobs run on one elected worker
+scheduler_singleton = ElectedSingleton(backplane, "scheduler", start_leader_jobs, stop_leader_jobs)
+
+@app.get("/api/jobs")
+async def get_job_stats():
+    return JSONResponse({
+        "leader": scheduler_singleton.is_leader,
+        "jobs": job_runner.stats(),
+        "models": registry.stats(),
+        "forecast_cache": forecast_cache.stats(),
+        "forecast_jobs": forecast_jobs.stats(),
+        "classifier_state": classifier_state.stats(),
+        "demand_stats": demand_stats.summary(),
+        "spike_detector": spike_detector.stats()
+    }, status_code=200)
 
 @app.get("/")
 async def welcome():
@@ -85,48 +153,63 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         while True:
-            await asyncio.sleep(5)
-            
-            inventories_result = call_node_script("inventory_ops.getAll")
-            if inventories_result.get("success"):
-                inventories = inventories_result.get("data", [])
-                
-                for inventory in inventories:
-                    available = inventory.get("volumeAvailable", 0)
-                    reserved = inventory.get("volumeReserved", 0)
-                    occupied = inventory.get("volumeOccupied", 0)
-                    threshold = available - reserved
-                    
-                    if occupied > threshold:
-                        await trigger_load_balancer(inventory["id"], manager)
-                        
-                        alert_data = {
-                            "type": "threshold_breach",
-                            "inventory_id": inventory["id"],
-                            "inventory_name": inventory.get("name", "Unknown"),
-                            "current_load": occupied,
-                            "threshold": threshold,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        await manager.broadcast(json.dumps(alert_data))
-                        
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
+#only the elected worker runs this, events reach everyone through the backplane
+async def check_demand_thresholds():
+    inventories_result = await call_node_script_async("inventory_ops.getAll")
+    if not inventories_result.get("success"):
+        return
+
+    classifier_state.update_capacities(inventories_result.get("data", []))
+    for inventory in inventories_result.get("data", []):
+        available = inventory.get("volumeAvailable", 0)
+        reserved = inventory.get("volumeReserved", 0)
+        occupied = inventory.get("volumeOccupied", 0)
+        threshold = available - reserved
+        
+        if occupied > threshold:
+            if relocation_ledger.should_run(inventory["id"], occupied, threshold):
+                await trigger_load_balancer(inventory["id"], manager)
+            
+            alert_data = {
+                "type": "threshold_breach",
+                "inventory_id": inventory["id"],
+                "inventory_name": inventory.get("name", "Unknown"),
+                "current_load": occupied,
+                "threshold": threshold,
+                "timestamp": datetime.now().isoformat()
+            }
+            await manager.broadcast(json.dumps(alert_data))
+
+async def run_load_balancer(load_balancer_data: dict):
+    process = await asyncio.create_subprocess_exec(
+        "./cpp_codes/load_balancer",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(json.dumps(load_balancer_data).encode()), timeout=30)
+    except asyncio.TimeoutError:
+        process.kill()
+        raise
+    return process.returncode, stdout.decode(), stderr.decode()
+
 async def trigger_load_balancer(inventory_id: int, manager: ConnectionManager):
     try:
         load_balancer_data = await prepare_load_balancer_data(inventory_id)
+        #open relocations already move part of the excess, only the rest needs a new row
+        load_balancer_data["excess_load"] -= relocation_ledger.covered(inventory_id)
+        if load_balancer_data["excess_load"] <= 0:
+            return
         
-        result = subprocess.run(
-            ["./cpp_codes/load_balancer"],
-            input=json.dumps(load_balancer_data),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        returncode, stdout, stderr = await run_load_balancer(load_balancer_data)
         
-        if result.returncode == 0:
-            target_inventory = int(result.stdout.strip())
+        if returncode == 0:
+            target_inventory = int(stdout.strip())
             
             relocation_data = {
                 "fromInventoryId": inventory_id,
@@ -136,7 +219,18 @@ async def trigger_load_balancer(inventory_id: int, manager: ConnectionManager):
                 "status": "pending"
             }
             
-            call_node_script(f"relocationmessage_ops.create {json.dumps(relocation_data)}")
+            created = await call_node_script_async(f"relocationmessage_ops.create {json.dumps(relocation_data)}")
+            if created.get("success"):
+                relocation_ledger.record(
+                    inventory_id,
+                    load_balancer_data["excess_load"],
+                    load_balancer_data["upcoming quantity"][str(inventory_id)],
+                    load_balancer_data["threshold_for_alert"][str(inventory_id)],
+                    relocation_id=(created.get("data") or [{}])[0].get("relocationMessageId"),
+                    to_inventory_id=target_inventory
+                )
+                record_relocation_created(relocation_data)
+                await invalidate_dashboard()
             
             await manager.broadcast(json.dumps({
                 "type": "relocation_recommended",
@@ -149,8 +243,10 @@ async def trigger_load_balancer(inventory_id: int, manager: ConnectionManager):
         print(f"Load balancer error: {e}")
 
 async def prepare_load_balancer_data(from_inventory_id: int):
-    inventories_result = call_node_script("inventory_ops.getAll")
-    locations_result = call_node_script("location_ops.getAll")
+    inventories_result, locations_result = await asyncio.gather(
+        call_node_script_async("inventory_ops.getAll"),
+        call_node_script_async("location_ops.getAll")
+    )
     
     inventories = inventories_result.get("data", [])
     locations = locations_result.get("data", [])
@@ -165,20 +261,26 @@ async def prepare_load_balancer_data(from_inventory_id: int):
         "threshold_for_alert": {}
     }
     
-    for inv in inventories:
+    demand_results = await asyncio.gather(*[
+        call_node_script_async(f"demandhistory_ops.getByInventoryId {inv['id']}") for inv in inventories
+    ])
+    
+    for inv, demand_result in zip(inventories, demand_results):
         inv_id = inv["id"]
         data["upcoming quantity"][str(inv_id)] = inv["volumeOccupied"]
         data["volume_free"][str(inv_id)] = inv["volumeAvailable"]
         data["threshold_for_alert"][str(inv_id)] = inv["volumeAvailable"] - inv["volumeReserved"]
         data["distance from_inv"][str(inv_id)] = abs(inv_id - from_inventory_id) * 10
         
-        demand_result = call_node_script(f"demandhistory_ops.getByInventoryId {inv_id}")
         if demand_result.get("success"):
             demand_history = demand_result.get("data", [])
             current_demand = sum(d.get("demandQuantity", 0) for d in demand_history[-7:])
             data["current_demand"][str(inv_id)] = current_demand
-            data["forecasted_demand"][str(inv_id)] = int(current_demand * 1.2)
+            forecast = inventory_forecasts.get(str(inv_id))
+            data["forecasted_demand"][str(inv_id)] = forecast["forecasted_demand"] if forecast else int(current_demand * 1.2)
     
+    source_key = str(from_inventory_id)
+    data["excess_load"] = max(0, data["upcoming quantity"].get(source_key, 0) - data["threshold_for_alert"].get(source_key, 0))
     return data
 
 @app.get("/api/inventory")
@@ -199,6 +301,7 @@ async def create_inventory(request: Request):
         print(f"Create inventory result: {result}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to create inventory")
+        await invalidate_dashboard()
         return JSONResponse({"message": "Inventory created successfully"}, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -431,6 +534,8 @@ async def create_relocation(data: dict):
         result = call_node_script(f"relocationmessage_ops.create {json.dumps(data)}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to create relocation")
+        record_relocation_created(data)
+        await invalidate_dashboard()
         return JSONResponse({"message": "Relocation created successfully"}, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -449,9 +554,16 @@ async def get_relocation_by_id(relocation_id: int):
 async def update_relocation_status(relocation_id: int, data: dict):
     try:
         status = data.get("status", "pending")
+        previous_result = call_node_script(f"relocationmessage_ops.getById {relocation_id}") if status == "completed" else {}
+        previous = (previous_result.get("data") or [{}])[0]
         result = call_node_script(f"relocationmessage_ops.updateById {json.dumps([relocation_id, {'status': status}])}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to update relocation status")
+        if status == "completed" and previous and previous.get("status") != "completed":
+            record_relocation_completed(previous)
+        if status not in OPEN_STATUSES:
+            await backplane.publish("ledger", {"relocation_id": relocation_id})
+        await invalidate_dashboard()
         return JSONResponse({"message": "Relocation status updated successfully"}, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -496,18 +608,27 @@ async def execute_relocation(relocation_id: int):
             call_node_script(f"inventory_ops.updateById {json.dumps([to_inventory_id, {'volumeOccupied': new_occupied, 'volumeAvailable': new_available}])}")
         
         call_node_script(f"relocationmessage_ops.updateById {json.dumps([relocation_id, {'status': 'completed'}])}")
+        record_relocation_completed(relocation)
+        await backplane.publish("ledger", {"relocation_id": relocation_id, "from_inventory_id": from_inventory_id})
+        await invalidate_dashboard()
         
         return JSONResponse({"message": "Relocation executed successfully"}, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def with_demand_status(alerts: list):
+    for alert in alerts:
+        state = classifier_state.status(alert["inventoryId"]) if alert.get("inventoryId") is not None else None
+        alert["demandStatus"] = state["status"] if state else None
+    return alerts
+
 @app.get("/api/alerts")
 async def get_all_alerts():
     try:
         result = call_node_script("realtimealert_ops.getAll")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to fetch alerts")
-        return JSONResponse(result.get("data", []), status_code=200)
+        return JSONResponse(with_demand_status(result.get("data", [])), status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -517,7 +638,7 @@ async def get_unresolved_alerts():
         result = call_node_script("realtimealert_ops.getUnresolved")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to fetch unresolved alerts")
-        return JSONResponse(result.get("data", []), status_code=200)
+        return JSONResponse(with_demand_status(result.get("data", [])), status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -527,6 +648,8 @@ async def create_alert(data: dict):
         result = call_node_script(f"realtimealert_ops.create {json.dumps(data)}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to create alert")
+        record_critical_alert_change(data, 1)
+        await invalidate_dashboard()
         return JSONResponse({"message": "Alert created successfully"}, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -537,6 +660,9 @@ async def resolve_alert(alert_id: int):
         result = call_node_script(f"realtimealert_ops.updateResolved {alert_id}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to resolve alert")
+        for alert in result.get("data", []):
+            record_critical_alert_change(alert, -1)
+        await invalidate_dashboard()
         return JSONResponse({"message": "Alert resolved successfully"}, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -547,7 +673,7 @@ async def get_alerts_by_severity(severity: str):
         result = call_node_script(f"realtimealert_ops.getBySeverity {severity}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to fetch alerts by severity")
-        return JSONResponse(result.get("data", []), status_code=200)
+        return JSONResponse(with_demand_status(result.get("data", [])), status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -567,10 +693,32 @@ async def create_demand_history(data: dict):
         result = call_node_script(f"demandhistory_ops.create {json.dumps(data)}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to create demand history")
+        created = (result.get("data") or [{}])[0]
+        await backplane.publish("demand", {
+            "inventory_id": data.get("inventoryId"),
+            "item_id": data.get("itemId"),
+            "demand": data.get("demandQuantity", 0),
+            "row_id": created.get("id"),
+            "timestamp": created.get("timestamp", data.get("timestamp"))
+        })
         return JSONResponse({"message": "Demand history created successfully"}, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/inventory/{inventory_id}/demand-status")
+async def get_inventory_demand_status(inventory_id: int):
+    state = classifier_state.status(inventory_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No demand observed for this inventory")
+    return JSONResponse(state, status_code=200)
+
+@app.get("/api/inventory/{inventory_id}/demand-stats")
+async def get_inventory_demand_stats(inventory_id: int):
+    stats = demand_stats.stats(inventory_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No demand observed for this inventory")
+    return JSONResponse({"inventory_id": inventory_id, **stats}, status_code=200)
+
 @app.get("/api/demand-history/inventory/{inventory_id}")
 async def get_demand_history_by_inventory(inventory_id: int):
     try:
@@ -611,19 +759,51 @@ async def create_forecasting_metric(data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/forecasting/jobs")
+async def submit_forecast_job(data: dict):
+    kind = data.get("kind", "forecast")
+    payload, version = None, None
+    if kind in DEMAND_HISTORY_KINDS or kind == "nightly_forecast":
+        try:
+            payload, version = await (nightly_forecast_payload() if kind == "nightly_forecast" else fetch_demand_history())
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    try:
+        job, deduplicated = forecast_jobs.submit(kind, data.get("params") or {}, payload=payload, version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JSONResponse({**job.to_dict(), "deduplicated": deduplicated}, status_code=202)
+
+@app.get("/api/forecasting/jobs/{job_id}")
+async def get_forecast_job(job_id: str):
+    job = forecast_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Forecast job not found")
+    return JSONResponse(job.to_dict(), status_code=200)
+
 @app.get("/api/forecasting/inventory/{inventory_id}")
-async def get_inventory_forecast(inventory_id: int):
+async def get_inventory_forecast(inventory_id: int, refresh: bool = False):
     try:
+        #the nightly batch keeps this current; refresh=true recomputes this inventory now
+        if refresh:
+            await precompute_inventory_forecasts(inventory_id)
+
         result = call_node_script(f"forecastingMetrics_ops.getByInventoryId {inventory_id}")
         if not result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to fetch inventory forecast")
-        
-        forecast_data = generate_forecast_based_on_log_count()
-        
+
+        metrics = result.get("data", [])
+        batch_rows = [row for row in metrics if row.get("forecastDate")]
+        stored = max(batch_rows, key=lambda row: (row["forecastDate"], row.get("updatedAt") or "")) if batch_rows else None
+
         return JSONResponse({
             "inventory_id": inventory_id,
-            "forecast": forecast_data,
-            "historical_metrics": result.get("data", [])
+            "forecast": stored,
+            "refreshed": refresh,
+            "inventory_forecast": inventory_forecasts.get(str(inventory_id)),
+            "historical_metrics": metrics
         }, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -636,17 +816,15 @@ async def trigger_manual_load_balancer(data: dict):
             raise HTTPException(status_code=400, detail="inventory_id is required")
         
         load_balancer_data = await prepare_load_balancer_data(inventory_id)
+        #open relocations already move part of the excess, only the rest needs a new row
+        load_balancer_data["excess_load"] -= relocation_ledger.covered(inventory_id)
+        if load_balancer_data["excess_load"] <= 0:
+            return
         
-        result = subprocess.run(
-            ["./cpp_codes/load_balancer"],
-            input=json.dumps(load_balancer_data),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        returncode, stdout, stderr = await run_load_balancer(load_balancer_data)
         
-        if result.returncode == 0:
-            target_inventory = int(result.stdout.strip())
+        if returncode == 0:
+            target_inventory = int(stdout.strip())
             
             return JSONResponse({
                 "success": True,
@@ -657,39 +835,45 @@ async def trigger_manual_load_balancer(data: dict):
         else:
             return JSONResponse({
                 "success": False,
-                "error": result.stderr
+                "error": stderr
             }, status_code=500)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def call_node_script(command):
-    try:
-        parts = command.split(' ', 1)
-        operation = parts[0]
-        data = parts[1] if len(parts) > 1 else None
+@app.get("/api/load-balancer/ledger")
+async def get_relocation_ledger():
+    return JSONResponse(relocation_ledger.stats(), status_code=200)
 
-        if data:
-            cmd = ["node", "database/index.js", operation, data]
-        else:
-            cmd = ["node", "database/index.js", operation]
+def node_command(command):
+    parts = command.split(' ', 1)
+    operation = parts[0]
+    data = parts[1] if len(parts) > 1 else None
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    if data:
+        return ["node", "database/index.js", operation, data]
+    return ["node", "database/index.js", operation]
 
-        if result.returncode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Node script failed: {result.stderr}"
-            )
+def parse_node_output(returncode, stdout, stderr):
+    if returncode != 0:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Node script failed: {stderr}"
+        )
 
-        response = json.loads(result.stdout)
-        if not isinstance(response, dict):
-            raise HTTPException(
-                status_code=500,
-                detail="Invalid response format from database"
-            )
+    response = json.loads(stdout)
+    if not isinstance(response, dict):
+        raise HTTPException(
+            status_code=500,
+            detail="Invalid response format from database"
+        )
 
-        return response
+    return response
+
+def call_node_script(command):
+    try:
+        result = subprocess.run(node_command(command), capture_output=True, text=True, timeout=30)
+        return parse_node_output(result.returncode, result.stdout, result.stderr)
 
     except subprocess.TimeoutExpired:
         raise HTTPException(status_code=504, detail="Database operation timed out")
@@ -698,8 +882,32 @@ def call_node_script(command):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+#same contract as call_node_script but doesn't block the event loop while node runs
+async def call_node_script_async(command):
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *node_command(command),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            raise HTTPException(status_code=504, detail="Database operation timed out")
+        return parse_node_output(process.returncode, stdout.decode(), stderr.decode())
+
+    except HTTPException:
+        raise
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=500, detail=f"Invalid JSON response: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+COST_SAVINGS_PER_ITEM = 15
+
 def calculate_cost_savings(completed_relocations: list, inventories: list):
-    base_savings_per_item = 15
+    base_savings_per_item = COST_SAVINGS_PER_ITEM
     total_items = sum(r.get("quantity", 0) for r in completed_relocations)
     efficiency_bonus = 0
     for inventory in inventories:
@@ -707,150 +915,43 @@ def calculate_cost_savings(completed_relocations: list, inventories: list):
             efficiency_bonus += 500
     return (total_items * base_savings_per_item) + efficiency_bonus
 
-@app.get("/api/dashboard/overview")
-async def get_dashboard_overview():
-    try:
-        inventories_result = call_node_script("inventory_ops.getAll")
-        if not inventories_result.get("success"):
-            raise HTTPException(status_code=500, detail="Failed to fetch inventories")
-        inventories = inventories_result.get("data", [])
-        total_inventories = len(inventories)
-        print(f"Total inventories: {total_inventories}")
-
-        alrt_res = call_node_script("realtimealert_ops.getUnresolved")
-        if not alrt_res.get("success"):
-            raise HTTPException(status_code=500, detail="Failed to fetch unresolved alerts")
-        alerts = alrt_res.get("data", [])
-        critical_alerts = len([alert for alert in alerts if alert.get("severity") == "critical"])
-        print(f"Critical alerts: {critical_alerts}")
-
-        relocations_result = call_node_script("relocationmessage_ops.getAll")
-        if not relocations_result.get("success"):
-            raise HTTPException(status_code=500, detail="Failed to fetch relocations")
-        relocations = relocations_result.get("data", [])
-        completed_relocations = [r for r in relocations if r.get("status") == "completed"]
-        items_migrated = sum(r.get("quantity", 0) for r in completed_relocations)
-        print(f"Items migrated: {items_migrated}")
-
-        reallocated_items = sum(r.get("quantity", 0) for r in relocations)
-        print(f"Reallocated items: {reallocated_items}")
-
-        cost_savings = calculate_cost_savings(completed_relocations, inventories)
-        print(f"Cost savings: {cost_savings}")
-
-        res = {
-            "total_inventories": total_inventories,
-            "critical_alerts": critical_alerts,
-            "items_migrated": items_migrated,
-            "cost_savings": cost_savings,
-            "reallocated_items": reallocated_items
-        }
-
-        print(f"Dashboard overview: {res}")
-        return {
-            "total_inventories": total_inventories,
-            "critical_alerts": critical_alerts,
-            "items_migrated": items_migrated,
-            "cost_savings": cost_savings,
-            "reallocated_items": reallocated_items
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def build_dashboard_overview(inventories: list, alerts: list, relocations: list):
+    critical_alerts = len([alert for alert in alerts if alert.get("severity") == "critical"])
+    completed_relocations = [r for r in relocations if r.get("status") == "completed"]
 
-def get_previous_period_value(metric_type: str, current_value: int):
-    if metric_type == "migrated":
-        return int(current_value / 1.12)
-    elif metric_type == "reallocated":
-        return int(current_value / 1.08)
-    elif metric_type == "cost_savings":
-        return int(current_value / 1.15)
-    elif metric_type == "critical_alerts":
-        return current_value + 1
-    return current_value
-
-def calculate_percentage_change(current: int, previous: int):
-    if previous == 0:
-        return 0.0
-    return ((current - previous) / previous) * 100
-
-def format_change_percentage(change: float):
-    if change >= 0:
-        return f"+{change:.0f}%"
-    else:
-        return f"{change:.0f}%"
-
-scheduler = BackgroundScheduler()
-
-async def record_daily_metrics():
-    try:
-        inventories_result = call_node_script("inventory_ops.getAll")
-        relocations_result = call_node_script("relocationmessage_ops.getAll")
-        alerts_result = call_node_script("realtimealert_ops.getUnresolved")
-
-        if all([inventories_result.get("success"), relocations_result.get("success"), alerts_result.get("success")]):
-            inventories = inventories_result.get("data", [])
-            relocations = relocations_result.get("data", [])
-            alerts = alerts_result.get("data", [])
-
-            completed_relocations = [r for r in relocations if r.get("status") == "completed"]
-            migrated = sum(r.get("quantity", 0) for r in completed_relocations)
-            reallocated = sum(r.get("quantity", 0) for r in relocations)
-            cost_savings = calculate_cost_savings(completed_relocations, inventories)
-            critical_alerts = len([alert for alert in alerts if alert.get("severity") == "critical"])
-
-            metrics_to_store = [
-                {"metricType": "migrated", "value": migrated},
-                {"metricType": "reallocated", "value": reallocated},
-                {"metricType": "cost_savings", "value": cost_savings},
-                {"metricType": "critical_alerts", "value": critical_alerts}
-            ]
-
-            for metric in metrics_to_store:
-                call_node_script(f"dashboardmetrics_ops.recordDailyMetrics {json.dumps(metric)}")
-
-            print(f"Daily metrics recorded: {metrics_to_store}")
-    except Exception as e:
-        print(f"Error recording daily metrics: {e}")
-
-scheduler.add_job(func=record_daily_metrics, trigger="cron", hour=0, minute=0)
-scheduler.start()
-atexit.register(lambda: scheduler.shutdown())
-
-@app.get("/api/dashboard/stats")
-async def get_dashboard_stats():
-    current_data = await get_dashboard_overview()
-    print(current_data)
-
-    previous_migrated = call_node_script('dashboardmetrics_ops.getPreviousMetrics ["migrated"]')
-    previous_reallocated = call_node_script('dashboardmetrics_ops.getPreviousMetrics ["reallocated"]')
-    previous_cost_savings = call_node_script('dashboardmetrics_ops.getPreviousMetrics ["cost_savings"]')
-    previous_critical_alerts = call_node_script('dashboardmetrics_ops.getPreviousMetrics ["critical_alerts"]')
+    return {
+        "total_inventories": len(inventories),
+        "critical_alerts": critical_alerts,
+        "items_migrated": sum(r.get("quantity", 0) for r in completed_relocations),
+        "cost_savings": calculate_cost_savings(completed_relocations, inventories),
+        "reallocated_items": sum(r.get("quantity", 0) for r in relocations)
+    }
 
-    print(previous_migrated, previous_reallocated, previous_cost_savings, previous_critical_alerts)
+#previous value = current total minus what today's daily rollup bucket added
+def build_dashboard_stats(current_data: dict, today_deltas: dict):
+    def previous_value(metric_type, current_value):
+        return current_value - today_deltas.get(metric_type, 0)
 
     migrated_change = calculate_percentage_change(
         current_data["items_migrated"],
-        previous_migrated.get("data", [{}])[0].get("value", current_data["items_migrated"])
+        previous_value("migrated", current_data["items_migrated"])
     )
 
     reallocated_change = calculate_percentage_change(
         current_data["reallocated_items"],
-        previous_reallocated.get("data", [{}])[0].get("value", current_data["reallocated_items"])
+        previous_value("reallocated", current_data["reallocated_items"])
     )
 
     saved_change = calculate_percentage_change(
         current_data["cost_savings"],
-        previous_cost_savings.get("data", [{}])[0].get("value", current_data["cost_savings"])
+        previous_value("cost_savings", current_data["cost_savings"])
     )
 
     critical_alerts_change = calculate_percentage_change(
         current_data["critical_alerts"],
-        previous_critical_alerts.get("data", [{}])[0].get("value", current_data["critical_alerts"])
+        previous_value("critical_alerts", current_data["critical_alerts"])
     )
 
-    print(f"Changes - Migrated: {migrated_change}, Reallocated: {reallocated_change}, "
-          f"Saved: {saved_change}, Critical Alerts: {critical_alerts_change}")
-
     return {
         "migrated": {
             "value": f"{current_data['items_migrated']:,}",
@@ -870,92 +971,312 @@ async def get_dashboard_stats():
         }
     }
 
-def calculate_utilization_rate(inventory):
-    total_capacity = inventory['volumeOccupied'] + inventory['volumeAvailable']
-    if total_capacity == 0:
-        return 0.0
-    return (inventory['volumeOccupied'] / total_capacity) * 100
+async def fetch_node_data(command: str, error: str):
+    result = await call_node_script_async(command)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=error)
+    return result.get("data", [])
+
+#everything both dashboard endpoints need, fetched in parallel once per refresh
+async def compute_dashboard_snapshot():
+    inventories, alerts, relocations = await asyncio.gather(
+        fetch_node_data("inventory_ops.getAll", "Failed to fetch inventories"),
+        fetch_node_data("realtimealert_ops.getUnresolved", "Failed to fetch unresolved alerts"),
+        fetch_node_data("relocationmessage_ops.getAll", "Failed to fetch relocations")
+    )
+    overview = build_dashboard_overview(inventories, alerts, relocations)
 
-def generate_forecast_based_on_log_count():
-    LOG_FILE = os.path.join("models", "forecasting", "inventory_log.csv")
-    MODEL_DIR = os.path.join("models", "forecasting")
+    today = bucket_start(datetime.now(timezone.utc), "daily").isoformat()
+    today_rows = await fetch_node_data(
+        f"dashboardmetrics_ops.getRange {json.dumps({'period': 'daily', 'from': today})}",
+        "Failed to fetch dashboard metrics"
+    )
+    stats = build_dashboard_stats(overview, {row["metricType"]: row["value"] for row in today_rows})
 
-    if not os.path.exists(LOG_FILE):
-        return {
-            "model_used": "default",
-            "log_count": 0,
-            "forecast": {"next_week": 70.0, "next_month": 75.0, "confidence": "low"}
-        }
+    return {"overview": overview, "stats": stats}
+
+async def publish_dashboard_snapshot(payload: dict):
+    await backplane.publish("dashboard", payload)
+
+async def apply_dashboard_snapshot(payload: dict):
+    dashboard_snapshot.apply(payload)
+
+async def invalidate_dashboard():
+    await backplane.publish("dashboard.invalidate", {})
 
+async def mark_dashboard_stale(payload: dict):
+    dashboard_snapshot.invalidate()
+    job_runner.trigger("dashboard_snapshot")
+
+async def refresh_dashboard_snapshot():
+    await dashboard_snapshot.refresh()
+
+dashboard_snapshot = DashboardSnapshot(
+    compute_dashboard_snapshot,
+    max_age=float(os.getenv("DASHBOARD_MAX_AGE_SECONDS", "30")),
+    on_refresh=publish_dashboard_snapshot
+)
+backplane.subscribe("dashboard", apply_dashboard_snapshot)
+backplane.subscribe("dashboard.invalidate", mark_dashboard_stale)
+
+@app.get("/api/dashboard/overview")
+async def get_dashboard_overview():
     try:
-        with open(LOG_FILE, "r") as f:
-            reader = csv.reader(f)
-            next(reader)
-            log_count = sum(1 for _ in reader)
+        snapshot = await dashboard_snapshot.get()
+        return {**snapshot["overview"], **dashboard_snapshot.freshness()}
     except Exception as e:
-        return {
-            "model_used": "default",
-            "log_count": 0,
-            "forecast": {"next_week": 70.0, "next_month": 75.0, "confidence": "low"},
-            "error": f"Error reading log file: {str(e)}"
-        }
+        raise HTTPException(status_code=500, detail=str(e))
 
-    if log_count >= 1000:
-        try:
-            forecast_df = run_incremental_lstm()
-            return {
-                "model_used": "lstm_forecast.py",
-                "log_count": log_count,
-                "forecast": forecast_df.to_dict(orient="records")
-            }
-        except Exception as e:
-            return {
-                "model_used": "lstm_forecast.py",
-                "log_count": log_count,
-                "forecast": {"next_week": 85.0, "next_month": 90.0, "confidence": "medium"},
-                "error": f"LSTM error: {str(e)}"
-            }
+def get_previous_period_value(metric_type: str, current_value: int):
+    if metric_type == "migrated":
+        return int(current_value / 1.12)
+    elif metric_type == "reallocated":
+        return int(current_value / 1.08)
+    elif metric_type == "cost_savings":
+        return int(current_value / 1.15)
+    elif metric_type == "critical_alerts":
+        return current_value + 1
+    return current_value
 
-    elif log_count >= 100:
-        script = "arima.py"
+def calculate_percentage_change(current: int, previous: int):
+    if previous == 0:
+        return 0.0
+    return ((current - previous) / previous) * 100
+
+def format_change_percentage(change: float):
+    if change >= 0:
+        return f"+{change:.0f}%"
     else:
-        script = "InventoryDemandClassifier.py"
+        return f"{change:.0f}%"
 
-    script_path = os.path.join(MODEL_DIR, script)
+@app.get("/api/dashboard/stats")
+async def get_dashboard_stats():
     try:
-        result = subprocess.run(
-            ["python", script_path],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        snapshot = await dashboard_snapshot.get()
+        return {**snapshot["stats"], **dashboard_snapshot.freshness()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if result.returncode == 0:
-            output = result.stdout.strip()
-            return {
-                "model_used": script,
-                "log_count": log_count,
-                "forecast": {
-                    "next_week": round(85.3, 1),
-                    "next_month": round(92.1, 1),
-                    "confidence": "high",
-                    "raw_output": output
-                }
-            }
-        else:
-            return {
-                "model_used": script,
-                "log_count": log_count,
-                "forecast": {"next_week": 75.0, "next_month": 80.0, "confidence": "medium"},
-                "error": f"Script error: {result.stderr}"
+@app.get("/api/dashboard/metrics/trend")
+async def get_dashboard_metric_trend(metric_type: Optional[str] = None, period: str = "daily", start: Optional[str] = None, end: Optional[str] = None, inventory_id: Optional[int] = None):
+    if period not in ("hourly", "daily", "weekly"):
+        raise HTTPException(status_code=400, detail="period must be hourly, daily or weekly")
+    if metric_type is not None and metric_type not in METRIC_TYPES:
+        raise HTTPException(status_code=400, detail=f"metric_type must be one of {', '.join(METRIC_TYPES)}")
+    try:
+        await metric_rollups.flush()
+        query = {"metricType": metric_type, "period": period, "from": start, "to": end, "inventoryId": inventory_id}
+        rows = await fetch_node_data(f"dashboardmetrics_ops.getRange {json.dumps(query)}", "Failed to fetch dashboard metrics")
+        return JSONResponse([
+            {
+                "metric_type": row["metricType"],
+                "bucket_start": row["recordedAt"],
+                "period": row["period"],
+                "inventory_id": row.get("inventoryId"),
+                "value": row["value"]
             }
+            for row in rows
+        ], status_code=200)
     except Exception as e:
-        return {
-            "model_used": script,
-            "log_count": log_count,
-            "forecast": {"next_week": 75.0, "next_month": 80.0, "confidence": "medium"},
-            "error": f"Execution error: {str(e)}"
-        }
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def write_rollup_rows(rows: list):
+    result = await call_node_script_async(f"dashboardmetrics_ops.applyRollups {json.dumps(rows)}")
+    return result.get("success", False)
+
+metric_rollups = MetricRollups(write_rollup_rows)
+
+def reload_trained_model(job):
+    if (job.kind == "train" and job.result.get("trained")) or job.kind == "export":
+        registry.reload(lstm_serving_model())
+
+#training and model fitting run in a separate process pool, never inside a request
+forecast_jobs = ForecastJobQueue(max_workers=int(os.getenv("FORECAST_WORKERS", "2")), on_finished=reload_trained_model)
+app.state.forecast_jobs = forecast_jobs
+
+async def train_lstm_model():
+    job, _ = forecast_jobs.submit("train")
+    await forecast_jobs.wait(job)
+    if job.status == "failed":
+        raise RuntimeError(job.error)
+
+#latest per-inventory forecasts from the batched LSTM, shared with every worker
+inventory_forecasts: Dict[str, dict] = {}
+
+async def apply_inventory_forecasts(payload: dict):
+    inventory_forecasts.clear()
+    inventory_forecasts.update(payload.get("forecasts", {}))
+
+backplane.subscribe("forecasts", apply_inventory_forecasts)
+
+async def fetch_demand_history():
+    result = await call_node_script_async("demandhistory_ops.getAll")
+    if not result.get("success"):
+        raise RuntimeError("Failed to fetch demand history")
+    rows = result.get("data", [])
+    return rows, f"{len(rows)}-{max((row['id'] for row in rows), default=0)}"
+
+NIGHTLY_BATCH_SIZE = 200
+
+async def nightly_forecast_payload(inventory_id: Optional[int] = None):
+    if inventory_id is None:
+        (demand, watermark), inventories_result = await asyncio.gather(fetch_demand_history(), call_node_script_async("inventory_ops.getAll"))
+    else:
+        demand_result, inventories_result = await asyncio.gather(
+            call_node_script_async(f"demandhistory_ops.getByInventoryId {inventory_id}"),
+            call_node_script_async(f"inventory_ops.getById {inventory_id}")
+        )
+        demand = demand_result.get("data", [])
+        watermark = f"{inventory_id}-{len(demand)}-{max((row['id'] for row in demand), default=0)}"
+    return {"demand": demand, "inventories": inventories_result.get("data", [])}, watermark
+
+async def precompute_inventory_forecasts(inventory_id: Optional[int] = None):
+    """Forecasts every inventory (or just one) in the process pool and upserts the rows into forecasting_metrics."""
+    payload, watermark = await nightly_forecast_payload(inventory_id)
+    params = {"steps": int(os.getenv("FORECAST_HORIZON_DAYS", "7")), "date": date.today().isoformat()}
+    job, _ = forecast_jobs.submit("nightly_forecast", params, payload=payload, version=watermark)
+    await forecast_jobs.wait(job)
+    if job.status == "failed":
+        raise RuntimeError(job.error)
+    rows = job.result
+    for start in range(0, len(rows), NIGHTLY_BATCH_SIZE):
+        result = await call_node_script_async(f"forecastingMetrics_ops.upsertMany {json.dumps(rows[start:start + NIGHTLY_BATCH_SIZE])}")
+        if not result.get("success"):
+            raise RuntimeError(f"Failed to store forecasts: {result.get('error')}")
+    return rows
+
+async def refresh_inventory_forecasts():
+    rows, watermark = await fetch_demand_history()
+    job, _ = forecast_jobs.submit("inventory_forecast", payload=rows, version=watermark)
+    await forecast_jobs.wait(job)
+    if job.status == "failed":
+        raise RuntimeError(job.error)
+    await backplane.publish("forecasts", {"forecasts": job.result, "generated_at": job.finished_at})
+
+#every worker keeps its own copies, fed by the "demand" channel and reconciled from the database
+classifier_state = ClassifierState()
+demand_stats = RollingDemandStats()
+spike_detector = SpikeDetector(
+    threshold=float(os.getenv("SPIKE_Z_THRESHOLD", "3.0")),
+    min_pct=float(os.getenv("SPIKE_MIN_PCT", "25")),
+    cooldown=float(os.getenv("SPIKE_COOLDOWN_SECONDS", "900"))
+)
+
+async def apply_demand_observation(payload: dict):
+    if payload.get("inventory_id") is not None:
+        classifier_state.observe(payload["inventory_id"], payload.get("demand", 0), payload.get("row_id"))
+        demand_stats.observe(payload["inventory_id"], payload.get("demand", 0), payload.get("timestamp"), payload.get("row_id"))
+        #every worker scores the event so a new leader starts warm, only the leader queues spike rows
+        spike_detector.observe(payload["inventory_id"], payload.get("item_id"), payload.get("demand", 0), payload.get("timestamp"), payload.get("row_id"), emit=scheduler_singleton.is_leader)
+
+backplane.subscribe("demand", apply_demand_observation)
+
+DEMAND_SYNC_BATCH_SIZE = 5000
+#highest demand_history id this worker has reconciled; only the first sync reads the whole table
+demand_sync = {"last_id": 0}
+
+async def fetch_demand_after(after_id: int):
+    rows = []
+    while True:
+        result = await call_node_script_async(f"demandhistory_ops.getAfterId {json.dumps([after_id, DEMAND_SYNC_BATCH_SIZE])}")
+        if not result.get("success"):
+            raise RuntimeError("Failed to fetch demand history")
+        batch = result.get("data", [])
+        rows.extend(batch)
+        if len(batch) < DEMAND_SYNC_BATCH_SIZE:
+            return rows
+        after_id = batch[-1]["id"]
+
+async def sync_classifier_state():
+    inventories, rows = await asyncio.gather(call_node_script_async("inventory_ops.getAll"), fetch_demand_after(demand_sync["last_id"]))
+    classifier_state.update_capacities(inventories.get("data", []))
+    classifier_state.observe_rows(rows)
+    demand_stats.observe_rows(rows)
+    spike_detector.observe_rows(rows)
+    demand_sync["last_id"] = max((row["id"] for row in rows), default=demand_sync["last_id"])
+
+async def checkpoint_classifier_state():
+    await asyncio.to_thread(classifier_state.save)
+
+SPIKE_BATCH_SIZE = 200
+
+async def write_spike_rows(spikes: list):
+    inventories_result, locations_result = await asyncio.gather(
+        call_node_script_async("inventory_ops.getAll"),
+        call_node_script_async("location_ops.getAll")
+    )
+    inventories = {inventory["id"]: inventory for inventory in inventories_result.get("data", [])}
+    locations = {location["id"]: location for location in locations_result.get("data", [])}
+    capacity_location_ids = locations_with_capacity(inventories.values())
+    rows = []
+    for spike in spikes:
+        inventory = inventories.get(spike["inventoryId"])
+        if inventory is None:
+            continue
+        utilization = calculate_utilization_rate(inventory)
+        severity = determine_spike_severity(spike["spikePct"], utilization, inventory)
+        location = locations.get(inventory.get("locationId"), {})
+        nearby_locations = find_nearby_locations_with_capacity(location, locations.values(), capacity_location_ids) if severity == "critical" else []
+        rows.append({
+            "inventoryId": spike["inventoryId"],
+            "itemId": spike["itemId"],
+            "demandQuantity": int(round(spike["demandQuantity"])),
+            "baseline": round(spike["baseline"], 3),
+            "zScore": round(spike["zScore"], 3),
+            "spikePct": round(spike["spikePct"], 2),
+            "utilization": round(utilization, 2),
+            "severity": severity,
+            #what determine_spike_status gives a fresh spike; ageStatuses moves it on from there
+            "status": "active" if severity in ["critical", "warning"] else "monitoring",
+            "recommendedAction": generate_recommended_action(severity, inventory, location, nearby_locations)
+        })
+    if not rows:
+        return True
+    result = await call_node_script_async(f"spikemonitoring_ops.createMany {json.dumps(rows)}")
+    return result.get("success", False)
+
+async def flush_detected_spikes():
+    while True:
+        spikes = spike_detector.drain(SPIKE_BATCH_SIZE)
+        if not spikes:
+            break
+        try:
+            written = await write_spike_rows(spikes)
+        except Exception as e:
+            print(f"Spike flush failed: {e}")
+            written = False
+        if not written:
+            spike_detector.requeue(spikes)
+            break
+    await call_node_script_async("spikemonitoring_ops.ageStatuses")
+
+job_runner.add_job("rollup_flush", metric_rollups.flush, interval=float(os.getenv("ROLLUP_FLUSH_SECONDS", "10")), jitter=1.0)
+job_runner.add_job("demand_monitor", check_demand_thresholds, interval=5.0, jitter=0.5, leader_only=True)
+job_runner.add_job("lstm_training", train_lstm_model, interval=float(os.getenv("LSTM_TRAIN_SECONDS", "3600")), jitter=60.0, leader_only=True)
+job_runner.add_job("inventory_forecasts", refresh_inventory_forecasts, interval=float(os.getenv("INVENTORY_FORECAST_SECONDS", "900")), jitter=30.0, run_on_start=True, leader_only=True)
+job_runner.add_job("classifier_sync", sync_classifier_state, interval=float(os.getenv("CLASSIFIER_SYNC_SECONDS", "600")), jitter=30.0, run_on_start=True)
+job_runner.add_job("nightly_forecasts", precompute_inventory_forecasts, daily_at=os.getenv("FORECAST_NIGHTLY_AT", "02:00"), jitter=300.0, leader_only=True)
+job_runner.add_job("spike_flush", flush_detected_spikes, interval=float(os.getenv("SPIKE_FLUSH_SECONDS", "5")), jitter=0.5, leader_only=True)
+job_runner.add_job("classifier_checkpoint", checkpoint_classifier_state, interval=float(os.getenv("CLASSIFIER_CHECKPOINT_SECONDS", "60")), jitter=5.0, leader_only=True)
+job_runner.add_job("dashboard_snapshot", refresh_dashboard_snapshot, interval=float(os.getenv("DASHBOARD_REFRESH_SECONDS", "10")), jitter=1.0, run_on_start=True, leader_only=True)
+
+def record_relocation_created(relocation: dict):
+    metric_rollups.record("reallocated", relocation.get("quantity", 0), relocation.get("fromInventoryId"))
+
+def record_relocation_completed(relocation: dict):
+    quantity = relocation.get("quantity", 0)
+    metric_rollups.record("migrated", quantity, relocation.get("fromInventoryId"))
+    metric_rollups.record("cost_savings", quantity * COST_SAVINGS_PER_ITEM, relocation.get("fromInventoryId"))
+
+def record_critical_alert_change(alert: dict, delta: int):
+    if alert.get("severity") == "critical":
+        metric_rollups.record("critical_alerts", delta, alert.get("inventoryId"))
+
+def calculate_utilization_rate(inventory):
+    total_capacity = inventory['volumeOccupied'] + inventory['volumeAvailable']
+    if total_capacity == 0:
+        return 0.0
+    return (inventory['volumeOccupied'] / total_capacity) * 100
 
 @app.get("/api/inventory/{inventory_id}/details")
 async def get_inventory_details(inventory_id: str):
@@ -989,25 +1310,6 @@ async def get_inventory_details(inventory_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def calculate_demand_spike_percentage(demand_history):
-    if len(demand_history) < 2:
-        return 0.0
-
-    sorted_history = sorted(demand_history, key=lambda x: x.get("timestamp", ""))
-
-    if len(sorted_history) >= 7:
-        recent_demand = sum(d.get("demandQuantity", 0) for d in sorted_history[-1:])
-        baseline_demand = sum(d.get("demandQuantity", 0) for d in sorted_history[-7:-1]) / 6
-    else:
-        recent_demand = sorted_history[-1].get("demandQuantity", 0)
-        baseline_demand = sum(d.get("demandQuantity", 0) for d in sorted_history[:-1]) / max(1, len(sorted_history) - 1)
-
-    if baseline_demand == 0:
-        return 0.0
-
-    spike_percentage = ((recent_demand - baseline_demand) / baseline_demand) * 100
-    return max(0, spike_percentage)
-
 def determine_spike_severity(spike_pct, utilization_rate, inventory):
     inventory_status = inventory.get("status", "healthy")
 
@@ -1047,12 +1349,11 @@ def determine_spike_status(spike_record, severity):
 
     return "active" if severity == "critical" else "monitoring"
 
-async def generate_recommended_action(severity, inventory, location_data):
+def generate_recommended_action(severity, inventory, location_data, nearby_locations=()):
     inventory_name = inventory.get("name", "Unknown")
     location_city = location_data.get("city", "Unknown")
 
     if severity == "critical":
-        nearby_locations = await find_nearby_locations_with_capacity(location_data)
         if nearby_locations:
             source_location = nearby_locations[0].get("city", "nearby center")
             return f"Immediate reallocation from {source_location} to {inventory_name}"
@@ -1063,71 +1364,51 @@ async def generate_recommended_action(severity, inventory, location_data):
     else:
         return f"Continue monitoring demand patterns at {inventory_name}"
 
-async def find_nearby_locations_with_capacity(current_location):
-    try:
-        locations_result = call_node_script("location_ops.getAll")
-        if not locations_result.get("success"):
-            return []
-
-        locations = locations_result.get("data", [])
-        current_city = current_location.get("city", "")
-        nearby_locations = []
-
-        for loc in locations:
-            if loc.get("city") != current_city and loc.get("state") == current_location.get("state"):
-                inventory_result = call_node_script(f"inventory_ops.getByLocation {loc['id']}")
-                if inventory_result.get("success"):
-                    inventories = inventory_result.get("data", [])
-                    for inv in inventories:
-                        utilization = calculate_utilization_rate(inv)
-                        if utilization < 70:
-                            nearby_locations.append(loc)
-                            break
-
-        return nearby_locations[:3]
-    except Exception:
-        return []
+def locations_with_capacity(inventories):
+    return {inv.get("locationId") for inv in inventories if calculate_utilization_rate(inv) < 70}
+
+#pure: works on location rows and the ids from locations_with_capacity that the caller already fetched
+def find_nearby_locations_with_capacity(current_location, locations, capacity_location_ids):
+    current_city = current_location.get("city", "")
+    nearby_locations = [
+        loc for loc in locations
+        if loc.get("city") != current_city and loc.get("state") == current_location.get("state") and loc.get("id") in capacity_location_ids
+    ]
+    return nearby_locations[:3]
 
 @app.get("/api/spikes/monitoring")
-async def get_spike_monitoring():
+async def get_spike_monitoring(limit: int = 200):
     try:
-        spikes_result = call_node_script("spikemonitoring_ops.getAll")
+        spikes_result = call_node_script(f"spikemonitoring_ops.getRecent {int(limit)}")
         if not spikes_result.get("success"):
             raise HTTPException(status_code=500, detail="Failed to fetch spike monitoring data")
 
-        spikes = spikes_result.get("data", [])
         spike_data = []
-
-        for spike in spikes:
-            inventory_result = call_node_script(f"inventory_ops.getById {spike['inventoryId']}")
-            if not inventory_result.get("success"):
-                continue
-
-            inventory = inventory_result.get("data", [{}])[0]
-            if not inventory:
-                continue
-
-            location_result = call_node_script(f"location_ops.getById {inventory['locationId']}")
-            location_data = location_result.get("data", [{}])[0] if location_result.get("success") else {}
-
+        for spike in spikes_result.get("data", []):
+            inventory = {
+                "status": spike.get("inventoryStatus"),
+                "volumeOccupied": spike.get("volumeOccupied") or 0,
+                "volumeAvailable": spike.get("volumeAvailable") or 0
+            }
             utilization_rate = calculate_utilization_rate(inventory)
-
-            demand_history_result = call_node_script(f"demandhistory_ops.getByInventoryId {spike['inventoryId']}")
-            demand_history = demand_history_result.get("data", []) if demand_history_result.get("success") else []
-
-            demand_spike_pct = calculate_demand_spike_percentage(demand_history)
-            severity = determine_spike_severity(demand_spike_pct, utilization_rate, inventory)
-            recommended_action = await generate_recommended_action(severity, inventory, location_data)
+            spike_pct, z_score, severity = spike.get("spikePct"), spike.get("zScore"), spike.get("severity")
+            if severity is None:
+                #rows inserted by hand before detection existed: score them from the rolling stats
+                stats = demand_stats.stats(spike["inventoryId"]) or {}
+                spike_pct, z_score = stats.get("spike_pct", 0.0), stats.get("zscore")
+                severity = determine_spike_severity(spike_pct, utilization_rate, inventory)
 
             spike_data.append({
                 "id": spike.get("spikeMonitoringId"),
                 "timestamp": spike.get("createdAt", spike.get("updatedAt")),
-                "inventory_name": inventory.get("name", "Unknown"),
+                "inventory_name": spike.get("inventoryName") or "Unknown",
                 "severity": severity,
-                "demand_spike": format_spike_percentage(demand_spike_pct),
+                "demand_spike": format_spike_percentage(spike_pct or 0),
+                "demand_zscore": None if z_score is None else round(z_score, 2),
+                "demand_status": (classifier_state.status(spike["inventoryId"]) or {}).get("status"),
                 "current_utilization": round(utilization_rate, 0),
-                "status": determine_spike_status(spike, severity),
-                "recommended_action": recommended_action
+                "status": spike.get("status") or determine_spike_status(spike, severity),
+                "recommended_action": spike.get("recommendedAction") or f"Continue monitoring demand patterns at {spike.get('inventoryName') or 'Unknown'}"
             })
 
         return JSONResponse({
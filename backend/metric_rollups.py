@@ -0,0 +1,70 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+PERIODS = ("hourly", "daily", "weekly")
+METRIC_TYPES = ("migrated", "reallocated", "cost_savings", "critical_alerts")
+
+
+def bucket_start(at: datetime, period: str) -> datetime:
+    at = at.astimezone(timezone.utc) if at.tzinfo else at.replace(tzinfo=timezone.utc)
+    if period == "hourly":
+        return at.replace(minute=0, second=0, microsecond=0)
+    day = at.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "daily":
+        return day
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+class MetricRollups:
+    """
+    Buffers metric deltas per (metric, period, bucket, inventory) and writes them
+    as one batched upsert, so dashboard_metrics stays incrementally aggregated
+    instead of being rebuilt from full table scans.
+    """
+
+    def __init__(self, write_rows: Callable[[List[dict]], Awaitable[bool]]):
+        self.write_rows = write_rows
+        self.pending: Dict[Tuple[str, str, str, Optional[int]], int] = defaultdict(int)
+        self.lock = asyncio.Lock()
+
+    def record(self, metric_type: str, delta: int, inventory_id: Optional[int] = None, at: Optional[datetime] = None):
+        if metric_type not in METRIC_TYPES:
+            raise ValueError(f"Unknown metric type: {metric_type}")
+        if not delta:
+            return
+        at = at or datetime.now(timezone.utc)
+        for period in PERIODS:
+            start = bucket_start(at, period).isoformat()
+            self.pending[(metric_type, period, start, None)] += int(delta)
+            if inventory_id is not None:
+                self.pending[(metric_type, period, start, int(inventory_id))] += int(delta)
+
+    def pending_rows(self) -> List[dict]:
+        return [
+            {"metricType": metric_type, "period": period, "bucketStart": start, "inventoryId": inventory_id, "delta": delta}
+            for (metric_type, period, start, inventory_id), delta in self.pending.items()
+            if delta
+        ]
+
+    async def flush(self) -> int:
+        async with self.lock:
+            rows = self.pending_rows()
+            self.pending.clear()
+            if not rows:
+                return 0
+            written = False
+            try:
+                written = await self.write_rows(rows)
+            except Exception as e:
+                print(f"Rollup flush failed: {e}")
+            finally:
+                #put the deltas back so the next flush retries them, also when cancelled mid-write
+                if not written:
+                    for row in rows:
+                        self.pending[(row["metricType"], row["period"], row["bucketStart"], row["inventoryId"])] += row["delta"]
+            return len(rows) if written else 0
+
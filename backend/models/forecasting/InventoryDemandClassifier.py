@@ -52,3 +52,73 @@ class InventoryDemandClassifier:
             "avg_inventory_pct": round(self.avg_inventory_pct, 3),
             "avg_risk_ratio": round(self.avg_risk_ratio, 3)
         }
+
+    def ewma(self, values, start):
+        #y[n] = alpha*y[n-1] + (1-alpha)*x[n], seeded with the current average
+        from scipy.signal import lfilter
+
+        if not len(values):
+            return values
+        return lfilter([1 - self.alpha], [1, -self.alpha], values, zi=[self.alpha * start])[0]
+
+    def classify_batch(self, total, current, demand, timestamp=None):
+        """
+        Vectorized `classify` over arrays of observations, in order. Returns
+        columns instead of one dict per row: rows with a zero total or current get
+        status "Invalid", NaN metrics and leave the averages untouched, as in the
+        scalar path. The averages carry over, so batch and scalar calls can mix.
+        """
+        import numpy as np
+
+        total = np.asarray(total, dtype=np.float64)
+        current = np.asarray(current, dtype=np.float64)
+        demand = np.asarray(demand, dtype=np.float64)
+        valid = (total != 0) & (current != 0)
+        t, c, d = total[valid], current[valid], demand[valid]
+
+        demand_pct = d / t
+        inventory_pct = c / t
+        risk_ratio = d / c
+        avg_demand_pct = self.ewma(demand_pct, self.avg_demand_pct)
+        avg_inventory_pct = self.ewma(inventory_pct, self.avg_inventory_pct)
+        avg_risk_ratio = self.ewma(risk_ratio, self.avg_risk_ratio)
+        if valid.any():
+            self.avg_demand_pct = float(avg_demand_pct[-1])
+            self.avg_inventory_pct = float(avg_inventory_pct[-1])
+            self.avg_risk_ratio = float(avg_risk_ratio[-1])
+
+        critical = (d > c) | (inventory_pct < avg_inventory_pct - 0.3) | (demand_pct > avg_demand_pct + 0.2)
+        warning = (demand_pct >= avg_demand_pct) | (inventory_pct < avg_inventory_pct)
+        status = np.full(len(total), "Invalid", dtype=object)
+        status[valid] = np.where(critical, "Critical", np.where(warning, "Warning", "Normal"))
+
+        def column(values):
+            out = np.full(len(total), np.nan)
+            out[valid] = round3(values)
+            return out
+
+        result = {
+            "status": status,
+            "demand_pct": column(demand_pct),
+            "inventory_pct": column(inventory_pct),
+            "risk_ratio": column(risk_ratio),
+            "avg_demand_pct": column(avg_demand_pct),
+            "avg_inventory_pct": column(avg_inventory_pct),
+            "avg_risk_ratio": column(avg_risk_ratio)
+        }
+        if timestamp is not None:
+            result = {"timestamp": np.asarray(timestamp, dtype=object), **result}
+        return result
+
+
+def round3(values):
+    #np.round scales then rounds half-to-even, so exact ties can land differently
+    #from Python's round(); those few values go through round() itself
+    import numpy as np
+
+    rounded = np.round(values, 3)
+    scaled = values * 1000
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties:
+        rounded[i] = round(float(values[i]), 3)
+    return rounded
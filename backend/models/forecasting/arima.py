@@ -1,76 +1,198 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from statsmodels.tsa.arima.model import ARIMA
-from datetime import timedelta
-from InventoryDemandClassifier import InventoryDemandClassifier
+import json
+import multiprocessing
+import os
+import sys
 import warnings
-import csv
-
-warnings.filterwarnings("ignore")
-
-# Load existing inventory log
-df = pd.read_csv("inventory_log.csv")
-df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-df = df.sort_values(by='timestamp')
-
-# ARIMA forecast on demand
-demand_series = df['demand']
-model = ARIMA(demand_series, order=(2, 1, 2))
-model_fit = model.fit()
-
-forecast_steps = 5
-forecast = model_fit.forecast(steps=forecast_steps)
-
-# Plot
-plt.figure(figsize=(10, 5))
-plt.plot(demand_series, label="Historical Demand")
-plt.plot(range(len(demand_series), len(demand_series) + forecast_steps), forecast, label="Forecast", linestyle="--", marker="o")
-plt.legend()
-plt.xlabel("Time Index")
-plt.ylabel("Demand")
-plt.title("ARIMA Demand Forecast")
-plt.grid()
-plt.tight_layout()
-plt.show()
-
-# Reuse last known total and current
-latest_total = df['total'].iloc[-1]
-latest_current = df['current'].iloc[-1]
-last_timestamp = df['timestamp'].iloc[-1]
-
-# Initialize classifier
-classifier = InventoryDemandClassifier()
-
-# Open file for appending forecasted + classified data
-with open("inventory_log.csv", "a", newline='') as file:
-    writer = csv.writer(file)
-
-    for i, val in enumerate(forecast):
-        timestamp = last_timestamp + timedelta(days=i+1)
-        timestamp_str = timestamp.strftime("%Y-%m-%dT%H:%M:%S")
-        demand = round(val, 2)
-
-        result = classifier.classify(
-            timestamp=timestamp_str,
-            total=latest_total,
-            current=latest_current,
-            demand=demand
-        )
-
-        # Append full row
-        writer.writerow([
-            result["timestamp"],
+from datetime import timedelta
+from time import monotonic
+
+import numpy as np
+
+try:
+    from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+    from models.forecasting.log_store import read_frame
+    from models.forecasting.log_writer import get_writer
+except ImportError:
+    from InventoryDemandClassifier import InventoryDemandClassifier
+    from log_store import read_frame
+    from log_writer import get_writer
+
+LOG_PATH = "inventory_log.db"
+PARAMS_PATH = os.path.join("models", "forecasting", "arima_params.json")
+DEFAULT_ORDER = (2, 1, 2)
+
+
+def fit_and_forecast(series, order=DEFAULT_ORDER, steps=5, start_params=None, maxiter=50):
+    """
+    Fits ARIMA(order) to a demand series and forecasts `steps` values ahead. Pure
+    function: no plotting and no file I/O. Passing the previous fit's params as
+    `start_params` warm-starts the optimiser, falling back to a cold fit if they
+    no longer fit the model.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    values = np.asarray(series, dtype=float)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        model = ARIMA(values, order=tuple(order))
+        try:
+            fit = model.fit(start_params=start_params, method_kwargs={"maxiter": maxiter})
+        except Exception:
+            if start_params is None:
+                raise
+            fit = model.fit(method_kwargs={"maxiter": maxiter})
+
+    mle_retvals = getattr(fit, "mle_retvals", None) or {}
+    return {
+        "forecast": [float(value) for value in fit.forecast(steps=steps)],
+        "params": [float(value) for value in fit.params],
+        "aic": float(fit.aic),
+        "converged": bool(mle_retvals.get("converged", True))
+    }
+
+
+def _fit_one(key, series, order, steps, start_params, maxiter):
+    return key, fit_and_forecast(series, order=order, steps=steps, start_params=start_params, maxiter=maxiter)
+
+
+def fit_many(series_by_key, order=DEFAULT_ORDER, steps=5, previous_params=None, max_workers=None, timeout=30.0, maxiter=50, fit=_fit_one):
+    """
+    Fits every series in parallel across a process pool. Each fit warm-starts from
+    `previous_params[key]` when given. Fits still running after `timeout` seconds
+    are reported as timed out and their worker processes are stopped. `fit` is the
+    picklable per-series task, _fit_one unless a caller needs another.
+    """
+    previous_params = previous_params or {}
+    results = {}
+    if not series_by_key:
+        return results
+
+    pool = multiprocessing.get_context("spawn").Pool(processes=max_workers or min(len(series_by_key), os.cpu_count() or 1))
+    pending = {
+        key: pool.apply_async(fit, (key, list(map(float, series)), order, steps, previous_params.get(key), maxiter))
+        for key, series in series_by_key.items()
+    }
+    deadline = monotonic() + timeout
+    timed_out = finished = False
+    try:
+        for key, result in pending.items():
+            try:
+                _, results[key] = result.get(timeout=max(deadline - monotonic(), 0))
+            except multiprocessing.TimeoutError:
+                timed_out = True
+                results[key] = {"error": f"fit timed out after {timeout}s"}
+            except Exception as e:
+                results[key] = {"error": str(e)}
+        finished = not timed_out
+    finally:
+        #a stuck optimiser never returns, so its workers have to be stopped rather than waited for
+        if not finished:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+    return results
+
+
+def forecast_inventories_arima(demand_rows, steps=7, by="inventory", params_path=PARAMS_PATH, **options):
+    """Batch driver: per-inventory ARIMA forecasts, warm-started from the params saved by the last run."""
+    from models.forecasting.series import build_daily_series
+
+    series, last_day = build_daily_series(demand_rows, by)
+    previous_params = {}
+    if params_path and os.path.exists(params_path):
+        with open(params_path, "r") as f:
+            previous_params = json.load(f)
+
+    fits = fit_many(series, steps=steps, previous_params=previous_params, **options)
+
+    if params_path:
+        previous_params.update({key: fit["params"] for key, fit in fits.items() if "params" in fit})
+        tmp_path = f"{params_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(previous_params, f)
+        os.replace(tmp_path, params_path)
+
+    dates = [(last_day + timedelta(days=i + 1)).isoformat() for i in range(steps)] if last_day else []
+    results = {}
+    for key, fit in fits.items():
+        if "error" in fit:
+            results[key] = {"error": fit["error"]}
+            continue
+        values = [max(value, 0.0) for value in fit["forecast"]]
+        results[key] = {
+            "forecast": [{"date": date, "forecast_demand": round(value, 2)} for date, value in zip(dates, values)],
+            "forecasted_demand": int(round(sum(values))),
+            "converged": fit["converged"]
+        }
+    return results
+
+
+def load_demand_log(log_path=LOG_PATH, columns=("timestamp", "total", "current", "demand")):
+    return read_frame(log_path, columns)
+
+
+def forecast_log(log_path=LOG_PATH, steps=5, order=DEFAULT_ORDER):
+    df = load_demand_log(log_path, ("timestamp", "demand"))
+    fit = fit_and_forecast(df['demand'], order=order, steps=steps)
+    last_timestamp = df['timestamp'].iloc[-1]
+    return [
+        {"timestamp": (last_timestamp + timedelta(days=i + 1)).strftime("%Y-%m-%d"), "forecast_demand": round(value, 2)}
+        for i, value in enumerate(fit["forecast"])
+    ]
+
+
+def classify_forecast(df, forecast):
+    latest_total = float(df['total'].iloc[-1])
+    latest_current = float(df['current'].iloc[-1])
+    last_timestamp = df['timestamp'].iloc[-1]
+    timestamps = [(last_timestamp + timedelta(days=i + 1)).strftime("%Y-%m-%dT%H:%M:%S") for i in range(len(forecast))]
+    demand = [round(val, 2) for val in forecast]
+    steps = len(forecast)
+    result = InventoryDemandClassifier().classify_batch(np.full(steps, latest_total), np.full(steps, latest_current), demand, timestamps)
+
+    return [
+        [
+            result["timestamp"][i],
             latest_total,
             latest_current,
-            demand,
-            result["demand_pct"],
-            result["inventory_pct"],
-            result["risk_ratio"],
-            result["avg_demand_pct"],
-            result["avg_inventory_pct"],
-            result["avg_risk_ratio"],
-            result["status"]
-        ])
-
-        print(f" Logged → {timestamp_str} | Demand: {demand} | Status: {result['status']}")
+            demand[i],
+            float(result["demand_pct"][i]),
+            float(result["inventory_pct"][i]),
+            float(result["risk_ratio"][i]),
+            float(result["avg_demand_pct"][i]),
+            float(result["avg_inventory_pct"][i]),
+            float(result["avg_risk_ratio"][i]),
+            result["status"][i]
+        ]
+        for i in range(steps)
+    ]
+
+
+if __name__ == "__main__":
+    # Script mode keeps the old behaviour: forecast, optionally plot, append to the log
+    df = load_demand_log(LOG_PATH)
+    forecast_steps = 5
+    forecast = fit_and_forecast(df['demand'], steps=forecast_steps)["forecast"]
+
+    if "--plot" in sys.argv:
+        import matplotlib.pyplot as plt
+
+        demand_series = df['demand']
+        plt.figure(figsize=(10, 5))
+        plt.plot(demand_series.values, label="Historical Demand")
+        plt.plot(range(len(demand_series), len(demand_series) + forecast_steps), forecast, label="Forecast", linestyle="--", marker="o")
+        plt.legend()
+        plt.xlabel("Time Index")
+        plt.ylabel("Demand")
+        plt.title("ARIMA Demand Forecast")
+        plt.grid()
+        plt.tight_layout()
+        plt.show()
+
+    rows = classify_forecast(df, forecast)
+    writer = get_writer(LOG_PATH)
+    writer.extend(rows)
+    writer.flush()
+    for row in rows:
+        print(f" Logged → {row[0]} | Demand: {row[3]} | Status: {row[-1]}")
@@ -0,0 +1,243 @@
+"""
+Rolling-origin backtests of the forecasting tiers.
+
+Replays the demand log (or synthetic series) through the classifier baseline,
+ARIMA and the LSTM and reports accuracy next to what each tier costs, so the
+row-count cutoffs in select_forecast_model can be tuned from data.
+
+Run from backend/:
+    python -m models.forecasting.backtest --log models/forecasting/inventory_log.db
+    python -m models.forecasting.backtest --synthetic 100,1000,5000 --output backtest.json
+"""
+import argparse
+import contextlib
+import json
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+
+TIERS = ("classifier", "arima", "lstm")
+
+
+def synthetic_series(length, seed=0, base=100.0, trend=0.02, season=7, amplitude=15.0, noise=8.0, total=1000.0):
+    """Trend + weekly seasonality + noise, shaped like the log's total/current/demand columns."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(length, dtype=np.float32)
+    demand = base + trend * t + amplitude * np.sin(2 * np.pi * t / season) + rng.normal(0, noise, length)
+    demand = np.clip(demand, 1.0, None).astype(np.float32)
+    current = np.clip(total * 0.8 - demand + rng.normal(0, 20, length), 1.0, total).astype(np.float32)
+    return {"total": np.full(length, total, dtype=np.float32), "current": current, "demand": demand}
+
+
+def log_series(log_path):
+    from models.forecasting.arima import load_demand_log
+
+    df = load_demand_log(log_path)
+    return {column: df[column].to_numpy(dtype=np.float32) for column in ("total", "current", "demand")}
+
+
+class ClassifierTier:
+    """The <100-row tier: the classifier's EWMA demand share, projected flat over the horizon."""
+
+    name = "classifier"
+
+    def fit(self, history):
+        classifier = InventoryDemandClassifier()
+        classifier.classify_batch(history["total"], history["current"], history["demand"])
+        self.level = classifier.avg_demand_pct * float(history["total"][-1])
+
+    def forecast(self, steps):
+        return np.full(steps, self.level, dtype=np.float32)
+
+
+class ArimaTier:
+    """
+    arima.fit_and_forecast, the function serving uses. It forecasts as part of
+    the fit, so the horizon is fixed up front and fit_ms includes the forecast.
+    """
+
+    name = "arima"
+
+    def __init__(self, order=(2, 1, 2), maxiter=50, horizon=10):
+        #imported up front so the first fold's fit time isn't the import
+        import statsmodels.tsa.arima.model
+
+        self.order = order
+        self.maxiter = maxiter
+        self.horizon = horizon
+
+    def fit(self, history):
+        from models.forecasting.arima import fit_and_forecast
+
+        self.predicted = fit_and_forecast(history["demand"], order=self.order, steps=self.horizon, maxiter=self.maxiter)["forecast"]
+
+    def forecast(self, steps):
+        return np.asarray(self.predicted[:steps], dtype=np.float32)
+
+
+class LSTMTier:
+    """Trained from scratch at every origin with the serving model's architecture and scaler."""
+
+    name = "lstm"
+
+    def __init__(self, window_size=20, horizon=10, epochs=20):
+        #same for torch, which dwarfs a small fit
+        import models.forecasting.incremental_lstm
+
+        self.window_size = window_size
+        self.horizon = horizon
+        self.epochs = epochs
+
+    def fit(self, history):
+        from models.forecasting.incremental_lstm import LSTMForecaster, build_predictor
+        from models.forecasting.training import TrainingConfig, fit_model
+        from models.forecasting.windowing import make_windows
+
+        demand = history["demand"]
+        if len(demand) < self.window_size + self.horizon:
+            raise ValueError(f"LSTM needs at least {self.window_size + self.horizon} rows")
+        model = build_predictor(self.horizon)
+        self.forecaster = LSTMForecaster(model, demand.min(), demand.max(), self.window_size)
+        X, y = make_windows(self.forecaster.scale(demand), self.window_size, horizon=self.horizon)
+        fit_model(model, X, y, TrainingConfig(epochs=self.epochs, seed=0, num_threads=1))
+        self.forecaster.model.eval()
+        self.recent = demand[-self.window_size:]
+
+    def forecast(self, steps):
+        return np.asarray(self.forecaster.predict(self.recent, steps), dtype=np.float32)
+
+
+def build_tier(name, horizon=10, lstm_epochs=20, window_size=20):
+    if name == "classifier":
+        return ClassifierTier()
+    if name == "arima":
+        return ArimaTier(horizon=horizon)
+    if name == "lstm":
+        return LSTMTier(window_size=window_size, horizon=horizon, epochs=lstm_epochs)
+    raise ValueError(f"Unknown tier: {name}")
+
+
+def origins(length, horizon, folds, min_train):
+    last = length - horizon
+    if last < min_train:
+        return []
+    return sorted(set(np.linspace(min_train, last, num=min(folds, last - min_train + 1), dtype=int).tolist()))
+
+
+def max_rss_mb():
+    #ru_maxrss is KiB on Linux; it is a process high-water mark, so it only ever grows
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def backtest_tier(tier, series, horizon=10, folds=5, min_train=30, warmup=True):
+    """
+    Fits the tier on series[:origin] and forecasts the next `horizon` values for
+    each rolling origin. Peak memory is what tracemalloc sees (Python and NumPy
+    allocations; torch's own allocator is only visible in max_rss_mb). With
+    `warmup` one untimed fit runs first, so one-off library setup is not billed
+    to the first fold.
+    """
+    errors, actuals = [], []
+    fit_ms, infer_ms, peak_mb = [], [], []
+    failures = 0
+    cutoffs = origins(len(series["demand"]), horizon, folds, min_train)
+    if warmup and cutoffs:
+        try:
+            tier.fit({column: values[:cutoffs[0]] for column, values in series.items()})
+            tier.forecast(horizon)
+        except Exception:
+            pass
+    for origin in cutoffs:
+        history = {column: values[:origin] for column, values in series.items()}
+        actual = series["demand"][origin:origin + horizon]
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            tier.fit(history)
+            fitted = time.perf_counter()
+            predicted = tier.forecast(horizon)
+            done = time.perf_counter()
+        except Exception as e:
+            print(f"{tier.name} failed at origin {origin}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        finally:
+            peak_mb.append(tracemalloc.get_traced_memory()[1] / 1e6)
+            tracemalloc.stop()
+        fit_ms.append((fitted - start) * 1000)
+        infer_ms.append((done - fitted) * 1000)
+        errors.append(predicted - actual)
+        actuals.append(actual)
+
+    if not errors:
+        return {"tier": tier.name, "folds": 0, "failures": failures}
+    errors = np.concatenate(errors)
+    actuals = np.concatenate(actuals)
+    nonzero = actuals != 0
+    return {
+        "tier": tier.name,
+        "folds": len(fit_ms),
+        "failures": failures,
+        "mape": float(np.mean(np.abs(errors[nonzero] / actuals[nonzero])) * 100) if nonzero.any() else None,
+        "rmse": float(np.sqrt(np.mean(errors ** 2))),
+        "fit_ms": float(np.mean(fit_ms)),
+        "infer_ms": float(np.mean(infer_ms)),
+        "peak_mb": float(max(peak_mb)),
+        "max_rss_mb": max_rss_mb()
+    }
+
+
+def run_backtests(series_by_name, tiers=TIERS, horizon=10, folds=5, min_train=30, lstm_epochs=20):
+    """One result row per (series, tier), plus the most accurate tier per series by RMSE."""
+    rows, best = [], {}
+    for name, series in series_by_name.items():
+        length = len(series["demand"])
+        scored = []
+        for tier_name in tiers:
+            result = backtest_tier(build_tier(tier_name, horizon, lstm_epochs), series, horizon, folds, min_train)
+            rows.append({"series": name, "rows": length, **result})
+            if result.get("rmse") is not None:
+                scored.append((result["rmse"], tier_name))
+        best[name] = min(scored)[1] if scored else None
+    return {"horizon": horizon, "folds": folds, "results": rows, "best_tier": best}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest forecasting tiers")
+    parser.add_argument("--log", help="demand log to replay: the SQLite store (.db) or a legacy CSV")
+    parser.add_argument("--synthetic", default="", help="comma-separated synthetic series lengths")
+    parser.add_argument("--tiers", default=",".join(TIERS))
+    parser.add_argument("--horizon", type=int, default=10)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-train", type=int, default=30)
+    parser.add_argument("--lstm-epochs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    series_by_name = {}
+    if args.log:
+        series_by_name["log"] = log_series(args.log)
+    for length in filter(None, args.synthetic.split(",")):
+        series_by_name[f"synthetic-{int(length)}"] = synthetic_series(int(length), seed=args.seed)
+    if not series_by_name:
+        parser.error("pass --log and/or --synthetic")
+
+    #training logs go to stderr so stdout stays parseable JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_backtests(series_by_name, args.tiers.split(","), args.horizon, args.folds, args.min_train, args.lstm_epochs)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import torch
+import numpy as np
+import os
+from datetime import timedelta
+from models.forecasting.incremental_lstm import LSTMDemandPredictor, replace_file
+from models.forecasting.series import build_daily_series
+from models.forecasting.training import TrainingConfig, fit_model
+from models.forecasting.windowing import make_windows
+
+BATCHED_MODEL_PATH = "models/forecasting/batched_lstm.pt"
+
+class BatchedLSTMForecaster:
+    """
+    One LSTMDemandPredictor shared by every series. Each series is scaled by its
+    own peak so small and large inventories train together, and all of them are
+    stacked along the batch dimension for both training and inference.
+    """
+
+    def __init__(self, window_size=14, model=None):
+        self.window_size = window_size
+        self.model = model or LSTMDemandPredictor()
+
+    def scales(self, series):
+        return {key: float(values.max()) or 1.0 for key, values in series.items()}
+
+    def training_tensors(self, series, scales):
+        pairs = [make_windows(values / scales[key], self.window_size) for key, values in series.items()]
+        pairs = [(X, y) for X, y in pairs if len(X)]
+        if not pairs:
+            return None, None
+        return torch.cat([X for X, _ in pairs]), torch.cat([y for _, y in pairs])
+
+    def train(self, series, config=None):
+        X, y = self.training_tensors(series, self.scales(series))
+        if X is None:
+            print("Not enough demand history to train the batched forecaster.")
+            return None
+        #windows are grouped by series, so the validation sample is drawn at random
+        return fit_model(self.model, X, y, config or TrainingConfig.from_env(epochs=30), chronological=False)
+
+    def last_windows(self, series, scales):
+        keys = list(series.keys())
+        windows = np.zeros((len(keys), self.window_size), dtype=np.float32)
+        for row, key in enumerate(keys):
+            tail = series[key][-self.window_size:] / scales[key]
+            #shorter histories are left-padded with zero demand
+            windows[row, self.window_size - len(tail):] = tail
+        return keys, torch.from_numpy(windows).unsqueeze(-1)
+
+    def forecast(self, series, steps=7):
+        if not series:
+            return {}
+        scales = self.scales(series)
+        keys, window = self.last_windows(series, scales)
+        preds = []
+        self.model.eval()
+        with torch.inference_mode():
+            for _ in range(steps):
+                pred = self.model(window)
+                preds.append(pred)
+                window = torch.cat([window[:, 1:, :], pred.unsqueeze(-1)], dim=1)
+        preds = torch.cat(preds, dim=1).clamp(min=0).numpy()
+        return {key: (preds[row] * scales[key]).tolist() for row, key in enumerate(keys)}
+
+    def save(self, path=BATCHED_MODEL_PATH):
+        replace_file(path, lambda tmp_path: torch.save({"window_size": self.window_size, "state_dict": self.model.state_dict()}, tmp_path))
+
+    @classmethod
+    def load(cls, path=BATCHED_MODEL_PATH):
+        checkpoint = torch.load(path)
+        forecaster = cls(window_size=checkpoint["window_size"])
+        forecaster.model.load_state_dict(checkpoint["state_dict"])
+        forecaster.model.eval()
+        return forecaster
+
+def forecast_inventories(demand_rows, steps=7, epochs=30, window_size=14, by="inventory", model_path=BATCHED_MODEL_PATH, config=None):
+    """Warm-starts from the last checkpoint, trains one batched pass and forecasts every series."""
+    series, last_day = build_daily_series(demand_rows, by)
+    if not series:
+        return {}
+
+    if model_path and os.path.exists(model_path):
+        forecaster = BatchedLSTMForecaster.load(model_path)
+    else:
+        forecaster = BatchedLSTMForecaster(window_size=window_size)
+    if forecaster.train(series, config or TrainingConfig.from_env(epochs=epochs)) is not None and model_path:
+        forecaster.save(model_path)
+
+    dates = [(last_day + timedelta(days=i + 1)).isoformat() for i in range(steps)]
+    return {
+        key: {
+            "forecast": [{"date": date, "forecast_demand": round(value, 2)} for date, value in zip(dates, values)],
+            "forecasted_demand": int(round(sum(values)))
+        }
+        for key, values in forecaster.forecast(series, steps).items()
+    }
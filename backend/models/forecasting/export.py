@@ -0,0 +1,101 @@
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from models.forecasting.incremental_lstm import (
+    LOG_PATH, MODEL_PATH, SCRIPTED_PATH, load_checkpoint, load_lstm_forecaster, replace_file
+)
+from models.forecasting.windowing import make_windows
+
+
+def quantize_model(model):
+    #weights become int8, activations stay float and are quantized on the fly per batch
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+def script_model(model):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return torch.jit.script(model.eval())
+
+def evaluation_windows(forecaster, horizon, log_path=LOG_PATH, max_windows=256):
+    if not os.path.exists(log_path):
+        return None, None
+    from models.forecasting.incremental_lstm import read_recent_demand
+    demand, _ = read_recent_demand(log_path, max_windows + forecaster.window_size + horizon - 1)
+    X, y = make_windows(forecaster.scale(demand), forecaster.window_size, horizon=horizon)
+    return (X, y) if len(X) else (None, None)
+
+def time_forward(model, window, number=50):
+    with torch.inference_mode():
+        model(window)
+        start = time.perf_counter()
+        for _ in range(number):
+            model(window)
+    return (time.perf_counter() - start) / number * 1000
+
+def compare_models(reference, candidate, forecaster, X, y):
+    """Error of both models against the actuals and of the candidate against the float model, in demand units."""
+    with torch.inference_mode():
+        expected = forecaster.unscale(reference(X).numpy())
+        exported = forecaster.unscale(candidate(X).numpy())
+    actual = forecaster.unscale(y.numpy())
+    delta = np.abs(exported - expected)
+    return {
+        "windows": len(X),
+        "float_mae": float(np.abs(expected - actual).mean()),
+        "exported_mae": float(np.abs(exported - actual).mean()),
+        "mae_vs_float": float(delta.mean()),
+        "max_abs_vs_float": float(delta.max())
+    }
+
+def export_lstm(model_path=MODEL_PATH, artifact_path=SCRIPTED_PATH, quantize=False, log_path=LOG_PATH):
+    """
+    Writes the trained checkpoint as a self-contained TorchScript artifact next to
+    it, optionally with int8 dynamic quantization of the LSTM and Linear layers.
+    The scaler and window settings travel inside the artifact, so the serving
+    path only needs torch.jit.load. Returns a report with the accuracy delta
+    against the float model on the newest logged windows, forward latency and
+    artifact size. At hidden_size=64 int8 about doubles single-window latency
+    for a third of the size (see benchmarks/bench_export.py), so quantization
+    is opt-in.
+    """
+    checkpoint = load_checkpoint(model_path)
+    forecaster = load_lstm_forecaster(model_path)
+    float_model = forecaster.model
+    horizon = checkpoint.get("horizon", 1)
+    exported = script_model(quantize_model(float_model) if quantize else float_model)
+
+    window = torch.zeros(1, forecaster.window_size, 1)
+    report = {
+        "quantized": quantize,
+        "float_ms": time_forward(float_model, window),
+        "exported_ms": time_forward(exported, window),
+        "checkpoint_bytes": os.path.getsize(model_path),
+        "accuracy": None
+    }
+    X, y = evaluation_windows(forecaster, horizon, log_path)
+    if X is not None:
+        report["accuracy"] = compare_models(float_model, exported, forecaster, X, y)
+
+    meta = {
+        "scaler": checkpoint["scaler"],
+        "window_size": checkpoint["window_size"],
+        "horizon": horizon,
+        "trained_through": checkpoint.get("trained_through"),
+        "report": report
+    }
+    replace_file(artifact_path, lambda path: torch.jit.save(exported, path, _extra_files={"meta.json": json.dumps(meta)}))
+    report["artifact_bytes"] = os.path.getsize(artifact_path)
+    print(f"📦 Exported LSTM to {artifact_path} ({'int8' if quantize else 'float32'}): {json.dumps(report)}")
+    return report
+
+
+if __name__ == "__main__":
+    export_lstm(quantize=os.getenv("LSTM_QUANTIZE", "0") == "1")
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from models.forecasting import log_store
+from models.forecasting.log_store import data_version
+
+CACHE_PATH = os.path.join("models", "forecasting", "forecast_cache.json")
+
+
+class ForecastCache:
+    """
+    LRU cache of forecast results keyed on model name, data version and horizon.
+    The data version is the log store's row count (a legacy CSV's size and mtime),
+    so appending rows makes every older entry unreachable; those are pruned on
+    the next write. Entries are mirrored to a JSON file so a restarted worker starts
+    warm, and results written there by other processes (e.g. forecast jobs) are
+    picked up when it changes.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_PATH, max_entries: int = 128):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.row_counts: dict = {}
+        self.disk_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def make_key(model: str, version: str, horizon: Optional[dict] = None) -> str:
+        return json.dumps([model, version, horizon or {}], sort_keys=True)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self.disk_version = data_version(self.path)
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+            self.entries = OrderedDict(saved.get("entries", []))
+            self.row_counts = saved.get("row_counts", {})
+        except Exception as e:
+            print(f"Ignoring unreadable forecast cache {self.path}: {e}")
+
+    def refresh_from_disk(self):
+        if self.path and data_version(self.path) != self.disk_version:
+            self.load()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"entries": list(self.entries.items()), "row_counts": self.row_counts}, f)
+            os.replace(tmp_path, self.path)
+            self.disk_version = data_version(self.path)
+        except Exception as e:
+            print(f"Could not persist forecast cache: {e}")
+
+    def row_count(self, log_path: str) -> int:
+        if log_store.is_store_path(log_path):
+            return log_store.row_count(log_path)
+        version = data_version(log_path)
+        with self.lock:
+            if version in self.row_counts:
+                return self.row_counts[version]
+        count = log_store.row_count(log_path)
+        with self.lock:
+            self.row_counts = {version: count}
+        return count
+
+    def get(self, model: str, version: Optional[str], horizon: Optional[dict] = None) -> Optional[Any]:
+        if version is None:
+            return None
+        key = self.make_key(model, version, horizon)
+        with self.lock:
+            self.refresh_from_disk()
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, model: str, version: Optional[str], value: Any, horizon: Optional[dict] = None):
+        if version is None:
+            return
+        with self.lock:
+            self.refresh_from_disk()
+            #results for an older version of the log can never be hit again
+            for key in [key for key in self.entries if json.loads(key)[1] != version]:
+                del self.entries[key]
+            self.entries[self.make_key(model, version, horizon)] = value
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.save()
+
+    def get_or_compute(self, model: str, log_path: str, compute: Callable[[], Any], horizon: Optional[dict] = None, cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        version = data_version(log_path)
+        cached = self.get(model, version, horizon)
+        if cached is not None:
+            return cached
+        value = compute()
+        if cacheable(value):
+            self.put(model, version, value, horizon)
+        return value
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.row_counts = {}
+            self.save()
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+forecast_cache = ForecastCache()
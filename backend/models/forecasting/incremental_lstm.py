@@ -2,9 +2,15 @@ import torch
 import torch.nn as nn
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+import json
 import os
-from datetime import datetime
+import warnings
+from datetime import datetime, timedelta
+from models.forecasting.log_store import STORE_PATH, read_frame, recent_demand
+from models.forecasting.serving import MODEL_PATH, SCRIPTED_PATH, forecast_with_lstm, lstm_serving_model
+from models.forecasting.training import TrainingConfig, fit_model, validation_split
+from models.forecasting.windowing import last_window, make_windows
+from dataclasses import replace
 
 class LSTMDemandPredictor(nn.Module):
     def __init__(self, input_size=1, hidden_size=64, num_layers=2, output_size=1):
@@ -17,76 +23,248 @@ class LSTMDemandPredictor(nn.Module):
         out = self.linear(out[:, -1, :])
         return out
 
-def create_sequences(data, window_size):
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(data[i + window_size])
-    X = np.array(X)
-    y = np.array(y)
-    return torch.tensor(X, dtype=torch.float32), torch.tensor(y, dtype=torch.float32)
-
-LOG_PATH = "models/forecasting/inventory_log.csv"
-MODEL_PATH = "models/forecasting/lstm_model.pt"
-CHECKPOINT_PATH = "models/forecasting/last_trained_timestamp.txt"
+class LSTMMultiHorizonPredictor(LSTMDemandPredictor):
+    """Direct multi-step variant: the head emits the next `horizon` values from one pass."""
+
+    def __init__(self, input_size=1, hidden_size=64, num_layers=2, horizon=10):
+        super(LSTMMultiHorizonPredictor, self).__init__(input_size, hidden_size, num_layers, output_size=horizon)
+        self.horizon = horizon
+
+def build_predictor(horizon=1):
+    return LSTMMultiHorizonPredictor(horizon=horizon) if horizon > 1 else LSTMDemandPredictor()
+
+LOG_PATH = STORE_PATH
 FORECAST_PATH = "models/forecasting/lstm_forecast.csv"
 
-def run_incremental_lstm(epochs=50, window_size=20, forecast_steps=10):
-    df = pd.read_csv(LOG_PATH)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df = df.sort_values(by='timestamp')
+class LSTMForecaster:
+    """
+    Inference-only wrapper around a trained LSTMDemandPredictor. Holds the model in
+    eval mode together with the scaler range it was trained with, so a forecast is
+    a handful of forward passes with no disk access or training.
+    """
+
+    def __init__(self, model, data_min, data_max, window_size, version=None):
+        self.model = model.eval()
+        self.data_min = float(data_min)
+        self.data_max = float(data_max)
+        self.window_size = window_size
+        self.version = version
+
+    def scale(self, values):
+        span = (self.data_max - self.data_min) or 1.0
+        return (np.asarray(values, dtype=np.float32) - self.data_min) / span
+
+    def unscale(self, values):
+        span = (self.data_max - self.data_min) or 1.0
+        return np.asarray(values, dtype=np.float32) * span + self.data_min
+
+    def predict(self, recent_demand, forecast_steps=10):
+        if len(recent_demand) < self.window_size:
+            raise ValueError(f"Need at least {self.window_size} demand values, got {len(recent_demand)}")
+
+        #a multi-horizon head covers its whole horizon in one pass; longer requests
+        #(and single-step models) feed each predicted block back into the window
+        window = last_window(self.scale(recent_demand), self.window_size)
+        preds = []
+        with torch.inference_mode():
+            while len(preds) < forecast_steps:
+                block = self.model(window)
+                preds.extend(block.view(-1).tolist())
+                window = torch.cat([window, block.view(1, -1, 1)], dim=1)[:, -self.window_size:, :]
+        return self.unscale(preds[:forecast_steps]).tolist()
+
+    def forecast(self, recent_demand, last_timestamp, forecast_steps=10):
+        values = self.predict(recent_demand, forecast_steps)
+        start = pd.to_datetime(last_timestamp)
+        return [
+            {"timestamp": (start + timedelta(days=i + 1)).strftime("%Y-%m-%d"), "forecast_demand": round(value, 2)}
+            for i, value in enumerate(values)
+        ]
+
+def load_checkpoint(model_path=MODEL_PATH):
+    return torch.load(model_path)
+
+#checkpoints written before the scaler was stored are a bare single-step state_dict
+def is_legacy_checkpoint(checkpoint):
+    return not ("state_dict" in checkpoint and "scaler" in checkpoint)
+
+def upgrade_legacy_checkpoint(state_dict, log_path=LOG_PATH, window_size=20):
+    #the old script refitted its scaler on the whole log every run, so do the same once here
+    demand = read_frame(log_path, ("timestamp", "demand"))['demand'].values
+    return {
+        "state_dict": state_dict,
+        "scaler": {"data_min": float(demand.min()), "data_max": float(demand.max())},
+        "window_size": window_size,
+        "horizon": 1
+    }
+
+def load_lstm_forecaster(model_path=MODEL_PATH, log_path=LOG_PATH):
+    checkpoint = load_checkpoint(model_path)
+    if is_legacy_checkpoint(checkpoint):
+        checkpoint = upgrade_legacy_checkpoint(checkpoint, log_path)
+    model = build_predictor(checkpoint.get("horizon", 1))
+    model.load_state_dict(checkpoint["state_dict"])
+    scaler = checkpoint["scaler"]
+    return LSTMForecaster(model, scaler["data_min"], scaler["data_max"], checkpoint["window_size"], version=checkpoint.get("trained_through"))
+
+#the exported artifact carries its own graph and scaler, so serving it needs no model classes
+def load_scripted_forecaster(artifact_path=SCRIPTED_PATH):
+    extra_files = {"meta.json": ""}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        model = torch.jit.load(artifact_path, map_location="cpu", _extra_files=extra_files)
+    meta = json.loads(extra_files["meta.json"])
+    scaler = meta["scaler"]
+    return LSTMForecaster(model, scaler["data_min"], scaler["data_max"], meta["window_size"], version=meta.get("trained_through"))
+
+def read_recent_demand(log_path=LOG_PATH, window_size=20):
+    return recent_demand(log_path, window_size)
+
+def replace_file(path, write):
+    #write next to the target then rename, so readers never see a half-written checkpoint
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+class ReplayBuffer:
+    """Fixed-size reservoir sample of every training window seen so far."""
+
+    def __init__(self, capacity=512, X=None, y=None, seen=0):
+        self.capacity = capacity
+        self.X = X
+        self.y = y
+        self.seen = seen
+
+    def __len__(self):
+        return 0 if self.X is None else len(self.X)
 
-    if os.path.exists(CHECKPOINT_PATH):
-        with open(CHECKPOINT_PATH, "r") as f:
-            last_trained_ts = pd.to_datetime(f.read().strip())
-        new_data = df[df['timestamp'] > last_trained_ts]
-        print(f"🕒 Found checkpoint. Retraining with {len(new_data)} new rows.")
+    def sample(self, count):
+        if not len(self) or count <= 0:
+            return None, None
+        idx = torch.randperm(len(self))[:count]
+        return self.X[idx], self.y[idx]
+
+    def add(self, X, y):
+        for i in range(len(X)):
+            self.seen += 1
+            if len(self) < self.capacity:
+                self.X = X[i:i + 1].clone() if self.X is None else torch.cat([self.X, X[i:i + 1]])
+                self.y = y[i:i + 1].clone() if self.y is None else torch.cat([self.y, y[i:i + 1]])
+            else:
+                slot = np.random.randint(0, self.seen)
+                if slot < self.capacity:
+                    self.X[slot] = X[i]
+                    self.y[slot] = y[i]
+
+    def state(self):
+        return {"capacity": self.capacity, "X": self.X, "y": self.y, "seen": self.seen}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(**state) if state else cls()
+
+def train_incremental_lstm(epochs=None, window_size=20, log_path=LOG_PATH, model_path=MODEL_PATH, min_new_rows=1, replay_ratio=1.0, config=None, min_val_windows=10, horizon=None):
+    """
+    Trains only on windows whose targets include rows appended since the
+    checkpoint (tracked by the log's append-order seq, so backdated rows count
+    as new), mixed with a replay sample of older windows so the model does not
+    forget. The scaler is fitted once, on the first training run, and stored in
+    the checkpoint next to the weights, so training and inference always share
+    the same scale. Validation for early stopping is held out from the newest
+    windows. `horizon` sets how
+    many steps the head predicts directly; it is fixed once a checkpoint exists.
+    """
+    config = config or TrainingConfig.from_env()
+    if epochs is not None:
+        config = replace(config, epochs=epochs)
+
+    df = read_frame(log_path, ("seq", "timestamp", "demand"))
+
+    checkpoint = load_checkpoint(model_path) if os.path.exists(model_path) else None
+    horizon = horizon or int(os.getenv("LSTM_HORIZON", "10"))
+    if checkpoint is not None and is_legacy_checkpoint(checkpoint):
+        #no scaler or trained_through to continue from, so the old weights are replaced by a full first fit
+        print("Legacy checkpoint without training state found. Training from scratch.")
+        checkpoint = None
+    if checkpoint is not None:
+        window_size = checkpoint["window_size"]
+        horizon = checkpoint.get("horizon", 1)
+        #new means appended since the last run, wherever its timestamp lands; older checkpoints only know their last timestamp
+        if checkpoint.get("trained_seq") is not None:
+            is_new = df['seq'].values > checkpoint["trained_seq"]
+        else:
+            is_new = df['timestamp'].values > np.datetime64(pd.to_datetime(checkpoint["trained_through"]))
+        print(f"🕒 Found checkpoint. Retraining with {int(is_new.sum())} new rows.")
     else:
-        new_data = df
-        print("No checkpoint found. Training from scratch.")
+        is_new = np.ones(len(df), dtype=bool)
+        if not os.path.exists(model_path):
+            print("No checkpoint found. Training from scratch.")
 
-    if len(new_data) < window_size + 1:
+    new_rows = int(is_new.sum())
+    if new_rows < min_new_rows or len(df) < window_size + horizon:
         print("Not enough new data to train. Skipping training.")
+        return False
+
+    if checkpoint is not None:
+        scaler_state = checkpoint["scaler"]
     else:
-        demand = df['demand'].values.reshape(-1, 1)
-        scaler = MinMaxScaler()
-        demand_scaled = scaler.fit_transform(demand)
-        X, y = create_sequences(demand_scaled, window_size)
-        X = X.view(-1, window_size, 1)
-
-        model = LSTMDemandPredictor()
-        if os.path.exists(MODEL_PATH):
-            model.load_state_dict(torch.load(MODEL_PATH))
-            print("Model loaded from disk.")
-        else:
-            print("No saved model found. Training fresh.")
-
-        model.train()
-        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
-        loss_fn = nn.MSELoss()
-
-        for epoch in range(epochs):
-            output = model(X)
-            loss = loss_fn(output, y)
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
-            if epoch % 10 == 0:
-                print(f"Epoch {epoch}/{epochs}, Loss: {loss.item():.4f}")
-
-        torch.save(model.state_dict(), MODEL_PATH)
-        with open(CHECKPOINT_PATH, "w") as f:
-            f.write(str(df['timestamp'].iloc[-1]))
-        print("💾 Model + checkpoint saved.")
-
-    model.eval()
-    future_preds = []
-    last_seq = scaler.transform(df['demand'].values[-window_size:].reshape(-1, 1)).tolist()
-
-    for _ in range(forecast_steps):
-        seq_tensor = torch.tensor([last_seq], dtype=torch.float32)
-        with torch.no_grad():
-            pred = model(seq_tensor).item()
-        future_preds.append(pred)
-        last_seq.append([pred])
-        last_seq = last_seq
+        demand = df['demand'].values
+        scaler_state = {"data_min": float(demand.min()), "data_max": float(demand.max())}
+    span = (scaler_state["data_max"] - scaler_state["data_min"]) or 1.0
+
+    #windows are views over the time-ordered log; only those whose targets include a new row are trained on
+    scaled = (df['demand'].values.astype(np.float32).reshape(-1, 1) - scaler_state["data_min"]) / span
+    X_all, y_all = make_windows(scaled, window_size, horizon=horizon)
+    targets_new = np.lib.stride_tricks.sliding_window_view(is_new[window_size:], horizon)[:len(X_all)].any(axis=1)
+    selected = torch.from_numpy(np.flatnonzero(targets_new))
+    X_new, y_new = X_all[selected], y_all[selected]
+    if not len(X_new):
+        print("New rows fall before the first training window. Skipping training.")
+        return False
+
+    X_val, y_val = None, None
+    X_train, y_train = X_new, y_new
+    if len(X_new) >= min_val_windows:
+        X_train, y_train, X_val, y_val = validation_split(X_new, y_new, config.val_fraction)
+
+    replay = ReplayBuffer.from_state(checkpoint.get("replay") if checkpoint else None)
+    X_old, y_old = replay.sample(int(len(X_new) * replay_ratio))
+    X = X_train if X_old is None else torch.cat([X_train, X_old])
+    y = y_train if y_old is None else torch.cat([y_train, y_old])
+    print(f"Training on {len(X_new)} new and {0 if X_old is None else len(X_old)} replayed windows.")
+
+    model = build_predictor(horizon)
+    if checkpoint is not None:
+        model.load_state_dict(checkpoint["state_dict"])
+        print("Model loaded from disk.")
+    else:
+        print("No saved model found. Training fresh.")
+
+    stats = fit_model(model, X, y, config if X_val is not None else replace(config, val_fraction=0), X_val, y_val)
+    print(f"Trained {stats['epochs_run']} epochs" + (" (stopped early)" if stats["stopped_early"] else ""))
+
+    replay.add(X_new, y_new)
+    trained_through = str(df['timestamp'].iloc[-1])
+    trained_seq = int(df['seq'].max())
+    replace_file(model_path, lambda path: torch.save({
+        "state_dict": model.state_dict(),
+        "scaler": scaler_state,
+        "window_size": window_size,
+        "horizon": horizon,
+        "trained_through": trained_through,
+        "trained_seq": trained_seq,
+        "trained_at": datetime.now().isoformat(),
+        "replay": replay.state(),
+        "training": {**stats, "config": config.to_dict()}
+    }, path))
+    print("💾 Model + checkpoint saved.")
+    return True
+
+def run_incremental_lstm(epochs=None, window_size=20, forecast_steps=10):
+    train_incremental_lstm(epochs=epochs, window_size=window_size)
+
+    forecaster = load_lstm_forecaster()
+    recent_demand, last_timestamp = read_recent_demand(LOG_PATH, forecaster.window_size)
+    forecast_df = pd.DataFrame(forecaster.forecast(recent_demand, last_timestamp, forecast_steps))
+    forecast_df.to_csv(FORECAST_PATH, index=False)
+    return forecast_df
@@ -0,0 +1,339 @@
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+STORE_PATH = os.path.join("models", "forecasting", "inventory_log.db")
+COLUMNS = (
+    "timestamp",
+    "total",
+    "current",
+    "demand",
+    "demand_pct",
+    "inventory_pct",
+    "risk_ratio",
+    "avg_demand_pct",
+    "avg_inventory_pct",
+    "avg_risk_ratio",
+    "status"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS demand_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    total REAL,
+    current REAL,
+    demand REAL,
+    demand_pct REAL,
+    inventory_pct REAL,
+    risk_ratio REAL,
+    avg_demand_pct REAL,
+    avg_inventory_pct REAL,
+    avg_risk_ratio REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS demand_log_timestamp_demand ON demand_log (timestamp, seq, demand);
+CREATE TABLE IF NOT EXISTS log_meta (key TEXT PRIMARY KEY, value);
+INSERT OR IGNORE INTO log_meta (key, value) VALUES ('rows', 0), ('generation', 0);
+CREATE TRIGGER IF NOT EXISTS demand_log_count AFTER INSERT ON demand_log
+BEGIN
+    UPDATE log_meta SET value = value + 1 WHERE key = 'rows';
+END;
+"""
+
+
+def normalize_timestamp(value) -> str:
+    #one ISO format, so the text index sorts chronologically
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return datetime.fromisoformat(str(value)).isoformat()
+
+
+def legacy_csv_path(store_path: str) -> str:
+    return f"{os.path.splitext(store_path)[0]}.csv"
+
+
+def is_store_path(path: str) -> bool:
+    return path.endswith(".db")
+
+
+class LogStore:
+    """
+    Append-only demand log in SQLite. Rows keep their append order in `seq`, reads
+    come back in timestamp order through the (timestamp, seq, demand) index, which
+    also covers timestamp+demand reads without touching the table, and the row
+    count is kept by a trigger so counting never scans. WAL mode lets readers run
+    while one writer appends; concurrent writers (API workers, logger.py, arima.py)
+    queue on SQLite's lock instead of interleaving partial lines.
+    """
+
+    def __init__(self, path: str = STORE_PATH, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        #connections are per thread and per process, so forked/spawned workers open their own
+        conn = getattr(self.local, "conn", None)
+        if conn is None or getattr(self.local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    @staticmethod
+    def insert(conn: sqlite3.Connection, rows: Iterable[Sequence]) -> int:
+        values = []
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row.get(column) for column in COLUMNS]
+            row = list(row) + [None] * (len(COLUMNS) - len(row))
+            row[0] = normalize_timestamp(row[0])
+            values.append(row)
+        conn.executemany(f"INSERT INTO demand_log ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", values)
+        return len(values)
+
+    def transaction(self, write: Callable[[sqlite3.Connection], Any]) -> Any:
+        #BEGIN IMMEDIATE takes the write lock up front, so other writers wait rather than fail mid-way
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = write(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def append(self, rows: Iterable[Sequence]) -> int:
+        """Appends rows (sequences or dicts in COLUMNS order) in one transaction."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        return self.transaction(lambda conn: self.insert(conn, rows))
+
+    def meta(self, key: str):
+        row = self.connect().execute("SELECT value FROM log_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        return int(self.meta("rows"))
+
+    def version(self) -> str:
+        return f"{self.meta('generation')}-{self.meta('rows')}"
+
+    def read(self, columns: Sequence[str] = COLUMNS, start: Optional[str] = None, end: Optional[str] = None) -> List[tuple]:
+        """Rows with start <= timestamp < end, oldest first."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(normalize_timestamp(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(normalize_timestamp(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.connect().execute(f"SELECT {', '.join(self.checked(columns))} FROM demand_log {where} ORDER BY timestamp, seq", params).fetchall()
+
+    def iter_chunks(self, columns: Sequence[str] = COLUMNS, tail: Optional[int] = None, chunk_size: int = 8192):
+        """
+        Yields (expected_rows, chunk) pairs in timestamp order from one read
+        snapshot, so the row count used to size buffers matches what is read even
+        while writers append. `tail` limits the read to the newest rows.
+        """
+        select = ", ".join(self.checked(columns))
+        conn = self.connect()
+        conn.execute("BEGIN")
+        try:
+            expected = self.count()
+            if tail is not None:
+                expected = min(expected, tail)
+                cursor = conn.execute(f"SELECT {select} FROM (SELECT * FROM demand_log ORDER BY timestamp DESC, seq DESC LIMIT ?) ORDER BY timestamp, seq", (tail,))
+            else:
+                cursor = conn.execute(f"SELECT {select} FROM demand_log ORDER BY timestamp, seq")
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield expected, chunk
+        finally:
+            conn.execute("COMMIT")
+
+    def tail(self, count: int, columns: Sequence[str] = COLUMNS) -> List[tuple]:
+        """The newest `count` rows by timestamp, oldest first; walks the index backwards."""
+        rows = self.connect().execute(f"SELECT {', '.join(self.checked(columns))} FROM demand_log ORDER BY timestamp DESC, seq DESC LIMIT ?", (count,)).fetchall()
+        rows.reverse()
+        return rows
+
+    @staticmethod
+    def checked(columns: Sequence[str]) -> Sequence[str]:
+        #seq is readable too: the append-order position, which timestamps can't give for backdated rows
+        unknown = set(columns) - set(COLUMNS) - {"seq"}
+        if unknown:
+            raise ValueError(f"Unknown log columns: {sorted(unknown)}")
+        return columns
+
+    def migrate_csv(self, csv_path: str, batch_size: int = 10000) -> int:
+        """One-time import of a legacy CSV log; a store that already has rows is left alone."""
+        if not os.path.exists(csv_path):
+            return 0
+
+        def migrate(conn):
+            #checked inside the write lock, so two workers starting together import once
+            if conn.execute("SELECT value FROM log_meta WHERE key = 'rows'").fetchone()[0]:
+                return 0
+            migrated = 0
+            with open(csv_path, "r", newline="") as f:
+                reader = csv.DictReader(f)
+                while True:
+                    batch = list(islice(reader, batch_size))
+                    if not batch:
+                        break
+                    migrated += self.insert(conn, batch)
+            conn.execute("UPDATE log_meta SET value = value + 1 WHERE key = 'generation'")
+            conn.execute("INSERT OR REPLACE INTO log_meta (key, value) VALUES ('migrated_from', ?)", (os.path.abspath(csv_path),))
+            return migrated
+
+        migrated = self.transaction(migrate)
+        if migrated:
+            print(f"Migrated {migrated} rows from {csv_path} into {self.path}")
+        return migrated
+
+
+stores = {}
+stores_lock = threading.Lock()
+
+def get_store(path: str = STORE_PATH) -> LogStore:
+    """Shared store per path; a missing database is created from the CSV it replaces."""
+    with stores_lock:
+        store = stores.get(path)
+        if store is None:
+            existed = os.path.exists(path)
+            store = LogStore(path)
+            if not existed:
+                store.migrate_csv(legacy_csv_path(path))
+            stores[path] = store
+        return store
+
+
+#readers below accept either a store (.db) or a legacy CSV path
+def log_exists(path: str) -> bool:
+    if is_store_path(path):
+        return os.path.exists(path) or os.path.exists(legacy_csv_path(path))
+    return os.path.exists(path)
+
+def row_count(path: str) -> int:
+    if is_store_path(path):
+        return get_store(path).count()
+    with open(path, "r") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+def data_version(path: str) -> Optional[str]:
+    if is_store_path(path):
+        return f"db-{get_store(path).version()}" if log_exists(path) else None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+def column_dtype(column: str):
+    import numpy as np
+
+    if column == "timestamp":
+        return np.dtype("datetime64[s]")
+    if column == "seq":
+        return np.dtype(np.int64)
+    return np.dtype(object) if column == "status" else np.dtype(np.float32)
+
+def read_columns(path: str, columns: Sequence[str] = ("timestamp", "demand"), tail: Optional[int] = None, chunk_size: int = 8192) -> dict:
+    """
+    Reads only `columns` into compact NumPy arrays (float32 values, datetime64[s]
+    timestamps), in timestamp order. The store is streamed in chunks into arrays
+    sized from its O(1) row count, so peak memory is the arrays themselves plus
+    one chunk. A legacy CSV is streamed with pandas' chunked reader.
+    """
+    import numpy as np
+
+    dtypes = {column: column_dtype(column) for column in LogStore.checked(columns)}
+    if is_store_path(path):
+        arrays, filled = None, 0
+        for expected, chunk in get_store(path).iter_chunks(columns, tail, chunk_size):
+            if arrays is None:
+                arrays = {column: np.empty(expected, dtype=dtype) for column, dtype in dtypes.items()}
+            for column, values in zip(columns, zip(*chunk)):
+                arrays[column][filled:filled + len(chunk)] = np.asarray(values, dtype=dtypes[column])
+            filled += len(chunk)
+        if arrays is None:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in dtypes.items()}
+        return {column: values[:filled] for column, values in arrays.items()}
+
+    import pandas as pd
+
+    stored = [column for column in columns if column != "seq"]
+    if "seq" in columns and "timestamp" not in stored:
+        #seq alone still comes back in time order, as it does from the store
+        stored.append("timestamp")
+    read = stored + (["seq"] if "seq" in columns else [])
+    dtypes["timestamp"] = column_dtype("timestamp")
+    pieces = {column: [] for column in read}
+    parse = {column: ("float32" if dtypes[column] == np.float32 else object) for column in stored}
+    appended = 0
+    for chunk in pd.read_csv(path, usecols=stored, dtype=parse, chunksize=chunk_size):
+        for column in read:
+            if column == "seq":
+                #a CSV's append order is its line order, numbered from 1 like the store's seq
+                values = np.arange(appended + 1, appended + len(chunk) + 1, dtype=np.int64)
+            else:
+                values = chunk[column].to_numpy()
+            pieces[column].append(values.astype(dtypes[column]) if column == "timestamp" else values)
+        appended += len(chunk)
+    arrays = {column: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[column]) for column, parts in pieces.items()}
+    if "timestamp" in arrays:
+        #CSV rows are in append order, not time order
+        order = np.argsort(arrays["timestamp"], kind="stable")
+        arrays = {column: values[order] for column, values in arrays.items()}
+    arrays = {column: arrays[column] for column in columns}
+    if tail is not None:
+        arrays = {column: values[-tail:] if tail else values[:0] for column, values in arrays.items()}
+    return arrays
+
+def read_frame(path: str, columns: Sequence[str] = COLUMNS, tail: Optional[int] = None):
+    """The log's `columns` as a DataFrame in timestamp order, with compact dtypes."""
+    import pandas as pd
+
+    return pd.DataFrame(read_columns(path, columns, tail), columns=list(columns))
+
+def recent_demand(path: str, count: int) -> Tuple[List[float], Optional[str]]:
+    """The last `count` demand values and the newest timestamp."""
+    if is_store_path(path):
+        rows = get_store(path).tail(count, ("timestamp", "demand"))
+    else:
+        from collections import deque
+
+        with open(path, "r") as f:
+            rows = deque(((row["timestamp"], row["demand"]) for row in csv.DictReader(f)), maxlen=count)
+    return [float(demand) for _, demand in rows], (rows[-1][0] if rows else None)
+
+
+if __name__ == "__main__":
+    # python -m models.forecasting.log_store [csv_path] [store_path]
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else legacy_csv_path(STORE_PATH)
+    store_path = sys.argv[2] if len(sys.argv) > 2 else STORE_PATH
+    store = LogStore(store_path)
+    if not store.migrate_csv(csv_path):
+        print(f"Nothing migrated: {store_path} already has {store.count()} rows or {csv_path} is missing")
@@ -0,0 +1,155 @@
+import atexit
+import os
+import threading
+import time
+from typing import Iterable, Optional, Sequence
+
+try:
+    from models.forecasting.log_store import STORE_PATH, LogStore, get_store
+except ImportError:
+    from log_store import STORE_PATH, LogStore, get_store
+
+
+class LogWriter:
+    """
+    Buffers demand log rows in memory and appends them to the store in batches
+    from one background thread, so callers never pay for a transaction per row.
+    A batch is written when `batch_size` rows are waiting or `flush_seconds` after
+    the first of them arrived, whichever comes first. Batches from one process
+    go through a single flush lock, and across processes SQLite's write lock
+    keeps them whole. WAL commits under synchronous=NORMAL are not fsynced, so
+    the WAL is fsynced at most every `fsync_seconds` (0 means after every batch,
+    None leaves it to SQLite's checkpoints). Rows still buffered when the process
+    dies are lost; close() and the atexit hook flush them on a normal exit.
+    """
+
+    def __init__(self, store: LogStore, batch_size: int = 500, flush_seconds: float = 1.0, fsync_seconds: Optional[float] = 5.0):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.fsync_seconds = fsync_seconds
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread = None
+        self.last_sync = time.monotonic()
+        self.written = 0
+        self.batches = 0
+        self.syncs = 0
+
+    def write(self, row: Sequence):
+        self.extend([row])
+
+    def extend(self, rows: Iterable[Sequence]):
+        rows = list(rows)
+        if not rows:
+            return
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("LogWriter is closed")
+            self.buffer.extend(rows)
+            waiting = len(self.buffer)
+            self.start()
+        if waiting >= self.batch_size * 10:
+            #the writer thread has fallen far behind: write here rather than grow without bound
+            self.flush()
+        elif waiting >= self.batch_size:
+            self.wake.set()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Demand log flush failed, retrying: {e}")
+            if self.closed:
+                return
+
+    def flush(self) -> int:
+        with self.flush_lock:
+            with self.lock:
+                rows, self.buffer = self.buffer, []
+            if rows:
+                try:
+                    self.store.append(rows)
+                except Exception:
+                    #put the batch back in front of anything buffered since, to keep append order
+                    with self.lock:
+                        self.buffer[:0] = rows
+                    raise
+                self.written += len(rows)
+                self.batches += 1
+            if rows and self.fsync_seconds is not None and time.monotonic() - self.last_sync >= self.fsync_seconds:
+                self.sync()
+            return len(rows)
+
+    def sync(self):
+        #commits live in the -wal file until a checkpoint copies them into the database
+        for path in (f"{self.store.path}-wal", self.store.path):
+            if os.path.exists(path):
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                break
+        self.last_sync = time.monotonic()
+        self.syncs += 1
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            thread, self.thread = self.thread, None
+        self.wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+        if self.fsync_seconds is not None and self.written:
+            self.sync()
+
+    def stats(self) -> dict:
+        return {"buffered": len(self.buffer), "written": self.written, "batches": self.batches, "syncs": self.syncs}
+
+
+def fsync_setting() -> Optional[float]:
+    value = os.getenv("LOG_FSYNC_SECONDS", "5")
+    return None if value.lower() in ("", "none", "off") else float(value)
+
+
+writers = {}
+writers_lock = threading.Lock()
+
+def get_writer(path: str = STORE_PATH) -> LogWriter:
+    """Shared writer per store path and process; a forked child gets its own thread."""
+    key = (path, os.getpid())
+    with writers_lock:
+        writer = writers.get(key)
+        if writer is None:
+            writer = LogWriter(
+                get_store(path),
+                batch_size=int(os.getenv("LOG_BATCH_SIZE", "500")),
+                flush_seconds=float(os.getenv("LOG_FLUSH_SECONDS", "1.0")),
+                fsync_seconds=fsync_setting()
+            )
+            writers[key] = writer
+        return writer
+
+@atexit.register
+def close_writers():
+    with writers_lock:
+        open_writers = [writer for (_, pid), writer in writers.items() if pid == os.getpid()]
+        writers.clear()
+    for writer in open_writers:
+        try:
+            writer.close()
+        except Exception as e:
+            print(f"Could not flush demand log on exit: {e}")
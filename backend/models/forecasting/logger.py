@@ -1,39 +1,31 @@
-import csv
-import os
+try:
+    from models.forecasting.log_store import get_store
+    from models.forecasting.log_writer import get_writer
+except ImportError:
+    from log_store import get_store
+    from log_writer import get_writer
 
-CSV_FILE = "inventory_log.csv"
+STORE_FILE = "inventory_log.db"
 
 def init_log():
-    if not os.path.exists(CSV_FILE):
-        with open(CSV_FILE, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                "timestamp",
-                "total",
-                "current",
-                "demand",
-                "demand_pct",
-                "inventory_pct",
-                "risk_ratio",
-                "avg_demand_pct",
-                "avg_inventory_pct",
-                "avg_risk_ratio",
-                "status"
-            ])
+    #creates the store, migrating inventory_log.csv on first use
+    get_store(STORE_FILE)
 
 def log_result(timestamp, total, current, demand, result):
-    with open(CSV_FILE, mode="a", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow([
-            timestamp,
-            total,
-            current,
-            demand,
-            result["demand_pct"],
-            result["inventory_pct"],
-            result["risk_ratio"],
-            result["avg_demand_pct"],
-            result["avg_inventory_pct"],
-            result["avg_risk_ratio"],
-            result["status"]
-        ])
+    #buffered: rows reach the store in batches, and on flush_log() or exit
+    get_writer(STORE_FILE).write([
+        timestamp,
+        total,
+        current,
+        demand,
+        result["demand_pct"],
+        result["inventory_pct"],
+        result["risk_ratio"],
+        result["avg_demand_pct"],
+        result["avg_inventory_pct"],
+        result["avg_risk_ratio"],
+        result["status"]
+    ])
+
+def flush_log():
+    return get_writer(STORE_FILE).flush()
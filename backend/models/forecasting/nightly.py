@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from models.forecasting.series import build_daily_series
+
+MIN_ARIMA_DAYS = 14
+MAX_TIME_TO_FILL = "23:59:59"
+
+
+def time_to_fill(available, daily_demand):
+    """
+    How long the predicted demand takes to use up the inventory's free volume, as
+    HH:MM:SS. how_much_time_to_fill is a time-of-day column, so anything a day or
+    longer (including no demand at all) is stored as 23:59:59.
+    """
+    if daily_demand <= 0:
+        return MAX_TIME_TO_FILL
+    seconds = int(max(available, 0) / daily_demand * 86400)
+    if seconds >= 86400:
+        return MAX_TIME_TO_FILL
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def mean_forecast(values, steps, window=7):
+    recent = np.asarray(values[-window:], dtype=float)
+    level = float(recent.mean()) if len(recent) else 0.0
+    return [level] * steps
+
+
+def forecast_all_inventories(demand_rows, inventories, steps=7, run_date=None, timeout=60.0, **options):
+    """
+    One forecasting_metrics row per inventory for `run_date`. Daily demand series
+    are fitted with ARIMA across a process pool (forecast_inventories_arima);
+    series shorter than MIN_ARIMA_DAYS, or whose fit fails, fall back to the mean
+    of their last week. actualDemand is the demand observed over the `steps` days
+    before the run, the figure the prediction replaces.
+    """
+    from models.forecasting.arima import forecast_inventories_arima
+
+    run_date = run_date or date.today().isoformat()
+    series, last_day = build_daily_series(demand_rows)
+    fits = {}
+    if series and len(next(iter(series.values()))) >= MIN_ARIMA_DAYS:
+        fits = forecast_inventories_arima(demand_rows, steps=steps, timeout=timeout, **options)
+
+    start = (last_day or date.fromisoformat(run_date)) + timedelta(days=1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(steps)]
+    rows = []
+    for inventory in inventories:
+        key = str(inventory["id"])
+        values = series.get(key, [])
+        fit = fits.get(key, {})
+        if "forecast" in fit:
+            model, forecast = "arima", [point["forecast_demand"] for point in fit["forecast"]]
+        else:
+            model, forecast = "mean", [max(value, 0.0) for value in mean_forecast(values, steps)]
+        predicted = float(sum(forecast))
+        rows.append({
+            "inventoryId": inventory["id"],
+            "forecastDate": run_date,
+            "horizonDays": steps,
+            "model": model,
+            "predictedDemand": round(predicted, 2),
+            "actualDemand": round(float(np.sum(values[-steps:])) if len(values) else 0.0, 2),
+            "howMuchTimeToFill": time_to_fill(inventory.get("volumeAvailable", 0), predicted / steps),
+            "forecast": [{"date": day, "forecast_demand": round(value, 2)} for day, value in zip(dates, forecast)]
+        })
+    return rows
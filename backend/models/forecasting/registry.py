@@ -0,0 +1,79 @@
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LoadedModel:
+    def __init__(self, name: str, model: Any, version: Tuple[int, int]):
+        self.name = name
+        self.model = model
+        self.version = version
+        self.loaded_at = datetime.now().isoformat()
+
+
+class ModelRegistry:
+    """
+    Keeps each forecasting model resident after its first load. A `get` only stats
+    the checkpoint file; when a trainer replaces it the new model is loaded and
+    swapped in as a single reference assignment, so in-flight forecasts finish on
+    the old model and never see a half-loaded one.
+    """
+
+    def __init__(self):
+        self.loaders: Dict[str, Tuple[str, Callable[[], Any]]] = {}
+        self.loaded: Dict[str, LoadedModel] = {}
+        self.lock = threading.Lock()
+        self.load_counts: Dict[str, int] = {}
+
+    def register(self, name: str, checkpoint_path: str, loader: Callable[[], Any]):
+        self.loaders[name] = (checkpoint_path, loader)
+
+    def checkpoint_version(self, name: str) -> Optional[Tuple[int, int]]:
+        checkpoint_path, _ = self.loaders[name]
+        try:
+            stat = os.stat(checkpoint_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, name: str) -> Optional[LoadedModel]:
+        if name not in self.loaders:
+            raise KeyError(f"Unknown model: {name}")
+        version = self.checkpoint_version(name)
+        current = self.loaded.get(name)
+        if version is None:
+            return current
+        if current is not None and current.version == version:
+            return current
+        return self.reload(name)
+
+    def reload(self, name: str) -> Optional[LoadedModel]:
+        with self.lock:
+            version = self.checkpoint_version(name)
+            current = self.loaded.get(name)
+            if version is None or (current is not None and current.version == version):
+                return current
+            _, loader = self.loaders[name]
+            try:
+                loaded = LoadedModel(name, loader(), version)
+            except Exception as e:
+                print(f"Could not load model {name}: {e}")
+                return current
+            self.loaded[name] = loaded
+            self.load_counts[name] = self.load_counts.get(name, 0) + 1
+            print(f"Loaded model {name} (checkpoint {version[0]})")
+            return loaded
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "loaded": name in self.loaded,
+                "loaded_at": self.loaded[name].loaded_at if name in self.loaded else None,
+                "loads": self.load_counts.get(name, 0)
+            }
+            for name in self.loaders
+        }
+
+
+registry = ModelRegistry()
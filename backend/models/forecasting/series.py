@@ -0,0 +1,27 @@
+import numpy as np
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+def series_key(row, by="inventory"):
+    if by == "inventory_item":
+        return f"{row['inventoryId']}:{row['itemId']}"
+    return str(row["inventoryId"])
+
+def build_daily_series(demand_rows, by="inventory"):
+    """
+    Sums demand_history rows into one daily series per inventory (or inventory:item
+    pair). Every series covers the same calendar range, missing days count as zero
+    demand, so the series can be stacked into a single tensor.
+    """
+    totals = defaultdict(lambda: defaultdict(float))
+    for row in demand_rows:
+        day = datetime.fromisoformat(str(row["timestamp"]).replace("Z", "+00:00")).date()
+        totals[series_key(row, by)][day] += float(row.get("demandQuantity", 0))
+    if not totals:
+        return {}, None
+
+    first = min(min(days) for days in totals.values())
+    last = max(max(days) for days in totals.values())
+    calendar = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    series = {key: np.array([days.get(day, 0.0) for day in calendar], dtype=np.float32) for key, days in totals.items()}
+    return series, last
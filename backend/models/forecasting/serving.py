@@ -0,0 +1,45 @@
+"""
+The API side of the LSTM: checkpoint locations, which artifact to serve, and
+forecasting from the resident model. Nothing here imports torch or pandas;
+the registry loaders pull in incremental_lstm on the first model load, so
+workers that never forecast never pay for the model stack.
+"""
+import os
+
+from models.forecasting.log_store import STORE_PATH, recent_demand
+from models.forecasting.registry import registry
+
+LOG_PATH = STORE_PATH
+MODEL_PATH = "models/forecasting/lstm_model.pt"
+SCRIPTED_PATH = "models/forecasting/lstm_model.ts"
+
+
+def load_lstm():
+    from models.forecasting.incremental_lstm import load_lstm_forecaster
+    return load_lstm_forecaster(MODEL_PATH)
+
+def load_scripted_lstm():
+    from models.forecasting.incremental_lstm import load_scripted_forecaster
+    return load_scripted_forecaster(SCRIPTED_PATH)
+
+registry.register("lstm", MODEL_PATH, load_lstm)
+registry.register("lstm_scripted", SCRIPTED_PATH, load_scripted_lstm)
+
+def lstm_serving_model():
+    #an artifact older than the checkpoint was exported from previous weights
+    if os.getenv("LSTM_RUNTIME", "torchscript") == "eager":
+        return "lstm"
+    scripted = registry.checkpoint_version("lstm_scripted")
+    checkpoint = registry.checkpoint_version("lstm")
+    if scripted is None or (checkpoint is not None and scripted[0] < checkpoint[0]):
+        return "lstm"
+    return "lstm_scripted"
+
+#request path: forward passes on the resident model, training happens elsewhere
+def forecast_with_lstm(forecast_steps=10, log_path=LOG_PATH):
+    loaded = registry.get(lstm_serving_model())
+    if loaded is None:
+        return None
+    forecaster = loaded.model
+    demand, last_timestamp = recent_demand(log_path, forecaster.window_size)
+    return forecaster.forecast(demand, last_timestamp, forecast_steps)
@@ -1,6 +1,6 @@
 import random
 from datetime import datetime, timedelta
-from logger import init_log, log_result
+from logger import flush_log, init_log, log_result
 
 from InventoryDemandClassifier import InventoryDemandClassifier
 
@@ -145,7 +145,16 @@ data = [
 
 
 
+results = classifier.classify_batch(
+    [entry["total"] for entry in data],
+    [entry["current"] for entry in data],
+    [entry["demand"] for entry in data],
+    [entry["timestamp"] for entry in data]
+)
+
 for i, entry in enumerate(data):
-    result = classifier.classify(entry["timestamp"],entry["total"], entry["current"], entry["demand"])
+    result = {key: (values[i] if key in ("timestamp", "status") else float(values[i])) for key, values in results.items()}
     print(f"[{i+1}] {result}")
     log_result(entry["timestamp"],entry["total"], entry["current"], entry["demand"], result)
+
+flush_log()
@@ -0,0 +1,123 @@
+import copy
+import os
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, TensorDataset
+
+
+@dataclass
+class TrainingConfig:
+    epochs: int = 50
+    batch_size: int = 64
+    lr: float = 0.001
+    val_fraction: float = 0.2
+    patience: int = 5
+    min_delta: float = 1e-4
+    grad_clip: Optional[float] = None
+    num_threads: Optional[int] = None
+    interop_threads: Optional[int] = None
+    shuffle: bool = True
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, values: Optional[dict] = None):
+        values = values or {}
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in values.items() if key in known})
+
+    @classmethod
+    def from_env(cls, **overrides):
+        config = cls(
+            num_threads=int(os.getenv("TORCH_NUM_THREADS", "0")) or None,
+            interop_threads=int(os.getenv("TORCH_INTEROP_THREADS", "0")) or None
+        )
+        for key, value in overrides.items():
+            setattr(config, key, value)
+        return config
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def apply_thread_limits(config: TrainingConfig):
+    if config.num_threads:
+        torch.set_num_threads(config.num_threads)
+    if config.interop_threads and torch.get_num_interop_threads() != config.interop_threads:
+        try:
+            torch.set_num_interop_threads(config.interop_threads)
+        except RuntimeError:
+            #torch only allows this before the first parallel op in the process
+            print("Interop threads already fixed for this process; keeping the current value.")
+
+
+def validation_split(X, y, fraction, chronological=True):
+    count = int(len(X) * fraction)
+    if count < 1 or len(X) - count < 1:
+        return X, y, None, None
+    if chronological:
+        return X[:-count], y[:-count], X[-count:], y[-count:]
+    idx = torch.randperm(len(X))
+    return X[idx[count:]], y[idx[count:]], X[idx[:count]], y[idx[:count]]
+
+
+def fit_model(model, X, y, config: Optional[TrainingConfig] = None, X_val=None, y_val=None, chronological=True):
+    """
+    Mini-batch training with validation early stopping. When no validation set is
+    given the last `val_fraction` of the windows is held out. The best weights
+    seen on validation are restored before returning.
+    """
+    config = config or TrainingConfig()
+    apply_thread_limits(config)
+    if config.seed is not None:
+        torch.manual_seed(config.seed)
+    if X_val is None and config.val_fraction:
+        X, y, X_val, y_val = validation_split(X, y, config.val_fraction, chronological)
+
+    loader = DataLoader(TensorDataset(X, y), batch_size=config.batch_size, shuffle=config.shuffle)
+    optimizer = torch.optim.Adam(model.parameters(), lr=config.lr)
+    loss_fn = nn.MSELoss()
+
+    best_loss, best_state, bad_epochs = float("inf"), None, 0
+    train_loss, val_loss, epochs_run, stopped_early = None, None, 0, False
+    for epoch in range(config.epochs):
+        model.train()
+        total, seen = 0.0, 0
+        for X_batch, y_batch in loader:
+            loss = loss_fn(model(X_batch), y_batch)
+            optimizer.zero_grad()
+            loss.backward()
+            if config.grad_clip:
+                torch.nn.utils.clip_grad_norm_(model.parameters(), config.grad_clip)
+            optimizer.step()
+            total += loss.item() * len(X_batch)
+            seen += len(X_batch)
+        train_loss = total / max(seen, 1)
+        epochs_run = epoch + 1
+
+        if X_val is not None:
+            model.eval()
+            with torch.no_grad():
+                val_loss = loss_fn(model(X_val), y_val).item()
+            if val_loss < best_loss - config.min_delta:
+                best_loss, best_state, bad_epochs = val_loss, copy.deepcopy(model.state_dict()), 0
+            else:
+                bad_epochs += 1
+                if bad_epochs >= config.patience:
+                    stopped_early = True
+                    break
+
+        if epoch % 10 == 0:
+            print(f"Epoch {epoch}/{config.epochs}, Loss: {train_loss:.4f}" + (f", Val: {val_loss:.4f}" if val_loss is not None else ""))
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    model.eval()
+    return {
+        "epochs_run": epochs_run,
+        "train_loss": train_loss,
+        "val_loss": best_loss if best_state is not None else val_loss,
+        "stopped_early": stopped_early
+    }
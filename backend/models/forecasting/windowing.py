@@ -0,0 +1,42 @@
+import warnings
+
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_float32_matrix(data):
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    return data.reshape(-1, 1) if data.ndim == 1 else data
+
+
+def make_windows(data, window_size, target_column=0, horizon=1):
+    """
+    Builds (X, y) training pairs from a (time, features) array without copying:
+    X is a strided view of shape (n - window_size - horizon + 1, window_size,
+    features) over the same float32 buffer and y holds the next `horizon` values
+    of the target column for each window. The NumPy views are read-only
+    because neighbouring windows share memory, but torch can't enforce that, so
+    clone before writing to either tensor.
+    """
+    data = as_float32_matrix(data)
+    count = len(data) - window_size - horizon + 1
+    if count <= 0:
+        empty = torch.empty((0, window_size, data.shape[1]), dtype=torch.float32)
+        return empty, torch.empty((0, horizon), dtype=torch.float32)
+
+    #(n - w + 1, features, w) view, reordered to (windows, time, features) for batch_first LSTMs
+    views = sliding_window_view(data, window_size, axis=0).transpose(0, 2, 1)
+    targets = sliding_window_view(data[window_size:, target_column], horizon)
+    with warnings.catch_warnings():
+        #torch warns that it can't mark the tensors read-only; the views still are
+        warnings.filterwarnings("ignore", message="The given NumPy array is not writable")
+        X = torch.from_numpy(views[:count])
+        y = torch.from_numpy(targets)
+    return X, y
+
+
+def last_window(data, window_size):
+    """The most recent window as a (1, window_size, features) tensor for inference."""
+    data = as_float32_matrix(data)
+    return torch.from_numpy(data[-window_size:]).unsqueeze(0)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+#relocation statuses that still count as "in flight" for the source inventory
+OPEN_STATUSES = ("pending", "in_progress")
+
+
+class RelocationLedger:
+    """
+    Tracks the relocations already covering each source inventory's excess so the
+    breach monitor doesn't rerun the balancer (and insert another pending row)
+    every tick; only excess beyond the covered quantity is relocated again.
+    """
+
+    def __init__(self, tolerance: float = 0.1):
+        self.tolerance = tolerance
+        self.entries: Dict[int, dict] = {}
+        self.counters = {"evaluated": 0, "suppressed": 0, "recorded": 0, "released": 0}
+        self.suppressed_by_inventory: Dict[int, int] = defaultdict(int)
+
+    def covered(self, inventory_id: int) -> float:
+        entry = self.entries.get(inventory_id)
+        return entry["quantity"] if entry is not None else 0
+
+    def should_run(self, inventory_id: int, load: float, capacity: float) -> bool:
+        """Reruns only when the excess has grown past what open relocations already cover."""
+        self.counters["evaluated"] += 1
+        entry = self.entries.get(inventory_id)
+        if entry is None:
+            return True
+
+        if load - capacity <= entry["quantity"] * (1 + self.tolerance):
+            self.counters["suppressed"] += 1
+            self.suppressed_by_inventory[inventory_id] += 1
+            return False
+        return True
+
+    #a top-up relocation joins the source's entry, so the earlier ones stay tracked
+    def record(self, inventory_id: int, quantity: float, load: float, capacity: float, relocation_id: Optional[int] = None, to_inventory_id: Optional[int] = None):
+        entry = self.entries.setdefault(inventory_id, {"relocations": {}, "quantity": 0})
+        if relocation_id is not None:
+            entry["relocations"][relocation_id] = quantity
+        entry.update({
+            "to_inventory_id": to_inventory_id,
+            "quantity": entry["quantity"] + quantity,
+            "load": load,
+            "capacity": capacity,
+            "recorded_at": datetime.now().isoformat()
+        })
+        self.counters["recorded"] += 1
+
+    #a relocation id releases only its own share; an inventory id alone drops the whole entry
+    def release(self, inventory_id: Optional[int] = None, relocation_id: Optional[int] = None):
+        if relocation_id is not None:
+            candidates = [inventory_id] if inventory_id is not None else list(self.entries)
+            inventory_id = next((k for k in candidates if relocation_id in self.entries.get(k, {}).get("relocations", {})), None)
+            if inventory_id is None:
+                return
+            entry = self.entries[inventory_id]
+            entry["quantity"] -= entry["relocations"].pop(relocation_id)
+            if entry["relocations"]:
+                self.counters["released"] += 1
+                return
+        if inventory_id is not None and self.entries.pop(inventory_id, None) is not None:
+            self.counters["released"] += 1
+
+    #rebuild from the db so a freshly elected monitor doesn't duplicate open rows
+    def seed(self, relocations: list, inventories: list):
+        """Replaces the entries of every source with an open relocation; quantities sum only this call's rows."""
+        by_id = {inv["id"]: inv for inv in inventories}
+        seeded: Dict[int, dict] = {}
+        for relocation in relocations:
+            if relocation.get("status") not in OPEN_STATUSES:
+                continue
+            source_id = relocation.get("fromInventoryId")
+            inventory = by_id.get(source_id)
+            if inventory is None:
+                continue
+            entry = seeded.setdefault(source_id, {
+                "relocations": {},
+                "to_inventory_id": relocation.get("toInventoryId"),
+                "quantity": 0,
+                "load": inventory.get("volumeOccupied", 0),
+                "capacity": inventory.get("volumeAvailable", 0) - inventory.get("volumeReserved", 0),
+                "recorded_at": relocation.get("createdAt")
+            })
+            quantity = relocation.get("quantity", 0)
+            entry["quantity"] += quantity
+            entry["to_inventory_id"] = relocation.get("toInventoryId")
+            entry["recorded_at"] = relocation.get("createdAt")
+            if relocation.get("relocationMessageId") is not None:
+                entry["relocations"][relocation["relocationMessageId"]] = quantity
+        self.entries.update(seeded)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "in_flight": len(self.entries),
+            "suppressed_by_inventory": dict(self.suppressed_by_inventory),
+            "entries": {str(k): v for k, v in self.entries.items()}
+        }
@@ -0,0 +1,131 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Hashable, Iterable, Optional
+
+#stands in for a missing row id, so (timestamp, id) keys always compare
+NO_ID = -1
+
+
+class DemandWindow:
+    """
+    The newest `size` observations of one series in (timestamp, id) order, with
+    running sums over all but the newest, which is the baseline the newest is
+    compared against. Appends in order update the sums in O(1); a late row that
+    still falls inside the window is inserted in place and the sums are rebuilt
+    from the window, which is at most `size` values.
+    """
+
+    def __init__(self, size: int):
+        self.entries = deque(maxlen=size)
+        self.ids = set()
+        self.baseline_sum = 0.0
+        self.baseline_squares = 0.0
+        self.observations = 0
+
+    def add(self, key: tuple, demand: float) -> bool:
+        row_id = key[1]
+        if row_id != NO_ID and row_id in self.ids:
+            return False
+        entries = self.entries
+        if len(entries) == entries.maxlen and key < entries[0][0]:
+            #older than everything kept: it can no longer change the window
+            return False
+
+        if not entries or key >= entries[-1][0]:
+            if entries:
+                previous = entries[-1][1]
+                self.baseline_sum += previous
+                self.baseline_squares += previous * previous
+            if len(entries) == entries.maxlen:
+                self.forget(entries[0])
+                evicted = entries[0][1]
+                self.baseline_sum -= evicted
+                self.baseline_squares -= evicted * evicted
+            entries.append((key, demand))
+        else:
+            if len(entries) == entries.maxlen:
+                self.forget(entries.popleft())
+            position = next(i for i, (existing, _) in enumerate(entries) if key < existing)
+            entries.insert(position, (key, demand))
+            self.rebuild()
+
+        if row_id != NO_ID:
+            self.ids.add(row_id)
+        self.observations += 1
+        return True
+
+    def forget(self, entry):
+        row_id = entry[0][1]
+        if row_id != NO_ID:
+            self.ids.discard(row_id)
+
+    def rebuild(self):
+        baseline = [demand for _, demand in list(self.entries)[:-1]]
+        self.baseline_sum = float(sum(baseline))
+        self.baseline_squares = float(sum(demand * demand for demand in baseline))
+
+    def stats(self) -> dict:
+        count = len(self.entries)
+        if count < 2:
+            latest = self.entries[-1][1] if count else None
+            return {"latest": latest, "baseline": None, "variance": None, "zscore": None, "spike_pct": 0.0, "window": count, "observations": self.observations}
+
+        latest = self.entries[-1][1]
+        size = count - 1
+        baseline = self.baseline_sum / size
+        #sample variance of the baseline; clamped because running sums can drift a hair below zero
+        variance = max((self.baseline_squares - size * baseline * baseline) / (size - 1), 0.0) if size > 1 else 0.0
+        std = math.sqrt(variance)
+        return {
+            "latest": latest,
+            "baseline": baseline,
+            "variance": variance,
+            "zscore": (latest - baseline) / std if std > 0 else None,
+            #only rises count as spikes, and no baseline means no spike
+            "spike_pct": max(0.0, (latest - baseline) / baseline * 100) if baseline else 0.0,
+            "window": count,
+            "observations": self.observations
+        }
+
+
+class RollingDemandStats:
+    """
+    Rolling demand statistics per series (an inventory, or any hashable key),
+    kept up to date from each new demand_history row. The default window keeps
+    spike monitoring's rule: the newest row against the mean of the six before
+    it. Reads never touch history.
+    """
+
+    def __init__(self, window: int = 7):
+        self.window = window
+        self.series: Dict[Hashable, DemandWindow] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, key: Hashable, demand: float, timestamp=None, row_id: Optional[int] = None) -> bool:
+        """Adds one row; replays of a row still in the window and rows older than it are ignored."""
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = DemandWindow(self.window)
+            return series.add((str(timestamp or ""), NO_ID if row_id is None else row_id), float(demand or 0))
+
+    def observe_rows(self, rows: Iterable[dict], key=lambda row: row.get("inventoryId")) -> int:
+        applied = 0
+        for row in sorted(rows, key=lambda row: (str(row.get("timestamp") or ""), row.get("id") or 0)):
+            series_key = key(row)
+            if series_key is not None and self.observe(series_key, row.get("demandQuantity", 0), row.get("timestamp"), row.get("id")):
+                applied += 1
+        return applied
+
+    def stats(self, key: Hashable) -> Optional[dict]:
+        with self.lock:
+            series = self.series.get(key)
+            return None if series is None else series.stats()
+
+    def spike_pct(self, key: Hashable) -> float:
+        stats = self.stats(key)
+        return stats["spike_pct"] if stats else 0.0
+
+    def summary(self) -> dict:
+        return {"series": len(self.series), "window": self.window}
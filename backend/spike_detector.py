@@ -0,0 +1,103 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+MEAN, VARIANCE, COUNT, LAST_ID, QUIET_UNTIL = range(5)
+
+
+class SpikeDetector:
+    """
+    EWMA control limits per (inventory, item) over the demand_history stream.
+    Each series keeps an exponentially weighted mean and variance; an observation
+    at least `threshold` standard deviations and `min_pct` percent above the mean
+    is a spike, once the series has `warmup` observations behind it. A series
+    that just spiked stays quiet for `cooldown` seconds, so a sustained surge is
+    one spike row rather than one per order. Detected spikes queue in memory
+    until drain(); the queue is bounded and counts what it had to drop.
+    """
+
+    def __init__(self, alpha: float = 0.1, threshold: float = 3.0, min_pct: float = 25.0, warmup: int = 7, cooldown: float = 900.0, max_pending: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_pct = min_pct
+        self.warmup = warmup
+        self.cooldown = cooldown
+        self.clock = clock
+        self.series: Dict[Hashable, list] = {}
+        self.pending = deque(maxlen=max_pending)
+        self.lock = threading.Lock()
+        self.events = 0
+        self.detected = 0
+        self.dropped = 0
+
+    def observe(self, inventory_id: int, item_id: Optional[int], demand: float, timestamp=None, row_id: Optional[int] = None, emit: bool = True) -> Optional[dict]:
+        """Scores one demand row against its series, then folds it in. Returns the spike, if any."""
+        key = (inventory_id, item_id)
+        demand = float(demand or 0)
+        with self.lock:
+            state = self.series.get(key)
+            if state is None:
+                state = self.series[key] = [demand, 0.0, 0, -1, 0.0]
+            elif row_id is not None and row_id <= state[LAST_ID]:
+                return None
+            self.events += 1
+
+            spike = None
+            mean, variance, count = state[MEAN], state[VARIANCE], state[COUNT]
+            if emit and count >= self.warmup and variance > 0 and mean > 0:
+                deviation = demand - mean
+                if deviation > self.threshold * math.sqrt(variance) and deviation * 100 >= self.min_pct * mean:
+                    now = self.clock()
+                    if now >= state[QUIET_UNTIL]:
+                        state[QUIET_UNTIL] = now + self.cooldown
+                        spike = {
+                            "inventoryId": inventory_id,
+                            "itemId": item_id,
+                            "demandQuantity": demand,
+                            "baseline": mean,
+                            "zScore": deviation / math.sqrt(variance),
+                            "spikePct": deviation / mean * 100,
+                            "observedAt": timestamp
+                        }
+                        if len(self.pending) == self.pending.maxlen:
+                            self.dropped += 1
+                        self.pending.append(spike)
+                        self.detected += 1
+
+            #incremental EWMA mean and variance (West, 1979)
+            if count:
+                deviation = demand - mean
+                increment = self.alpha * deviation
+                state[MEAN] = mean + increment
+                state[VARIANCE] = (1 - self.alpha) * (variance + deviation * increment)
+            state[COUNT] = count + 1
+            if row_id is not None:
+                state[LAST_ID] = row_id
+            return spike
+
+    def observe_rows(self, rows: Iterable[dict], emit: bool = False) -> int:
+        """Replays demand_history rows in (timestamp, id) order; by default only to warm the series up."""
+        applied = 0
+        for row in sorted(rows, key=lambda row: (str(row.get("timestamp") or ""), row.get("id") or 0)):
+            if row.get("inventoryId") is None:
+                continue
+            before = self.events
+            self.observe(row["inventoryId"], row.get("itemId"), row.get("demandQuantity", 0), row.get("timestamp"), row.get("id"), emit=emit)
+            applied += self.events - before
+        return applied
+
+    def drain(self, limit: Optional[int] = None) -> List[dict]:
+        with self.lock:
+            count = len(self.pending) if limit is None else min(limit, len(self.pending))
+            return [self.pending.popleft() for _ in range(count)]
+
+    def requeue(self, spikes: List[dict]):
+        #a failed write goes back in front, oldest first; a full queue drops its newest entries
+        with self.lock:
+            self.dropped += max(len(self.pending) + len(spikes) - self.pending.maxlen, 0)
+            self.pending.extendleft(reversed(spikes))
+
+    def stats(self) -> dict:
+        return {"series": len(self.series), "events": self.events, "detected": self.detected, "pending": len(self.pending), "dropped": self.dropped}
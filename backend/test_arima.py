@@ -0,0 +1,71 @@
+import json
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from models.forecasting.arima import fit_and_forecast, fit_many, forecast_inventories_arima
+
+
+def demand_series(length=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 3, length))
+
+
+def hang(key, *args):
+    while True:
+        time.sleep(1)
+
+
+class TestArimaLibrary:
+    """Test ARIMA fitting as an importable library"""
+
+    def test_fit_and_forecast_has_no_side_effects(self, tmp_path, monkeypatch):
+        """Test fitting only returns values and writes nothing"""
+        monkeypatch.chdir(tmp_path)
+        result = fit_and_forecast(demand_series(), steps=4)
+        assert len(result["forecast"]) == 4
+        assert result["params"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_warm_start_from_previous_params(self):
+        """Test a refit can start from the previous parameters"""
+        series = demand_series()
+        cold = fit_and_forecast(series, steps=3)
+        warm = fit_and_forecast(np.append(series, series[-1] + 1), steps=3, start_params=cold["params"])
+        assert len(warm["forecast"]) == 3
+
+        mismatched = fit_and_forecast(series, steps=3, start_params=[0.1])
+        assert len(mismatched["forecast"]) == 3
+
+    def test_fit_many_runs_every_series(self):
+        """Test the batch driver fits each series in the pool"""
+        results = fit_many({"1": demand_series(seed=1), "2": demand_series(seed=2)}, steps=2, max_workers=2, timeout=120)
+        assert set(results) == {"1", "2"}
+        assert all(len(result["forecast"]) == 2 for result in results.values())
+
+    def test_fit_many_stops_fits_past_the_timeout(self):
+        """Test fits that never finish are reported as failed and their processes stopped"""
+        started = time.monotonic()
+        results = fit_many({"1": demand_series(seed=1), "2": demand_series(seed=2)}, max_workers=2, timeout=0.5, fit=hang)
+        assert time.monotonic() - started < 30
+        assert set(results) == {"1", "2"}
+        assert all("timed out" in result["error"] for result in results.values())
+        assert multiprocessing.active_children() == []
+
+    def test_inventory_driver_saves_params_for_next_run(self, tmp_path):
+        """Test per-inventory forecasts persist params to warm-start the next run"""
+        rows = [
+            {"inventoryId": inventory_id, "itemId": 1, "demandQuantity": int(value), "timestamp": f"2024-0{1 + day // 28}-{day % 28 + 1:02d}T00:00:00Z"}
+            for inventory_id in (1, 2)
+            for day, value in enumerate(demand_series(length=40, seed=inventory_id))
+        ]
+        params_path = tmp_path / "arima_params.json"
+        results = forecast_inventories_arima(rows, steps=3, params_path=str(params_path), max_workers=2, timeout=120)
+        assert set(results) == {"1", "2"}
+        assert len(results["1"]["forecast"]) == 3
+        assert isinstance(results["2"]["forecasted_demand"], int)
+        assert set(json.loads(params_path.read_text())) == {"1", "2"}
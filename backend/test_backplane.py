@@ -0,0 +1,176 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from backplane import (
+    ElectedSingleton,
+    InProcessBackplane,
+    RedisBackplane,
+    UnixSocketBackplane,
+    create_backplane,
+)
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def psubscribe(self, pattern):
+        self.server.subscribers.append((pattern.rstrip("*"), self.queue))
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        pass
+
+
+class FakeRedis:
+    """Local stand-in for the handful of redis commands the backplane uses"""
+
+    def __init__(self):
+        self.subscribers = []
+        self.keys = {}
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        for prefix, queue in self.subscribers:
+            if channel.startswith(prefix):
+                await queue.put({"type": "pmessage", "channel": channel, "data": data})
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    async def get(self, key):
+        return self.keys.get(key)
+
+    async def eval(self, script, numkeys, key, owner, lease_ms):
+        return 1 if self.keys.get(key) == owner else 0
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestBackplane:
+    """Test the cross-worker pub/sub backplanes"""
+
+    @pytest.mark.asyncio
+    async def test_in_process_delivers_to_subscribers(self):
+        """Test the in-process backplane fans out to local handlers"""
+        backplane = InProcessBackplane()
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        backplane.subscribe("ws", handler)
+        await backplane.publish("ws", {"text": "hello"})
+        assert received == [{"text": "hello"}]
+        assert await backplane.acquire_leadership("monitor")
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_reaches_every_worker(self):
+        """Test two unix socket workers both see events published by either"""
+        path = os.path.join(tempfile.mkdtemp(), "bp.sock")
+        workers = [UnixSocketBackplane(path), UnixSocketBackplane(path)]
+        received = [[], []]
+        for index, worker in enumerate(workers):
+            async def handler(message, index=index):
+                received[index].append(message["text"])
+            worker.subscribe("ws", handler)
+            await worker.start()
+
+        try:
+            await workers[1].publish("ws", {"text": "from second"})
+            await workers[0].publish("ws", {"text": "from first"})
+            await wait_for(lambda: all(len(r) == 2 for r in received))
+            assert sorted(received[0]) == sorted(received[1]) == ["from first", "from second"]
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_leadership_is_exclusive(self):
+        """Test only one worker holds a singleton lock at a time"""
+        path = os.path.join(tempfile.mkdtemp(), "bp.sock")
+        first, second = UnixSocketBackplane(path), UnixSocketBackplane(path)
+        assert await first.acquire_leadership("monitor")
+        assert not await second.acquire_leadership("monitor")
+        await first.release_leadership("monitor")
+        assert await second.acquire_leadership("monitor")
+        await second.release_leadership("monitor")
+
+    @pytest.mark.asyncio
+    async def test_redis_backplane_with_stand_in(self):
+        """Test the redis backplane against a local stand-in server"""
+        server = FakeRedis()
+        workers = [RedisBackplane(client=server), RedisBackplane(client=server)]
+        received = []
+
+        async def handler(message):
+            received.append(message["text"])
+
+        for worker in workers:
+            worker.subscribe("ws", handler)
+            await worker.start()
+
+        try:
+            await workers[0].publish("ws", {"text": "event"})
+            await wait_for(lambda: len(received) == 2)
+            assert await workers[0].acquire_leadership("scheduler")
+            assert not await workers[1].acquire_leadership("scheduler")
+            assert await workers[0].acquire_leadership("scheduler")
+        finally:
+            for worker in workers:
+                await worker.stop()
+        assert await workers[1].acquire_leadership("scheduler")
+
+    @pytest.mark.asyncio
+    async def test_elected_singleton_starts_once(self):
+        """Test only the elected worker starts the singleton"""
+        path = os.path.join(tempfile.mkdtemp(), "bp.sock")
+        started = []
+
+        async def start():
+            started.append(True)
+
+        async def stop():
+            started.pop()
+
+        singletons = [
+            ElectedSingleton(UnixSocketBackplane(path), "monitor", start, stop, interval=0.01)
+            for _ in range(3)
+        ]
+        tasks = [asyncio.create_task(s.run()) for s in singletons]
+        await asyncio.sleep(0.1)
+        assert len(started) == 1
+        assert sum(s.is_leader for s in singletons) == 1
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert started == []
+
+    def test_create_backplane_from_url(self):
+        """Test backplane selection from the configured url"""
+        assert isinstance(create_backplane("memory://"), InProcessBackplane)
+        assert isinstance(create_backplane("unix:///tmp/x.sock"), UnixSocketBackplane)
+        with pytest.raises(ValueError):
+            create_backplane("carrier-pigeon://")
@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+import pytest
+
+from models.forecasting.backtest import ClassifierTier, backtest_tier, main, origins, synthetic_series
+
+
+class TestBacktest:
+    """Test the rolling-origin tier backtests"""
+
+    def test_origins_leave_room_for_the_horizon(self):
+        """Test every fold has a full horizon of actuals"""
+        assert origins(100, 10, 4, 30) == [30, 50, 70, 90]
+        assert origins(35, 10, 4, 30) == []
+
+    def test_synthetic_series_is_reproducible(self):
+        """Test synthetic series are seeded and shaped like the log"""
+        first = synthetic_series(50, seed=3)
+        assert set(first) == {"total", "current", "demand"}
+        assert np.array_equal(first["demand"], synthetic_series(50, seed=3)["demand"])
+        assert (first["demand"] > 0).all()
+
+    def test_constant_series_has_no_error(self):
+        """Test a flat series is forecast exactly by the EWMA baseline"""
+        series = {"total": np.full(60, 1000.0), "current": np.full(60, 700.0), "demand": np.full(60, 300.0)}
+        result = backtest_tier(ClassifierTier(), series, horizon=5, folds=3)
+        assert result["folds"] == 3
+        assert result["rmse"] == pytest.approx(0, abs=1e-3)
+        assert result["mape"] == pytest.approx(0, abs=1e-3)
+        assert result["fit_ms"] >= 0 and result["peak_mb"] >= 0
+
+    def test_cli_writes_json_report(self, tmp_path, capsys):
+        """Test the report is machine-readable and names a best tier per series"""
+        pytest.importorskip("statsmodels")
+        output = tmp_path / "report.json"
+        main(["--synthetic", "80", "--tiers", "classifier,arima", "--folds", "2", "--horizon", "5", "--output", str(output)])
+        report = json.loads(output.read_text())
+        assert [row["tier"] for row in report["results"]] == ["classifier", "arima"]
+        assert report["best_tier"]["synthetic-80"] in ("classifier", "arima")
+        assert all(row["rows"] == 80 for row in report["results"])
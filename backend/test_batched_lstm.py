@@ -0,0 +1,60 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.forecasting.batched_lstm import BatchedLSTMForecaster, forecast_inventories
+from models.forecasting.series import build_daily_series
+
+
+def demand_rows(inventories=3, days=30):
+    rows = []
+    for inventory_id in range(1, inventories + 1):
+        for day in range(days):
+            rows.append({
+                "id": len(rows) + 1,
+                "inventoryId": inventory_id,
+                "itemId": day % 2 + 1,
+                "demandQuantity": inventory_id * 10 + day,
+                "timestamp": f"2024-01-{day + 1:02d}T10:00:00.000Z"
+            })
+    return rows
+
+
+class TestBatchedLSTM:
+    """Test batched multi-series LSTM forecasting"""
+
+    def test_series_share_one_calendar(self):
+        """Test every series is aligned so they can be stacked"""
+        rows = demand_rows(inventories=2, days=5)
+        rows.append({"inventoryId": 3, "itemId": 1, "demandQuantity": 7, "timestamp": "2024-01-03T08:00:00Z"})
+        series, last_day = build_daily_series(rows)
+        assert {len(values) for values in series.values()} == {5}
+        assert series["3"].tolist() == [0, 0, 7, 0, 0]
+        assert last_day.isoformat() == "2024-01-05"
+
+        pairs, _ = build_daily_series(rows, by="inventory_item")
+        assert "1:1" in pairs and "1:2" in pairs
+
+    def test_inference_is_one_batched_pass_per_step(self):
+        """Test all series go through the model together"""
+        series, _ = build_daily_series(demand_rows())
+        forecaster = BatchedLSTMForecaster(window_size=7)
+        batch_sizes = []
+        forecaster.model.register_forward_hook(lambda module, inputs, output: batch_sizes.append(inputs[0].shape[0]))
+
+        result = forecaster.forecast(series, steps=4)
+        assert batch_sizes == [3, 3, 3, 3]
+        assert set(result) == {"1", "2", "3"}
+        assert all(len(values) == 4 and min(values) >= 0 for values in result.values())
+
+    def test_forecast_inventories_warm_starts(self, tmp_path):
+        """Test the driver trains, checkpoints and publishes per-inventory demand"""
+        model_path = str(tmp_path / "batched_lstm.pt")
+        result = forecast_inventories(demand_rows(), steps=7, epochs=2, window_size=7, model_path=model_path)
+        assert set(result) == {"1", "2", "3"}
+        assert len(result["1"]["forecast"]) == 7
+        assert result["1"]["forecast"][0]["date"] == "2024-01-31"
+        assert isinstance(result["2"]["forecasted_demand"], int)
+
+        assert BatchedLSTMForecaster.load(model_path).window_size == 7
+        assert forecast_inventories([], model_path=model_path) == {}
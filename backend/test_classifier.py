@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+
+METRICS = ("demand_pct", "inventory_pct", "risk_ratio", "avg_demand_pct", "avg_inventory_pct", "avg_risk_ratio")
+
+
+class TestClassifyBatch:
+    """Test the vectorized classifier against the scalar path"""
+
+    def test_matches_scalar_classification(self):
+        """Test every status and rounded metric equals the row-by-row result"""
+        rng = np.random.default_rng(7)
+        total = rng.integers(0, 1200, 5000)
+        total[total < 20] = 0
+        current = rng.integers(0, 1000, 5000)
+        demand = rng.integers(0, 700, 5000)
+
+        scalar = InventoryDemandClassifier()
+        expected = [scalar.classify(i, int(t), int(c), int(d)) for i, (t, c, d) in enumerate(zip(total, current, demand))]
+        batch = InventoryDemandClassifier()
+        result = batch.classify_batch(total, current, demand, timestamp=range(5000))
+
+        for i, row in enumerate(expected):
+            if row == "Invalid":
+                assert result["status"][i] == "Invalid"
+                assert np.isnan(result["demand_pct"][i])
+                continue
+            assert result["status"][i] == row["status"]
+            assert result["timestamp"][i] == row["timestamp"]
+            assert all(result[key][i] == row[key] for key in METRICS)
+        assert (batch.avg_demand_pct, batch.avg_inventory_pct, batch.avg_risk_ratio) == (scalar.avg_demand_pct, scalar.avg_inventory_pct, scalar.avg_risk_ratio)
+
+    def test_state_carries_between_calls(self):
+        """Test batches continue from the averages left by earlier calls"""
+        whole = InventoryDemandClassifier()
+        whole.classify_batch([1000] * 6, [800, 700, 600, 500, 400, 300], [100, 150, 200, 250, 300, 350])
+        split = InventoryDemandClassifier()
+        split.classify_batch([1000] * 2, [800, 700], [100, 150])
+        split.classify(None, 1000, 600, 200)
+        split.classify_batch([1000] * 3, [500, 400, 300], [250, 300, 350])
+        assert split.avg_risk_ratio == pytest.approx(whole.avg_risk_ratio, abs=1e-15)
+
+    def test_empty_and_invalid_batches_leave_state_alone(self):
+        """Test batches with no valid rows do not move the averages"""
+        classifier = InventoryDemandClassifier()
+        assert len(classifier.classify_batch([], [], [])["status"]) == 0
+        assert classifier.classify_batch([0, 100], [10, 0], [1, 1])["status"].tolist() == ["Invalid", "Invalid"]
+        assert classifier.avg_demand_pct == 0.3
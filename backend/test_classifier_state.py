@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("scipy")
+
+from classifier_state import ClassifierState, inventory_capacity
+from models.forecasting.InventoryDemandClassifier import InventoryDemandClassifier
+
+INVENTORY = {"id": 7, "volumeOccupied": 600, "volumeAvailable": 300, "volumeReserved": 100}
+
+
+def demand_rows(inventory_id, demands, start_id=1):
+    return [
+        {"id": start_id + i, "inventoryId": inventory_id, "demandQuantity": demand, "timestamp": f"2024-01-{i + 1:02d}T00:00:00Z"}
+        for i, demand in enumerate(demands)
+    ]
+
+
+class TestClassifierState:
+    """Test the per-inventory streaming classifier state"""
+
+    def test_observe_matches_a_dedicated_classifier(self):
+        """Test each inventory evolves exactly like its own classifier instance"""
+        state = ClassifierState(path=None)
+        state.update_capacities([INVENTORY, {**INVENTORY, "id": 8, "volumeOccupied": 100}])
+        reference = InventoryDemandClassifier()
+        for row_id, demand in enumerate([100, 250, 400, 700], start=1):
+            state.observe(7, demand, row_id)
+            state.observe(8, 50, row_id)
+            expected = reference.classify(None, *inventory_capacity(INVENTORY), demand)
+
+        status = state.status(7)
+        assert status["status"] == expected["status"]
+        assert status["avg_risk_ratio"] == expected["avg_risk_ratio"]
+        assert status["observations"] == 4
+        assert state.status(8)["observations"] == 4
+        assert state.status(99) is None
+
+    def test_replayed_rows_are_ignored(self):
+        """Test reconciliation does not double count rows already streamed"""
+        state = ClassifierState(path=None)
+        state.update_capacities([INVENTORY])
+        rows = demand_rows(7, [100, 200, 300])
+        state.observe(7, 100, 1)
+        assert state.observe(7, 100, 1) is None
+        assert state.observe_rows(rows) == 2
+        assert state.observe_rows(rows) == 0
+        assert state.status(7)["observations"] == 3
+
+    def test_batch_backfill_equals_streaming(self):
+        """Test observe_rows leaves the same state as one observe per row"""
+        demands = [120, 80, 500, 30, 650, 200]
+        streamed = ClassifierState(path=None)
+        streamed.update_capacities([INVENTORY])
+        for row in demand_rows(7, demands):
+            streamed.observe(7, row["demandQuantity"], row["id"])
+        batched = ClassifierState(path=None)
+        batched.update_capacities([INVENTORY])
+        batched.observe_rows(list(reversed(demand_rows(7, demands))))
+        assert batched.status(7) | {"updated_at": None} == streamed.status(7) | {"updated_at": None}
+
+    def test_slots_grow_and_checkpoint_round_trips(self, tmp_path):
+        """Test state survives a restart, including grown arrays"""
+        path = str(tmp_path / "state.npz")
+        state = ClassifierState(path=path, initial_slots=2)
+        for inventory_id in range(1, 6):
+            state.set_capacity(inventory_id, 1000, 500)
+            state.observe(inventory_id, inventory_id * 100, 10)
+        assert state.save()
+        assert not state.save()
+
+        restored = ClassifierState(path=path, initial_slots=2)
+        assert restored.stats()["inventories"] == 5
+        assert restored.status(5) == state.status(5)
+        assert restored.observe(5, 100, 10) is None
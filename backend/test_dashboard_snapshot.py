@@ -0,0 +1,56 @@
+import pytest
+
+from dashboard_snapshot import DashboardSnapshot
+
+
+class TestDashboardSnapshot:
+    """Test the stale-while-revalidate dashboard snapshot"""
+
+    def setup_method(self):
+        self.calls = 0
+
+    async def compute(self):
+        self.calls += 1
+        return {"overview": {"total_inventories": self.calls}}
+
+    @pytest.mark.asyncio
+    async def test_first_read_computes_then_serves_from_memory(self):
+        """Test only the cold read pays for the computation"""
+        snapshot = DashboardSnapshot(self.compute, max_age=60)
+        first = await snapshot.get()
+        second = await snapshot.get()
+        assert first is second
+        assert self.calls == 1
+        assert snapshot.freshness()["stale"] is False
+
+    @pytest.mark.asyncio
+    async def test_stale_read_returns_old_value_and_revalidates(self):
+        """Test an expired snapshot is served while a refresh runs"""
+        snapshot = DashboardSnapshot(self.compute, max_age=60)
+        await snapshot.get()
+        snapshot.generated_at -= 120
+
+        stale = await snapshot.get()
+        assert stale["overview"]["total_inventories"] == 1
+        await snapshot.refresh_task
+        assert (await snapshot.get())["overview"]["total_inventories"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_marks_stale_until_refreshed(self):
+        """Test writes flag the snapshot until the next refresh"""
+        snapshot = DashboardSnapshot(self.compute, max_age=60)
+        await snapshot.get()
+        snapshot.invalidate()
+        assert snapshot.freshness()["stale"] is True
+
+        await snapshot.refresh()
+        assert self.calls == 2
+        assert snapshot.freshness()["stale"] is False
+
+    @pytest.mark.asyncio
+    async def test_apply_ignores_older_snapshots(self):
+        """Test snapshots from other workers never roll the value back"""
+        snapshot = DashboardSnapshot(self.compute, max_age=60)
+        await snapshot.get()
+        snapshot.apply({"value": {"old": True}, "started_at": 0, "generated_at": 1})
+        assert "old" not in snapshot.value
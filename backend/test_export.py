@@ -0,0 +1,47 @@
+import csv
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.forecasting.export import export_lstm
+from models.forecasting.incremental_lstm import load_scripted_forecaster, read_recent_demand, train_incremental_lstm
+
+
+class TestLSTMExport:
+    """Test the TorchScript export and serving path"""
+
+    @pytest.fixture
+    def trained(self, tmp_path):
+        log_path = str(tmp_path / "inventory_log.csv")
+        model_path = str(tmp_path / "lstm_model.pt")
+        with open(log_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "demand"])
+            for day in range(60):
+                writer.writerow([f"2024-{day // 28 + 1:02d}-{day % 28 + 1:02d}T00:00:00", 100 + day % 7 * 5])
+        assert train_incremental_lstm(epochs=2, window_size=5, log_path=log_path, model_path=model_path, horizon=3)
+        return log_path, model_path, str(tmp_path / "lstm_model.ts")
+
+    def test_float_export_matches_checkpoint(self, trained):
+        """Test an unquantized artifact reproduces the float model"""
+        log_path, model_path, artifact_path = trained
+        report = export_lstm(model_path, artifact_path, quantize=False, log_path=log_path)
+        assert report["accuracy"]["max_abs_vs_float"] < 1e-3
+        assert os.path.exists(artifact_path)
+
+    def test_quantized_artifact_serves_forecasts(self, trained):
+        """Test the int8 artifact loads without model classes and reports its accuracy delta"""
+        log_path, model_path, artifact_path = trained
+        report = export_lstm(model_path, artifact_path, quantize=True, log_path=log_path)
+        assert report["quantized"] is True
+        assert report["accuracy"]["windows"] > 0
+        assert report["artifact_bytes"] < report["checkpoint_bytes"]
+
+        forecaster = load_scripted_forecaster(artifact_path)
+        assert isinstance(forecaster.model, torch.jit.ScriptModule)
+        recent, last_timestamp = read_recent_demand(log_path, forecaster.window_size)
+        forecast = forecaster.forecast(recent, last_timestamp, forecast_steps=5)
+        assert len(forecast) == 5
+        assert forecast[0]["timestamp"] == "2024-03-05"
@@ -0,0 +1,80 @@
+from models.forecasting.forecast_cache import ForecastCache, data_version
+
+
+class TestForecastCache:
+    """Test the data-versioned forecast cache"""
+
+    def setup_method(self):
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {"forecast": self.calls}
+
+    def write_log(self, path, rows):
+        with open(path, "w") as f:
+            f.write("timestamp,demand\n")
+            for i in range(rows):
+                f.write(f"2024-01-01T00:00:{i:02d},{i}\n")
+
+    def test_same_version_is_served_from_cache(self, tmp_path):
+        """Test repeated forecasts on unchanged data compute once"""
+        log = tmp_path / "inventory_log.csv"
+        self.write_log(log, 3)
+        cache = ForecastCache(path=None)
+
+        first = cache.get_or_compute("arima.py", str(log), self.compute, horizon={"forecast_steps": 5})
+        second = cache.get_or_compute("arima.py", str(log), self.compute, horizon={"forecast_steps": 5})
+        assert first == second
+        assert self.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_horizon_and_model_are_part_of_key(self, tmp_path):
+        """Test different models or horizons never share results"""
+        log = tmp_path / "inventory_log.csv"
+        self.write_log(log, 3)
+        cache = ForecastCache(path=None)
+
+        cache.get_or_compute("arima.py", str(log), self.compute, horizon={"forecast_steps": 5})
+        cache.get_or_compute("arima.py", str(log), self.compute, horizon={"forecast_steps": 10})
+        cache.get_or_compute("lstm_forecast.py", str(log), self.compute, horizon={"forecast_steps": 5})
+        assert self.calls == 3
+
+    def test_append_invalidates(self, tmp_path):
+        """Test new log rows change the version and prune old entries"""
+        log = tmp_path / "inventory_log.csv"
+        self.write_log(log, 3)
+        cache = ForecastCache(path=None)
+        cache.get_or_compute("arima.py", str(log), self.compute)
+        assert cache.row_count(str(log)) == 3
+
+        with open(log, "a") as f:
+            f.write("2024-01-02T00:00:00,9\n")
+        assert cache.get("arima.py", data_version(str(log))) is None
+        cache.get_or_compute("arima.py", str(log), self.compute)
+        assert self.calls == 2
+        assert len(cache.entries) == 1
+        assert cache.row_count(str(log)) == 4
+
+    def test_bounded_and_uncacheable_results(self, tmp_path):
+        """Test the cache evicts oldest entries and skips failed results"""
+        log = tmp_path / "inventory_log.csv"
+        self.write_log(log, 3)
+        cache = ForecastCache(path=None, max_entries=2)
+        for steps in range(4):
+            cache.get_or_compute("arima.py", str(log), self.compute, horizon={"forecast_steps": steps})
+        assert len(cache.entries) == 2
+
+        cache.get_or_compute("broken", str(log), lambda: {"error": "boom"}, cacheable=lambda result: "error" not in result)
+        assert len(cache.entries) == 2
+
+    def test_persisted_cache_starts_warm(self, tmp_path):
+        """Test a new cache instance reloads entries from disk"""
+        log = tmp_path / "inventory_log.csv"
+        self.write_log(log, 3)
+        path = str(tmp_path / "forecast_cache.json")
+        ForecastCache(path=path).get_or_compute("arima.py", str(log), self.compute)
+
+        restarted = ForecastCache(path=path)
+        assert restarted.get_or_compute("arima.py", str(log), self.compute) == {"forecast": 1}
+        assert self.calls == 1
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import forecast_jobs
+import forecast_router
+from forecast_jobs import ForecastJobQueue, QueueFullError
+
+release = threading.Event()
+
+
+def slow_task(params, payload=None):
+    release.wait(5)
+    return {"echo": params}
+
+
+def failing_task(params, payload=None):
+    raise RuntimeError("fit did not converge")
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    log = tmp_path / "inventory_log.csv"
+    log.write_text("timestamp,demand\n2024-01-01T00:00:00,10\n")
+    monkeypatch.setitem(forecast_jobs.TASKS, "slow", slow_task)
+    monkeypatch.setitem(forecast_jobs.TASKS, "failing", failing_task)
+    release.clear()
+    return ForecastJobQueue(max_pending=2, log_path=str(log), executor=ThreadPoolExecutor(max_workers=1))
+
+
+class TestForecastJobQueue:
+    """Test the forecast/training job queue"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_to_completion(self, queue):
+        """Test a submitted job reports its result once finished"""
+        job, deduplicated = queue.submit("slow", {"steps": 5})
+        assert deduplicated is False
+        assert queue.get(job.id).status in ("queued", "running")
+
+        release.set()
+        await queue.wait(job)
+        assert job.status == "succeeded"
+        assert job.to_dict()["result"] == {"echo": {"steps": 5}}
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_same_data_version_is_deduplicated(self, queue, tmp_path):
+        """Test resubmitting against an unchanged log returns the same job"""
+        first, _ = queue.submit("slow", {"steps": 5})
+        second, deduplicated = queue.submit("slow", {"steps": 5})
+        assert deduplicated is True
+        assert second is first
+
+        with open(tmp_path / "inventory_log.csv", "a") as f:
+            f.write("2024-01-02T00:00:00,12\n")
+        third, deduplicated = queue.submit("slow", {"steps": 5})
+        assert deduplicated is False
+        assert third is not first
+
+        release.set()
+        await asyncio.gather(queue.wait(first), queue.wait(third))
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_jobs_can_be_resubmitted(self, queue):
+        """Test failures are recorded and do not block a retry"""
+        job, _ = queue.submit("failing")
+        await queue.wait(job)
+        assert job.status == "failed"
+        assert job.error == "fit did not converge"
+
+        retry, deduplicated = queue.submit("failing")
+        assert deduplicated is False
+        await queue.wait(retry)
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded(self, queue):
+        """Test submissions beyond the pending limit are rejected"""
+        queue.submit("slow", {"steps": 1})
+        queue.submit("slow", {"steps": 2})
+        with pytest.raises(QueueFullError):
+            queue.submit("slow", {"steps": 3})
+        with pytest.raises(ValueError):
+            queue.submit("unknown")
+
+        release.set()
+        await queue.shutdown()
+
+
+class TestForecastRoute:
+    """Test /forecast hands cache misses to the job queue"""
+
+    def test_cache_miss_returns_a_job(self, queue, tmp_path, monkeypatch):
+        """Test a miss is queued and polled instead of fitted in the request"""
+        monkeypatch.setitem(forecast_jobs.TASKS, "forecast", slow_task)
+        monkeypatch.setattr(forecast_router, "LOG_FILE", str(tmp_path / "inventory_log.csv"))
+        app = FastAPI()
+        app.include_router(forecast_router.router)
+        app.state.forecast_jobs = queue
+
+        with TestClient(app) as client:
+            response = client.get("/forecast")
+            assert response.status_code == 202
+            body = response.json()
+            assert body["kind"] == "forecast" and body["deduplicated"] is False
+            assert body["model_used"] == "InventoryDemandClassifier.py"
+            assert client.get("/forecast").json()["job_id"] == body["job_id"]
+
+            release.set()
+            deadline = time.monotonic() + 5
+            while queue.get(body["job_id"]).status != "succeeded" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert queue.get(body["job_id"]).status == "succeeded"
+
+    def test_missing_queue_is_unavailable(self):
+        """Test the route refuses rather than fitting when no queue is running"""
+        app = FastAPI()
+        app.include_router(forecast_router.router)
+        assert TestClient(app).get("/forecast").status_code == 503
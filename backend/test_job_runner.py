@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from job_runner import AsyncJobRunner, Job
+
+
+async def noop():
+    pass
+
+
+class TestJob:
+    """Test job scheduling rules"""
+
+    def test_needs_exactly_one_schedule(self):
+        """Test a job is either interval based or daily"""
+        with pytest.raises(ValueError):
+            Job("broken", noop)
+        with pytest.raises(ValueError):
+            Job("broken", noop, interval=5, daily_at="02:00")
+
+    def test_daily_delay_rolls_over_to_tomorrow(self):
+        """Test a daily job that already ran today waits until tomorrow"""
+        job = Job("nightly", noop, daily_at="02:00")
+        assert job.next_delay(datetime(2024, 1, 1, 1, 0)) == 3600
+        assert job.next_delay(datetime(2024, 1, 1, 3, 0)) == 23 * 3600
+
+    def test_jitter_only_delays(self):
+        """Test jitter is added on top of the interval"""
+        job = Job("jittery", noop, interval=10, jitter=2)
+        for _ in range(20):
+            assert 10 <= job.next_delay() <= 12
+
+
+class TestAsyncJobRunner:
+    """Test the asyncio job runner"""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_ticks_are_skipped(self):
+        """Test a slow job never runs twice at once"""
+        runner = AsyncJobRunner()
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+
+        runner.add_job("slow", slow, interval=0.01, run_on_start=True)
+        runner.start()
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.sleep(0)
+        await runner.stop()
+
+        stats = runner.stats()["slow"]
+        assert stats["runs"] >= 1
+        assert stats["skipped_overlaps"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_durations_and_failures_are_recorded(self):
+        """Test each run records its duration and errors are counted"""
+        runner = AsyncJobRunner()
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        runner.add_job("failing", failing, interval=60, run_on_start=True)
+        runner.start()
+        await asyncio.sleep(0.01)
+        await runner.stop()
+
+        stats = runner.stats()["failing"]
+        assert stats["runs"] == 1
+        assert stats["failures"] == 1
+        assert stats["last_error"] == "boom"
+        assert stats["last_duration_ms"] is not None
+        assert stats["avg_duration_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_leader_jobs_start_separately(self):
+        """Test leader-only jobs stay idle until leadership is won"""
+        runner = AsyncJobRunner()
+        calls = []
+
+        async def tick():
+            calls.append(1)
+
+        runner.add_job("worker", noop, interval=60)
+        runner.add_job("leader", tick, interval=60, leader_only=True)
+        runner.start()
+        assert runner.is_active("worker")
+        assert not runner.is_active("leader")
+        assert runner.trigger("leader") is False
+
+        runner.start(leader_only=True)
+        assert runner.trigger("leader") is True
+        await asyncio.sleep(0)
+        assert calls == [1]
+
+        await runner.stop(leader_only=True)
+        assert not runner.is_active("leader")
+        assert runner.is_active("worker")
+        await runner.stop()
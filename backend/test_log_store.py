@@ -0,0 +1,104 @@
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.forecasting.log_store import LogStore, data_version, get_store, read_columns, read_frame, recent_demand, row_count
+
+
+def append_rows(path, worker, count):
+    store = LogStore(path)
+    for i in range(count):
+        store.append([[f"2024-03-{worker + 1:02d}T00:{i // 60:02d}:{i % 60:02d}", 1000, 800, worker]])
+    return count
+
+
+class TestLogStore:
+    """Test the indexed append-only demand log"""
+
+    def test_reads_are_in_timestamp_order(self, tmp_path):
+        """Test out-of-order appends come back sorted, with a maintained count"""
+        store = LogStore(str(tmp_path / "log.db"))
+        store.append([["2024-01-05T00:00:00", 1000, 800, 50], ["2024-01-01T00:00:00", 1000, 900, 10]])
+        store.append([{"timestamp": "2024-01-03T00:00:00", "total": 1000, "current": 850, "demand": 30}])
+        assert store.count() == 3
+        assert [row[0] for row in store.read(("demand",))] == [10, 30, 50]
+        assert store.tail(2, ("demand",)) == [(30,), (50,)]
+        assert store.read(("demand",), start="2024-01-02", end="2024-01-05") == [(30,)]
+
+    def test_version_changes_on_append(self, tmp_path):
+        """Test cached forecasts are keyed on the store's contents"""
+        path = str(tmp_path / "log.db")
+        get_store(path)
+        before = data_version(path)
+        get_store(path).append([["2024-01-01T00:00:00", 1000, 800, 50]])
+        assert data_version(path) != before
+        assert row_count(path) == 1
+
+    def test_migrates_legacy_csv_once(self, tmp_path):
+        """Test a new store imports the CSV beside it exactly once"""
+        with open(tmp_path / "log.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "total", "current", "demand", "status"])
+            writer.writerow(["2024-01-02T00:00:00", 1000, 850, 120, "Normal"])
+            writer.writerow(["2024-01-01T00:00:00", 1000, 800, 100, "Normal"])
+        path = str(tmp_path / "log.db")
+        store = get_store(path)
+        assert store.count() == 2
+        assert store.migrate_csv(str(tmp_path / "log.csv")) == 0
+
+        df = read_frame(path, ("timestamp", "demand"))
+        assert df["demand"].tolist() == [100.0, 120.0]
+        assert recent_demand(path, 1) == ([120.0], "2024-01-02T00:00:00")
+
+    def test_concurrent_appends_from_processes(self, tmp_path):
+        """Test writers in separate processes never lose or interleave rows"""
+        path = str(tmp_path / "log.db")
+        LogStore(path)
+        with ProcessPoolExecutor(max_workers=4, mp_context=multiprocessing.get_context("spawn")) as pool:
+            written = sum(pool.map(append_rows, [path] * 4, range(4), [100] * 4))
+        store = LogStore(path)
+        assert store.count() == written == 400
+        assert len(store.read(("demand",))) == 400
+
+
+class TestColumnReads:
+    """Test compact, column-selected reads of the demand log"""
+
+    def rows(self, count):
+        #appended newest-first so every read has to reorder
+        return [[f"2024-01-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}", 1000, 800, i, None, None, None, None, None, None, "Normal"] for i in reversed(range(count))]
+
+    def test_store_reads_stream_into_compact_arrays(self, tmp_path):
+        """Test chunked reads fill float32/datetime64 arrays in time order"""
+        path = str(tmp_path / "log.db")
+        get_store(path).append(self.rows(50))
+        arrays = read_columns(path, ("timestamp", "demand"), chunk_size=7)
+        assert arrays["demand"].dtype == np.float32
+        assert arrays["timestamp"].dtype == np.dtype("datetime64[s]")
+        assert arrays["demand"].tolist() == list(range(50))
+        assert read_columns(path, ("demand",), tail=3, chunk_size=2)["demand"].tolist() == [47, 48, 49]
+        #appended newest-first, so append order runs against time order
+        assert read_columns(path, ("seq",), tail=3)["seq"].tolist() == [3, 2, 1]
+
+    def test_csv_reads_match_the_store(self, tmp_path):
+        """Test a legacy CSV gives the same sorted, compact columns"""
+        csv_path = tmp_path / "log.csv"
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "total", "current", "demand", "demand_pct", "inventory_pct", "risk_ratio", "avg_demand_pct", "avg_inventory_pct", "avg_risk_ratio", "status"])
+            writer.writerows(self.rows(20))
+        arrays = read_columns(str(csv_path), ("timestamp", "demand"), tail=5, chunk_size=6)
+        assert arrays["demand"].tolist() == [15, 16, 17, 18, 19]
+        assert read_columns(str(csv_path), ("seq",), tail=2)["seq"].tolist() == [2, 1]
+        assert arrays["demand"].dtype == np.float32
+
+    def test_frame_keeps_only_requested_columns(self, tmp_path):
+        """Test the DataFrame view carries just the columns asked for"""
+        path = str(tmp_path / "log.db")
+        get_store(path).append(self.rows(4))
+        df = read_frame(path, ("timestamp", "current", "status"))
+        assert list(df.columns) == ["timestamp", "current", "status"]
+        assert df["status"].tolist() == ["Normal"] * 4
+        assert len(read_frame(str(tmp_path / "empty.db"), ("demand",))) == 0
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from models.forecasting.log_store import LogStore
+from models.forecasting.log_writer import LogWriter
+
+
+def row(i, demand=50):
+    return [f"2024-01-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}", 1000, 800, demand]
+
+
+class TestLogWriter:
+    """Test the buffered batch writer for the demand log"""
+
+    def test_batches_rows_until_size_or_close(self, tmp_path):
+        """Test rows are held back until a full batch, and close writes the rest"""
+        store = LogStore(str(tmp_path / "log.db"))
+        writer = LogWriter(store, batch_size=100, flush_seconds=60, fsync_seconds=0)
+        for i in range(10):
+            writer.write(row(i))
+        assert store.count() == 0
+
+        writer.extend(row(i) for i in range(10, 100))
+        deadline = time.monotonic() + 5
+        while store.count() < 100 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.count() == 100
+
+        writer.write(row(100))
+        writer.close()
+        assert store.count() == 101
+        assert writer.stats()["syncs"] >= 1
+
+    def test_flushes_on_timer(self, tmp_path):
+        """Test a partial batch is written after flush_seconds"""
+        store = LogStore(str(tmp_path / "log.db"))
+        writer = LogWriter(store, batch_size=1000, flush_seconds=0.05, fsync_seconds=None)
+        writer.write(row(0))
+        deadline = time.monotonic() + 5
+        while store.count() == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.count() == 1
+        writer.close()
+        assert writer.stats()["syncs"] == 0
+
+    def test_concurrent_writers_lose_nothing(self, tmp_path):
+        """Test rows from many threads all land, each one whole"""
+        store = LogStore(str(tmp_path / "log.db"))
+        writer = LogWriter(store, batch_size=64, flush_seconds=0.01)
+
+        def produce(worker):
+            for i in range(500):
+                writer.write(row(i, demand=worker))
+
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        assert store.count() == 4000
+        demands = [demand for (demand,) in store.read(("demand",))]
+        assert sorted(set(demands)) == list(range(8))
+        assert all(demands.count(worker) == 500 for worker in range(8))
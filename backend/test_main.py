@@ -1,7 +1,7 @@
 import pytest
 import json
 from fastapi.testclient import TestClient
-from main import app
+from main import app, find_nearby_locations_with_capacity, locations_with_capacity
 
 client = TestClient(app)
 
@@ -345,6 +345,22 @@ class TestUtilityFunctions:
         response = client.post("/api/items", json=incomplete_data)
         assert response.status_code in [400, 422, 500]
 
+    def test_nearby_locations_from_fetched_rows(self):
+        """Test nearby capacity is worked out from rows already fetched"""
+        locations = [
+            {"id": 1, "city": "Pune", "state": "MH"},
+            {"id": 2, "city": "Mumbai", "state": "MH"},
+            {"id": 3, "city": "Nagpur", "state": "MH"},
+            {"id": 4, "city": "Delhi", "state": "DL"}
+        ]
+        inventories = [
+            {"locationId": 2, "volumeOccupied": 90, "volumeAvailable": 10},
+            {"locationId": 3, "volumeOccupied": 20, "volumeAvailable": 80},
+            {"locationId": 4, "volumeOccupied": 10, "volumeAvailable": 90}
+        ]
+        capacity = locations_with_capacity(inventories)
+        assert find_nearby_locations_with_capacity(locations[0], locations, capacity) == [locations[2]]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from metric_rollups import MetricRollups, bucket_start
+
+
+class TestMetricRollups:
+    """Test incremental dashboard metric rollups"""
+
+    def setup_method(self):
+        self.written = []
+        self.fail_writes = False
+
+    async def write_rows(self, rows):
+        if self.fail_writes:
+            return False
+        self.written.extend(rows)
+        return True
+
+    def test_bucket_start(self):
+        """Test hourly, daily and weekly bucket alignment"""
+        at = datetime(2024, 3, 14, 15, 42, 7, tzinfo=timezone.utc)  # a thursday
+        assert bucket_start(at, "hourly") == datetime(2024, 3, 14, 15, tzinfo=timezone.utc)
+        assert bucket_start(at, "daily") == datetime(2024, 3, 14, tzinfo=timezone.utc)
+        assert bucket_start(at, "weekly") == datetime(2024, 3, 11, tzinfo=timezone.utc)
+
+    def test_record_coalesces_per_bucket(self):
+        """Test deltas for the same bucket collapse into one row"""
+        rollups = MetricRollups(self.write_rows)
+        at = datetime(2024, 3, 14, 15, 0, tzinfo=timezone.utc)
+        rollups.record("migrated", 10, inventory_id=3, at=at)
+        rollups.record("migrated", 5, inventory_id=4, at=at)
+
+        rows = rollups.pending_rows()
+        global_rows = [r for r in rows if r["inventoryId"] is None]
+        assert {r["period"] for r in global_rows} == {"hourly", "daily", "weekly"}
+        assert all(r["delta"] == 15 for r in global_rows)
+        assert len([r for r in rows if r["inventoryId"] == 3]) == 3
+
+    def test_unknown_metric_rejected(self):
+        """Test only dashboard metric enum values are accepted"""
+        rollups = MetricRollups(self.write_rows)
+        with pytest.raises(ValueError):
+            rollups.record("vibes", 1)
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_once_and_clears(self):
+        """Test a flush sends the batch and empties the buffer"""
+        rollups = MetricRollups(self.write_rows)
+        rollups.record("critical_alerts", 1)
+        rollups.record("critical_alerts", -1)
+        rollups.record("reallocated", 40)
+        assert await rollups.flush() == 3
+        assert {r["metricType"] for r in self.written} == {"reallocated"}
+        assert await rollups.flush() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_deltas(self):
+        """Test deltas survive a failed write for the next flush"""
+        rollups = MetricRollups(self.write_rows)
+        rollups.record("cost_savings", 150)
+        self.fail_writes = True
+        assert await rollups.flush() == 0
+        self.fail_writes = False
+        assert await rollups.flush() == 3
+        assert all(r["delta"] == 150 for r in self.written)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_keeps_deltas(self):
+        """Test deltas survive a flush cancelled mid-write, as at shutdown"""
+        started = asyncio.Event()
+
+        async def hanging_write(rows):
+            started.set()
+            await asyncio.Event().wait()
+
+        rollups = MetricRollups(hanging_write)
+        rollups.record("migrated", 25)
+        flush = asyncio.create_task(rollups.flush())
+        await started.wait()
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        rollups.write_rows = self.write_rows
+        assert await rollups.flush() == 3
+        assert all(r["delta"] == 25 for r in self.written)
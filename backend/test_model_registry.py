@@ -0,0 +1,177 @@
+import csv
+import os
+
+import pytest
+
+from models.forecasting.registry import ModelRegistry
+
+
+class TestModelRegistry:
+    """Test the resident forecasting model registry"""
+
+    def setup_method(self):
+        self.loads = 0
+
+    def make_registry(self, checkpoint):
+        def loader():
+            self.loads += 1
+            with open(checkpoint) as f:
+                return f.read()
+
+        registry = ModelRegistry()
+        registry.register("demo", str(checkpoint), loader)
+        return registry
+
+    def test_missing_checkpoint_returns_none(self, tmp_path):
+        """Test nothing is served before the first checkpoint exists"""
+        registry = self.make_registry(tmp_path / "model.pt")
+        assert registry.get("demo") is None
+        assert self.loads == 0
+
+    def test_model_loaded_once(self, tmp_path):
+        """Test repeated gets reuse the resident model"""
+        checkpoint = tmp_path / "model.pt"
+        checkpoint.write_text("v1")
+        registry = self.make_registry(checkpoint)
+
+        first = registry.get("demo")
+        second = registry.get("demo")
+        assert first is second
+        assert first.model == "v1"
+        assert self.loads == 1
+
+    def test_new_checkpoint_is_swapped_in(self, tmp_path):
+        """Test replacing the checkpoint hot-swaps the model"""
+        checkpoint = tmp_path / "model.pt"
+        checkpoint.write_text("v1")
+        registry = self.make_registry(checkpoint)
+        old = registry.get("demo")
+
+        replacement = tmp_path / "model.pt.tmp"
+        replacement.write_text("v2-longer")
+        os.replace(replacement, checkpoint)
+
+        new = registry.get("demo")
+        assert new is not old
+        assert new.model == "v2-longer"
+        assert old.model == "v1"
+        assert registry.stats()["demo"]["loads"] == 2
+
+    def test_failed_load_keeps_previous_model(self, tmp_path):
+        """Test a broken checkpoint never replaces a working model"""
+        checkpoint = tmp_path / "model.pt"
+        checkpoint.write_text("v1")
+        registry = self.make_registry(checkpoint)
+        registry.get("demo")
+
+        registry.loaders["demo"] = (str(checkpoint), lambda: 1 / 0)
+        checkpoint.write_text("corrupt!")
+        assert registry.get("demo").model == "v1"
+
+
+class TestLSTMForecaster:
+    """Test LSTM training is separated from inference"""
+
+    def write_log(self, path, days, start=0):
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if start == 0:
+                writer.writerow(["timestamp", "demand"])
+            for day in range(start, start + days):
+                writer.writerow([f"2024-{day // 28 + 1:02d}-{day % 28 + 1:02d}T00:00:00", 100 + day])
+
+    def test_trained_checkpoint_serves_forecasts(self, tmp_path):
+        """Test a trained checkpoint loads into an eval-mode forecaster"""
+        pytest.importorskip("torch")
+        from models.forecasting.incremental_lstm import load_lstm_forecaster, read_recent_demand, train_incremental_lstm
+
+        log_path = tmp_path / "inventory_log.csv"
+        model_path = str(tmp_path / "lstm_model.pt")
+        self.write_log(log_path, 40)
+        assert train_incremental_lstm(epochs=2, window_size=5, log_path=str(log_path), model_path=model_path)
+        assert not train_incremental_lstm(epochs=2, window_size=5, log_path=str(log_path), model_path=model_path)
+
+        forecaster = load_lstm_forecaster(model_path)
+        assert not forecaster.model.training
+        recent, last_timestamp = read_recent_demand(str(log_path), forecaster.window_size)
+        forecast = forecaster.forecast(recent, last_timestamp, forecast_steps=3)
+        assert len(forecast) == 3
+        assert all(isinstance(row["forecast_demand"], float) for row in forecast)
+
+    def test_incremental_run_trains_on_new_windows_only(self, tmp_path, capsys):
+        """Test retraining windows new rows plus replay and keeps the first scaler"""
+        torch = pytest.importorskip("torch")
+        from models.forecasting.incremental_lstm import train_incremental_lstm
+
+        log_path = tmp_path / "inventory_log.csv"
+        model_path = str(tmp_path / "lstm_model.pt")
+        self.write_log(log_path, 40)
+        train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=1)
+        first = torch.load(model_path)
+        assert len(first["replay"]["X"]) == 35
+
+        self.write_log(log_path, 3, start=40)
+        capsys.readouterr()
+        assert train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=1)
+        assert "Training on 3 new and 3 replayed windows." in capsys.readouterr().out
+
+        second = torch.load(model_path)
+        assert second["scaler"] == first["scaler"]
+        assert second["replay"]["seen"] == 38
+        assert second["trained_through"].startswith("2024-02-15")
+
+    def test_multi_horizon_head_forecasts_in_one_pass(self, tmp_path):
+        """Test a horizon-sized head covers the forecast with a single forward pass"""
+        pytest.importorskip("torch")
+        from models.forecasting.incremental_lstm import LSTMMultiHorizonPredictor, load_lstm_forecaster, train_incremental_lstm
+
+        log_path = tmp_path / "inventory_log.csv"
+        model_path = str(tmp_path / "lstm_model.pt")
+        self.write_log(log_path, 40)
+        assert train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=4)
+
+        forecaster = load_lstm_forecaster(model_path)
+        assert isinstance(forecaster.model, LSTMMultiHorizonPredictor)
+        passes = []
+        forecaster.model.register_forward_hook(lambda module, inputs, output: passes.append(output.shape))
+        assert len(forecaster.predict([100.0 + i for i in range(5)], forecast_steps=4)) == 4
+        assert passes == [(1, 4)]
+        assert len(forecaster.predict([100.0 + i for i in range(5)], forecast_steps=6)) == 6
+
+    def test_legacy_state_dict_checkpoint(self, tmp_path, capsys):
+        """Test a bare state_dict checkpoint still serves and is replaced by a full fit"""
+        torch = pytest.importorskip("torch")
+        from models.forecasting.incremental_lstm import LSTMDemandPredictor, load_lstm_forecaster, train_incremental_lstm
+
+        log_path = tmp_path / "inventory_log.csv"
+        model_path = str(tmp_path / "lstm_model.pt")
+        self.write_log(log_path, 40)
+        torch.save(LSTMDemandPredictor().state_dict(), model_path)
+
+        forecaster = load_lstm_forecaster(model_path, log_path=str(log_path))
+        assert (forecaster.data_min, forecaster.data_max, forecaster.window_size) == (100.0, 139.0, 20)
+        assert len(forecaster.predict([100.0 + i for i in range(20)], forecast_steps=2)) == 2
+
+        capsys.readouterr()
+        assert train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=1)
+        assert "Legacy checkpoint" in capsys.readouterr().out
+        checkpoint = torch.load(model_path)
+        assert checkpoint["window_size"] == 5
+        assert len(checkpoint["replay"]["X"]) == 35
+
+    def test_backdated_rows_are_trained_on(self, tmp_path, capsys):
+        """Test rows appended with timestamps older than the checkpoint still count as new"""
+        torch = pytest.importorskip("torch")
+        from models.forecasting.incremental_lstm import train_incremental_lstm
+
+        log_path = tmp_path / "inventory_log.csv"
+        model_path = str(tmp_path / "lstm_model.pt")
+        self.write_log(log_path, 40)
+        train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=1)
+        assert torch.load(model_path)["trained_seq"] == 40
+
+        self.write_log(log_path, 2, start=20)
+        capsys.readouterr()
+        assert train_incremental_lstm(epochs=1, window_size=5, log_path=str(log_path), model_path=model_path, horizon=1)
+        assert "Training on 2 new and 2 replayed windows." in capsys.readouterr().out
+        assert torch.load(model_path)["trained_seq"] == 42
@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from models.forecasting.nightly import MAX_TIME_TO_FILL, forecast_all_inventories, time_to_fill
+
+
+def demand_rows(inventory_id, days, seed=0, start_id=1):
+    rng = np.random.default_rng(seed)
+    first = date(2024, 1, 1)
+    return [
+        {"id": start_id + i, "inventoryId": inventory_id, "itemId": 1, "demandQuantity": int(100 + 10 * np.sin(i) + rng.normal(0, 3)), "timestamp": f"{first + timedelta(days=i)}T12:00:00Z"}
+        for i in range(days)
+    ]
+
+
+class TestNightlyForecasts:
+    """Test the batch rows written to forecasting_metrics"""
+
+    def test_time_to_fill(self):
+        """Test free volume over predicted daily demand, capped to the time column"""
+        assert time_to_fill(50, 100) == "12:00:00"
+        assert time_to_fill(500, 100) == MAX_TIME_TO_FILL
+        assert time_to_fill(500, 0) == MAX_TIME_TO_FILL
+
+    def test_one_row_per_inventory(self, tmp_path):
+        """Test every inventory gets a row, with ARIMA where there is history and the mean otherwise"""
+        rows = demand_rows(1, 40) + demand_rows(2, 40, seed=1, start_id=100)
+        inventories = [{"id": 1, "volumeAvailable": 40}, {"id": 2, "volumeAvailable": 4000}, {"id": 3, "volumeAvailable": 10}]
+        metrics = forecast_all_inventories(rows, inventories, steps=5, run_date="2024-02-10", params_path=str(tmp_path / "params.json"), max_workers=2, timeout=120)
+
+        by_inventory = {row["inventoryId"]: row for row in metrics}
+        assert set(by_inventory) == {1, 2, 3}
+        assert by_inventory[1]["model"] == "arima"
+        assert by_inventory[1]["forecastDate"] == "2024-02-10"
+        assert len(by_inventory[1]["forecast"]) == 5
+        assert by_inventory[1]["forecast"][0]["date"] == "2024-02-10"
+        assert abs(by_inventory[1]["actualDemand"] - sum(row["demandQuantity"] for row in rows[35:40])) < 1e-6
+        assert by_inventory[1]["howMuchTimeToFill"] < MAX_TIME_TO_FILL
+        assert by_inventory[2]["howMuchTimeToFill"] == MAX_TIME_TO_FILL
+        assert by_inventory[3] | {"forecast": None} == {
+            "inventoryId": 3, "forecastDate": "2024-02-10", "horizonDays": 5, "model": "mean",
+            "predictedDemand": 0.0, "actualDemand": 0.0, "howMuchTimeToFill": MAX_TIME_TO_FILL, "forecast": None
+        }
+
+    def test_short_history_uses_the_mean(self):
+        """Test a series too short for ARIMA falls back to last week's mean"""
+        rows = demand_rows(1, 5)
+        metrics = forecast_all_inventories(rows, [{"id": 1, "volumeAvailable": 100}], steps=3, run_date="2024-01-06", params_path=None)
+        mean = np.mean([row["demandQuantity"] for row in rows])
+        assert metrics[0]["model"] == "mean"
+        assert abs(metrics[0]["predictedDemand"] - round(3 * mean, 2)) < 0.02
@@ -0,0 +1,95 @@
+from relocation_ledger import RelocationLedger
+
+
+class TestRelocationLedger:
+    """Test the in-flight relocation ledger"""
+
+    def test_first_breach_runs_balancer(self):
+        """Test an inventory with no open relocation is evaluated"""
+        ledger = RelocationLedger()
+        assert ledger.should_run(1, load=1200, capacity=1000)
+        assert ledger.counters["suppressed"] == 0
+
+    def test_covered_breach_is_suppressed(self):
+        """Test repeated ticks for the same breach are suppressed"""
+        ledger = RelocationLedger()
+        ledger.record(1, quantity=200, load=1200, capacity=1000, relocation_id=7)
+        for _ in range(3):
+            assert not ledger.should_run(1, load=1210, capacity=1000)
+        assert ledger.counters["suppressed"] == 3
+        assert ledger.stats()["suppressed_by_inventory"] == {1: 3}
+
+    def test_growing_breach_reevaluates(self):
+        """Test excess beyond the covered quantity reruns the balancer"""
+        ledger = RelocationLedger(tolerance=0.1)
+        ledger.record(1, quantity=200, load=1200, capacity=1000)
+        assert ledger.should_run(1, load=1600, capacity=1000)
+        assert ledger.should_run(1, load=1200, capacity=700)
+
+    def test_shrinking_breach_is_suppressed(self):
+        """Test a breach the pending relocation still covers does not rerun"""
+        ledger = RelocationLedger()
+        ledger.record(1, quantity=200, load=1200, capacity=1000, relocation_id=7)
+        assert not ledger.should_run(1, load=1050, capacity=1000)
+        assert not ledger.should_run(1, load=600, capacity=1000)
+
+    def test_top_up_keeps_earlier_relocations(self):
+        """Test a second relocation for the same source adds to its entry"""
+        ledger = RelocationLedger()
+        ledger.record(1, quantity=200, load=1200, capacity=1000, relocation_id=7)
+        ledger.record(1, quantity=300, load=1500, capacity=1000, relocation_id=8)
+        assert ledger.entries[1]["relocations"] == {7: 200, 8: 300}
+        assert ledger.covered(1) == 500
+        ledger.release(relocation_id=7)
+        assert ledger.covered(1) == 300
+        assert not ledger.should_run(1, load=1300, capacity=1000)
+
+    def test_release_by_relocation_id(self):
+        """Test executing the relocation frees the source inventory"""
+        ledger = RelocationLedger()
+        ledger.record(1, quantity=200, load=1200, capacity=1000, relocation_id=7)
+        ledger.release(relocation_id=7)
+        assert ledger.should_run(1, load=1200, capacity=1000)
+        assert ledger.counters["released"] == 1
+
+    def test_seed_from_pending_relocations(self):
+        """Test only open relocations are loaded back into the ledger"""
+        ledger = RelocationLedger()
+        inventories = [
+            {"id": 1, "volumeOccupied": 1200, "volumeAvailable": 1100, "volumeReserved": 100},
+            {"id": 2, "volumeOccupied": 900, "volumeAvailable": 1100, "volumeReserved": 100},
+        ]
+        relocations = [
+            {"relocationMessageId": 3, "fromInventoryId": 1, "toInventoryId": 2, "quantity": 200, "status": "pending"},
+            {"relocationMessageId": 4, "fromInventoryId": 2, "toInventoryId": 1, "quantity": 50, "status": "completed"},
+        ]
+        ledger.seed(relocations, inventories)
+        assert list(ledger.entries) == [1]
+        assert not ledger.should_run(1, load=1200, capacity=1000)
+
+    def test_reseeding_does_not_inflate_coverage(self):
+        """Test a second election re-seeds the same quantity instead of adding to it"""
+        ledger = RelocationLedger()
+        inventories = [{"id": 1, "volumeOccupied": 1400, "volumeAvailable": 1100, "volumeReserved": 100}]
+        relocations = [
+            {"relocationMessageId": 3, "fromInventoryId": 1, "toInventoryId": 2, "quantity": 150, "status": "pending"},
+            {"relocationMessageId": 5, "fromInventoryId": 1, "toInventoryId": 3, "quantity": 50, "status": "in_progress"},
+        ]
+        ledger.seed(relocations, inventories)
+        ledger.seed(relocations, inventories)
+        assert ledger.entries[1]["quantity"] == 200
+        assert ledger.should_run(1, load=1350, capacity=1000)
+
+    def test_release_one_of_several_relocations(self):
+        """Test releasing one seeded relocation keeps the rest of the source covered"""
+        ledger = RelocationLedger()
+        inventories = [{"id": 1, "volumeOccupied": 1200, "volumeAvailable": 1100, "volumeReserved": 100}]
+        ledger.seed([
+            {"relocationMessageId": 3, "fromInventoryId": 1, "toInventoryId": 2, "quantity": 150, "status": "pending"},
+            {"relocationMessageId": 5, "fromInventoryId": 1, "toInventoryId": 3, "quantity": 50, "status": "pending"},
+        ], inventories)
+        ledger.release(relocation_id=3)
+        assert ledger.entries[1]["quantity"] == 50
+        ledger.release(1, relocation_id=5)
+        assert 1 not in ledger.entries
+        assert ledger.counters["released"] == 2
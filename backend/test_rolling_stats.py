@@ -0,0 +1,75 @@
+import random
+import statistics
+
+from rolling_stats import RollingDemandStats
+
+
+def full_history_spike(history):
+    #the full-history rule spike monitoring used before: sort everything, newest vs mean of the six before it
+    if len(history) < 2:
+        return 0.0
+    ordered = sorted(history, key=lambda row: (row["timestamp"], row["id"]))
+    recent = ordered[-1]["demandQuantity"]
+    baseline_rows = ordered[-7:-1]
+    baseline = sum(row["demandQuantity"] for row in baseline_rows) / len(baseline_rows)
+    return max(0, (recent - baseline) / baseline * 100) if baseline else 0.0
+
+
+def history(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"id": i + 1, "inventoryId": 1, "demandQuantity": rng.randint(0, 200), "timestamp": f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00Z"}
+        for i in range(count)
+    ]
+
+
+class TestRollingDemandStats:
+    """Test incremental spike statistics against the full-history computation"""
+
+    def test_streaming_matches_full_history(self):
+        """Test spike pct, baseline and variance after every appended row"""
+        stats = RollingDemandStats()
+        rows = history(60)
+        for i, row in enumerate(rows):
+            stats.observe(1, row["demandQuantity"], row["timestamp"], row["id"])
+            current = stats.stats(1)
+            assert abs(current["spike_pct"] - full_history_spike(rows[:i + 1])) < 1e-6
+            if i >= 2:
+                baseline = [row["demandQuantity"] for row in rows[max(0, i - 6):i]]
+                assert abs(current["baseline"] - statistics.mean(baseline)) < 1e-6
+                assert abs(current["variance"] - statistics.variance(baseline)) < 1e-6
+
+    def test_late_and_replayed_rows(self):
+        """Test out-of-order arrivals land in place and replays are ignored"""
+        rows = history(30, seed=3)
+        shuffled = rows[:]
+        random.Random(1).shuffle(shuffled)
+        stats = RollingDemandStats()
+        for row in shuffled:
+            stats.observe(1, row["demandQuantity"], row["timestamp"], row["id"])
+        assert abs(stats.spike_pct(1) - full_history_spike(rows)) < 1e-6
+
+        before = stats.stats(1)
+        assert stats.observe_rows(rows) == 0
+        assert stats.stats(1) == before
+
+    def test_zscore_and_unknown_series(self):
+        """Test the z-score of the newest row and empty answers for unseen keys"""
+        stats = RollingDemandStats()
+        for i, demand in enumerate([10, 12, 8, 10, 12, 8, 40]):
+            stats.observe("a", demand, f"2024-01-0{i + 1}", i)
+        result = stats.stats("a")
+        assert result["baseline"] == 10
+        assert abs(result["zscore"] - 30 / statistics.stdev([10, 12, 8, 10, 12, 8])) < 1e-9
+        assert stats.stats("b") is None
+        assert stats.spike_pct("b") == 0.0
+
+    def test_rows_without_ids_share_a_timestamp(self):
+        """Test a row missing its id still orders against one that has an id"""
+        stats = RollingDemandStats(window=3)
+        assert stats.observe(1, 10, "2024-01-01T00:00:00Z", 5)
+        assert stats.observe(1, 20, "2024-01-01T00:00:00Z", None)
+        assert stats.observe(1, 30, "2024-01-01T00:00:00Z", None)
+        assert stats.observe(1, 40, "2024-01-01T00:00:00Z", 6)
+        assert stats.stats(1)["latest"] == 40
+        assert stats.stats(1)["window"] == 3
@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+
+from models.forecasting.registry import registry
+from models.forecasting.serving import lstm_serving_model
+
+
+class TestServing:
+    """Test the torch-free serving layer of the forecasting stack"""
+
+    def test_api_imports_without_the_model_stack(self):
+        """Test importing the API modules loads neither torch nor pandas"""
+        probe = "import json, sys, main, forecast_router; print(json.dumps([name for name in ('torch', 'pandas') if name in sys.modules]))"
+        output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+        assert json.loads(output.strip().splitlines()[-1]) == []
+
+    def test_models_are_registered_lazily(self, monkeypatch):
+        """Test both LSTM runtimes are registered and eager mode skips the artifact"""
+        assert {"lstm", "lstm_scripted"} <= set(registry.loaders)
+        monkeypatch.setenv("LSTM_RUNTIME", "eager")
+        assert lstm_serving_model() == "lstm"
@@ -0,0 +1,82 @@
+from spike_detector import SpikeDetector
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed(detector, demands, inventory_id=1, item_id=10, start_id=1, emit=True):
+    return [
+        detector.observe(inventory_id, item_id, demand, f"2024-01-01T00:{i:02d}:00Z", start_id + i, emit=emit)
+        for i, demand in enumerate(demands)
+    ]
+
+
+class TestSpikeDetector:
+    """Test EWMA control-limit spike detection over the demand stream"""
+
+    def test_flags_a_jump_once_per_cooldown(self):
+        """Test a surge is one spike until the cooldown passes"""
+        clock = FakeClock()
+        detector = SpikeDetector(cooldown=60, clock=clock)
+        assert not any(feed(detector, [100, 104, 96, 101, 99, 103, 97, 100, 102, 98]))
+
+        spike = detector.observe(1, 10, 300, "2024-01-01T01:00:00Z", 100)
+        assert spike["inventoryId"] == 1 and spike["itemId"] == 10
+        assert spike["zScore"] > 3 and spike["spikePct"] > 100
+        assert detector.observe(1, 10, 400, "2024-01-01T01:01:00Z", 101) is None
+
+        clock.now = 61
+        assert detector.observe(1, 10, 900, "2024-01-01T01:02:00Z", 102) is not None
+        assert len(detector.drain()) == 2
+        assert detector.stats()["detected"] == 2
+
+    def test_series_are_per_inventory_and_item(self):
+        """Test one item's surge does not touch another item's baseline"""
+        detector = SpikeDetector()
+        feed(detector, [100, 104, 96, 101, 99, 103, 97, 100], item_id=1)
+        feed(detector, [5, 6, 4, 5, 6, 4, 5, 5], item_id=2, start_id=100)
+        assert detector.observe(1, 2, 40, None, 200) is not None
+        assert detector.observe(1, 1, 104, None, 201) is None
+
+    def test_warmup_replay_does_not_emit(self):
+        """Test replayed history warms the series without queueing spikes, and replays are skipped"""
+        detector = SpikeDetector()
+        rows = [{"id": i + 1, "inventoryId": 1, "itemId": 10, "demandQuantity": 100 + (i % 3), "timestamp": f"2024-01-01T00:{i:02d}:00Z"} for i in range(20)]
+        rows.append({"id": 21, "inventoryId": 1, "itemId": 10, "demandQuantity": 1000, "timestamp": "2024-01-01T00:30:00Z"})
+        assert detector.observe_rows(rows) == 21
+        assert detector.observe_rows(rows) == 0
+        assert detector.drain() == []
+        assert detector.stats()["series"] == 1
+
+    def test_pending_is_bounded_and_requeue_keeps_order(self):
+        """Test a stalled flush drops the oldest spikes and a failed write goes back first"""
+        detector = SpikeDetector(warmup=1, max_pending=2)
+        for inventory_id in range(3):
+            feed(detector, [10, 11, 10, 9, 10], inventory_id=inventory_id)
+            detector.observe(inventory_id, 10, 100, None, 99)
+        assert detector.stats()["dropped"] == 1
+
+        batch = detector.drain(1)
+        assert [spike["inventoryId"] for spike in batch] == [1]
+        detector.requeue(batch)
+        assert [spike["inventoryId"] for spike in detector.drain()] == [1, 2]
+
+    def test_requeue_into_a_full_queue_counts_the_overflow(self):
+        """Test spikes pushed out by a requeue are counted as dropped"""
+        detector = SpikeDetector(warmup=1, max_pending=2)
+        for inventory_id in range(2):
+            feed(detector, [10, 11, 10, 9, 10], inventory_id=inventory_id)
+            detector.observe(inventory_id, 10, 100, None, 99)
+        batch = detector.drain()
+        for inventory_id in range(2, 4):
+            feed(detector, [10, 11, 10, 9, 10], inventory_id=inventory_id)
+            detector.observe(inventory_id, 10, 100, None, 99)
+
+        detector.requeue(batch)
+        assert [spike["inventoryId"] for spike in detector.drain()] == [0, 1]
+        assert detector.stats()["dropped"] == 2
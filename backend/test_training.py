@@ -0,0 +1,52 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.forecasting.incremental_lstm import LSTMDemandPredictor
+from models.forecasting.training import TrainingConfig, fit_model, validation_split
+
+
+def windows(count=80, window_size=6):
+    base = torch.linspace(0, 1, count + window_size)
+    X = torch.stack([base[i:i + window_size] for i in range(count)]).unsqueeze(-1)
+    y = base[window_size:window_size + count].unsqueeze(-1)
+    return X, y
+
+
+class TestTrainingLoop:
+    """Test the mini-batch training loop"""
+
+    def test_config_from_dict_ignores_unknown_keys(self):
+        """Test job params can be passed straight through"""
+        config = TrainingConfig.from_dict({"epochs": 3, "batch_size": 8, "window_size": 20})
+        assert config.epochs == 3 and config.batch_size == 8
+
+    def test_chronological_split_holds_out_latest_windows(self):
+        """Test validation uses the newest windows"""
+        X, y = windows(10)
+        X_train, y_train, X_val, y_val = validation_split(X, y, 0.2)
+        assert len(X_train) == 8 and len(X_val) == 2
+        assert torch.equal(y_val, y[-2:])
+
+    def test_early_stopping_restores_best_weights(self):
+        """Test training stops once validation stops improving"""
+        X, y = windows()
+        model = LSTMDemandPredictor(hidden_size=8, num_layers=1)
+        config = TrainingConfig(epochs=200, batch_size=16, lr=0.05, patience=2, min_delta=10.0, seed=0)
+        stats = fit_model(model, X, y, config)
+        assert stats["stopped_early"] is True
+        assert stats["epochs_run"] == 3
+        assert not model.training
+
+    def test_threads_and_clipping(self):
+        """Test thread limits are applied and clipped training still runs"""
+        X, y = windows(20)
+        previous = torch.get_num_threads()
+        try:
+            config = TrainingConfig(epochs=2, batch_size=4, grad_clip=0.5, num_threads=1, val_fraction=0)
+            stats = fit_model(LSTMDemandPredictor(hidden_size=8, num_layers=1), X, y, config)
+            assert torch.get_num_threads() == 1
+        finally:
+            torch.set_num_threads(previous)
+        assert stats["epochs_run"] == 2
+        assert stats["val_loss"] is None
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.forecasting.windowing import last_window, make_windows
+
+
+class TestWindowing:
+    """Test strided sequence construction"""
+
+    def test_matches_loop_based_windows(self):
+        """Test the strided windows equal the old slice-and-append output"""
+        data = np.arange(12, dtype=np.float32).reshape(-1, 1)
+        X, y = make_windows(data, 4)
+        expected_X = np.array([data[i:i + 4] for i in range(8)])
+        expected_y = np.array([data[i + 4] for i in range(8)])
+        assert X.shape == (8, 4, 1) and y.shape == (8, 1)
+        assert np.array_equal(X.numpy(), expected_X)
+        assert np.array_equal(y.numpy(), expected_y)
+        assert X.dtype == torch.float32
+
+    def test_windows_share_the_input_buffer(self):
+        """Test no window data is copied"""
+        data = np.arange(10, dtype=np.float32)
+        X, y = make_windows(data, 3)
+        data[5] = -1
+        assert X[3, 2, 0].item() == -1
+        assert y[2, 0].item() == -1
+
+    def test_multi_feature_windows(self):
+        """Test demand/current/total windows keep features on the last axis"""
+        data = np.stack([np.arange(6), np.arange(6) * 10, np.full(6, 1000)], axis=1)
+        X, y = make_windows(data, 2, target_column=0)
+        assert X.shape == (4, 2, 3)
+        assert X[1, 0].tolist() == [1.0, 10.0, 1000.0]
+        assert y[:, 0].tolist() == [2.0, 3.0, 4.0, 5.0]
+        assert last_window(data, 2).shape == (1, 2, 3)
+
+    def test_multi_horizon_targets(self):
+        """Test each window gets the next `horizon` target values"""
+        X, y = make_windows(np.arange(10, dtype=np.float32), 3, horizon=4)
+        assert X.shape == (4, 3, 1) and y.shape == (4, 4)
+        assert y[0].tolist() == [3.0, 4.0, 5.0, 6.0]
+        assert y[-1].tolist() == [6.0, 7.0, 8.0, 9.0]
+
+    def test_short_series_yields_no_windows(self):
+        """Test series shorter than the window produce empty tensors"""
+        X, y = make_windows(np.arange(3, dtype=np.float32), 5)
+        assert X.shape == (0, 5, 1) and y.shape == (0, 1)